@@ -0,0 +1,88 @@
+# backend/app/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from pymongo import ReturnDocument
+from app.database import db
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and optional LRU bound.
+    Not shared between workers; pair it with SharedCacheVersion for that.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCacheVersion:
+    """
+    Cross-worker invalidation for in-process caches. Writers bump a counter in the
+    `cache_versions` collection; readers compare it with the version they last saw,
+    at most once every `check_interval_seconds`, and clear their local cache on change.
+    """
+
+    def __init__(self, name: str, check_interval_seconds: float):
+        self.name = name
+        self.check_interval_seconds = check_interval_seconds
+        self._seen_version: Optional[int] = None
+        self._checked_at = float("-inf")
+
+    async def bump(self):
+        doc = await db.cache_versions.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._seen_version = doc["version"]
+        self._checked_at = time.monotonic()
+
+    async def changed(self) -> bool:
+        """True if another worker bumped the version since the last check."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval_seconds:
+            return False
+        self._checked_at = now
+        doc = await db.cache_versions.find_one({"_id": self.name})
+        version = doc["version"] if doc else 0
+        changed = self._seen_version is not None and version != self._seen_version
+        self._seen_version = version
+        return changed
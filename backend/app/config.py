@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Employee Management System"
@@ -6,6 +7,78 @@ class Settings(BaseSettings):
     # Database
     MONGO_URI: str
     MONGO_DB_NAME: str
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_CONNECT_TIMEOUT_MS: int = 10000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    VERIFY_INDEXES_ON_STARTUP: bool = True # Explain hot queries and warn on COLLSCAN
+
+    # Audit log pipeline
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_BODY_BYTES: int = 64 * 1024
+    AUDIT_REDACT_FIELDS: List[str] = ["password", "hashed_password", "new_password"]
+
+    # Notification dispatcher
+    NOTIFICATION_QUEUE_MAX_SIZE: int = 10000
+    NOTIFICATION_BATCH_SIZE: int = 100
+    NOTIFICATION_MAX_RETRIES: int = 3
+    NOTIFICATION_RETRY_BACKOFF_SECONDS: float = 0.5
+    NOTIFICATION_DISPATCH_SYNC: bool = False # Deliver inline (tests/scripts)
+
+    # In-process caches
+    ADMIN_HR_CACHE_TTL_SECONDS: float = 300
+    EMPLOYEE_DIRECTORY_TTL_SECONDS: float = 300
+    EMPLOYEE_DIRECTORY_MAX_SIZE: int = 50000
+    CACHE_SHARED_INVALIDATION: bool = False # Propagate invalidations across workers via Mongo
+    CACHE_VERSION_CHECK_SECONDS: float = 5
+    ROLE_PERMISSIONS_TTL_SECONDS: float = 60
+    JWT_CLAIMS_CACHE_MAX_SIZE: int = 10000 # Verified tokens kept until their exp
+
+    # bcrypt runs in its own thread pool so it never blocks the event loop
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64 # Queued + running; beyond this requests get 503
+    BCRYPT_ROUNDS: int = 12 # Hashes with a different cost are upgraded on the next login
+
+    # IDs each worker reserves per round trip to the counters collection
+    EMPLOYEE_ID_BLOCK_SIZE: int = 10
+
+    # Bulk onboarding (POST /employees/bulk); hashes in a pool separate from logins
+    BULK_ONBOARDING_CHUNK_SIZE: int = 500 # Rows validated, hashed and inserted together
+    BULK_ONBOARDING_MAX_ROWS: int = 10000
+    BULK_PASSWORD_HASH_WORKERS: int = 4
+
+    # Photo/certificate uploads are streamed to disk on their own thread pool
+    UPLOAD_WORKERS: int = 4
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_MAX_PHOTO_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_MAX_CERTIFICATE_BYTES: int = 20 * 1024 * 1024
+
+    # Photo size variants (longest edge in px), requested as ?size=<name>; needs Pillow
+    PHOTO_VARIANT_SIZES: Dict[str, int] = {"thumb": 96, "small": 192, "medium": 480}
+    PHOTO_VARIANT_FORMAT: str = "webp"
+    PHOTO_VARIANT_QUALITY: int = 80
+
+    # /static delivery. Hand file bodies to the front proxy (it then does Range and
+    # sendfile itself): "X-Accel-Redirect" (nginx, internal location at
+    # STATIC_SENDFILE_PREFIX aliasing app/static) or "X-Sendfile" (Apache/lighttpd)
+    STATIC_SENDFILE_HEADER: Optional[str] = None
+    STATIC_SENDFILE_PREFIX: str = "/internal-static/"
+    STATIC_SIGNED_URLS: bool = False # Require ?expires=&sig= on /static; API responses sign their URLs
+    STATIC_URL_SECRET: Optional[str] = None # Defaults to JWT_SECRET_KEY
+    STATIC_URL_TTL_SECONDS: int = 3600
+
+    # Pagination
+    EMPLOYEE_PAGE_DEFAULT_LIMIT: int = 500
+    EMPLOYEE_PAGE_MAX_LIMIT: int = 1000
+    ATTENDANCE_EXPORT_PAGE_SIZE: int = 1000
+
+    # Response encoding: "auto" (orjson when installed), "orjson" or "stdlib"
+    JSON_BACKEND: str = "auto"
+    TRUSTED_READ_FAST_PATH: bool = True # Skip re-validating our own documents on list reads
 
     # JWT
     JWT_SECRET_KEY: str
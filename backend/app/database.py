@@ -0,0 +1,91 @@
+# backend/app/database.py
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from typing import Any, Dict, Optional
+from app.config import settings
+
+
+class MongoManager:
+    """
+    Owns the single AsyncIOMotorClient (and therefore the single connection pool)
+    for this worker process. Opened and closed by the FastAPI lifespan hook.
+    """
+
+    def __init__(self):
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._collections: Dict[str, AsyncIOMotorCollection] = {}
+
+    def connect(self) -> AsyncIOMotorClient:
+        """Creates the pooled client if it does not exist yet."""
+        if self._client is None:
+            self._client = AsyncIOMotorClient(
+                settings.MONGO_URI,
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            )
+            print(f"MongoDB client created (maxPoolSize={settings.MONGO_MAX_POOL_SIZE}).")
+        return self._client
+
+    def close(self):
+        """Closes the client and drops cached collection handles."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            self._collections = {}
+            print("MongoDB client closed.")
+
+    @property
+    def client(self) -> AsyncIOMotorClient:
+        # Connect lazily so scripts and tests that bypass the lifespan hook still work
+        return self.connect()
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        return self.client[settings.MONGO_DB_NAME]
+
+    def get_collection(self, name: str) -> AsyncIOMotorCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self.db[name]
+            self._collections[name] = collection
+        return collection
+
+
+mongo = MongoManager()
+
+
+class CollectionProxy:
+    """
+    Module-level stand-in for a collection. Routers keep their
+    `collection = db.employees` globals, while every call resolves against
+    whichever client the lifespan hook currently holds.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(mongo.get_collection(self.name), attr)
+
+    def __repr__(self) -> str:
+        return f"CollectionProxy({self.name!r})"
+
+
+class DatabaseProxy:
+    """Supports both `db.employees` and `db["employees"]` access, like a Motor database."""
+
+    def __getattr__(self, name: str) -> CollectionProxy:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return CollectionProxy(name)
+
+    def __getitem__(self, name: str) -> CollectionProxy:
+        return CollectionProxy(name)
+
+
+db = DatabaseProxy()
@@ -1,59 +1,95 @@
 import json
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, Iterable
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.config import settings
+from app.services.audit_service import audit_writer
 from datetime import datetime, timezone
 
-class AuditLogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        mutating_methods = ["POST", "PUT", "PATCH", "DELETE"]
-        
-        response = await call_next(request)
-        
-        if request.method in mutating_methods:
-            user_id = "anonymous" 
-            payload = {}
-
-            # Check the content-type of the request
-            content_type = request.headers.get('content-type')
-
-            # --- FIX STARTS HERE ---
-            # Only try to read the body if it's JSON.
-            # Skip for form data, multipart, etc.
-            if content_type and "application/json" in content_type:
-                try:
-                    # To read the body here and still have it available for the endpoint,
-                    # we need to read it and then "re-create" the stream.
-                    # However, a simpler fix is to just not log bodies we know will cause issues.
-                    # For a more advanced logger, you'd read the stream into a variable
-                    # and then pass it along.
-                    # For this project, we will just log the content type for non-json requests.
-                    payload = await request.json()
-                except json.JSONDecodeError:
-                    payload = {"detail": "Payload not JSON decodable"}
-                except RuntimeError as e:
-                    # This handles the "Stream consumed" error if another dependency read it first.
-                    print(f"Audit log: Could not read request body, it was likely consumed by the endpoint. Error: {e}")
-                    payload = {"detail": "Request body was already consumed."}
-            else:
-                payload = {"detail": f"Payload content-type is '{content_type}', not logged as JSON."}
-            # --- FIX ENDS HERE ---
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+REDACTED = "***REDACTED***"
 
+def redact_payload(value: Any, redact_fields: set) -> Any:
+    """Recursively replaces the values of sensitive keys (case-insensitive)."""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in redact_fields else redact_payload(v, redact_fields)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_payload(v, redact_fields) for v in value]
+    return value
+
+class AuditLogMiddleware:
+    """
+    Raw ASGI audit middleware. The request body is teed into a size-capped buffer
+    as the endpoint reads it, so the real payload is logged without a second read.
+    Response messages are passed straight through; only the status code is kept.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_bytes: int = settings.AUDIT_MAX_BODY_BYTES,
+        redact_fields: Iterable[str] = settings.AUDIT_REDACT_FIELDS,
+    ):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.redact_fields = {f.lower() for f in redact_fields}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        content_type = Headers(scope=scope).get("content-type")
+        # Only JSON bodies are captured; multipart uploads and forms are never buffered
+        capture_body = bool(content_type and "application/json" in content_type)
+        body = bytearray()
+        truncated = False
+        status_code = 500
+
+        async def receive_wrapper() -> Message:
+            nonlocal truncated
+            message = await receive()
+            if capture_body and message["type"] == "http.request" and not truncated:
+                chunk = message.get("body", b"")
+                room = self.max_body_bytes - len(body)
+                if len(chunk) > room:
+                    truncated = True
+                else:
+                    body.extend(chunk)
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
             log_entry = {
-                "user_id": user_id,
-                "action": request.method,
-                "path": request.url.path,
-                "payload": payload,
-                "outcome": response.status_code,
+                "user_id": "anonymous",
+                "action": scope["method"],
+                "path": scope["path"],
+                "payload": self._build_payload(content_type, capture_body, bytes(body), truncated),
+                "outcome": status_code,
                 "timestamp": datetime.now(timezone.utc)
             }
+            # Non-blocking: the background writer persists entries in batches
+            audit_writer.enqueue(log_entry)
 
-            try:
-                client = AsyncIOMotorClient(settings.MONGO_URI)
-                db = client[settings.MONGO_DB_NAME]
-                await db.audit_logs.insert_one(log_entry)
-            except Exception as e:
-                print(f"Failed to write to audit log: {e}")
-
-        return response
\ No newline at end of file
+    def _build_payload(self, content_type: str | None, captured: bool, body: bytes, truncated: bool) -> Any:
+        if not captured:
+            return {"detail": f"Payload content-type is '{content_type}', not logged as JSON."}
+        if truncated:
+            return {"detail": f"Payload larger than {self.max_body_bytes} bytes, not logged."}
+        if not body:
+            return {}
+        try:
+            payload = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {"detail": "Payload not JSON decodable"}
+        return redact_payload(payload, self.redact_fields)
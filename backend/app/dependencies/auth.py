@@ -1,5 +1,7 @@
 # backend/app/dependencies/auth.py
-from fastapi import Depends, HTTPException, status
+import hashlib
+import time
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from typing import Dict, Any, List
@@ -8,17 +10,20 @@ from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from app.models.employee import TokenPayload
 # 1. Import database for login
-from motor.motor_asyncio import AsyncIOMotorClient
+from app.database import db
 from app.schemas import employee_schema
+from app.services import permission_service
+from app.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# 2. Add database client for login
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
+# 2. Shared database handle for login
 roles_collection = db.roles
 
+# Verified claims keyed by the token's SHA-256, each kept until the token's own exp
+_token_claims = TTLCache(ttl_seconds=0, maxsize=settings.JWT_CLAIMS_CACHE_MAX_SIZE)
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     if expires_delta:
@@ -35,7 +40,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-async def get_current_employee(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Like verify_password, plus a replacement hash when the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def decode_token_claims(token: str) -> Dict[str, Any]:
+    """Verifies a token with python-jose once, then serves its claims from memory until exp."""
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _token_claims.get(key)
+    if claims is not None:
+        return claims
+    claims = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    remaining = claims.get("exp", 0) - time.time()
+    if remaining > 0:
+        _token_claims.set(key, claims, ttl_seconds=remaining)
+    return claims
+
+async def get_current_employee(request: Request, token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    # Resolved once per request, however many dependencies ask for it
+    current_employee = getattr(request.state, "current_employee", None)
+    if current_employee is not None:
+        return current_employee
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -43,13 +69,11 @@ async def get_current_employee(token: str = Depends(oauth2_scheme)) -> Dict[str,
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token_claims(token)
         employee_id: str | None = payload.get("Employee_id")
         role_id: str | None = payload.get("role")
-        # 3. Extract permissions from token
-        permissions: List[str] = payload.get("permissions", []) # Default to empty list
+        # Role version at issue time; older tokens without it resolve the same way
+        role_version: int | None = payload.get("rv")
         
         if employee_id is None or role_id is None:
             raise credentials_exception
@@ -65,8 +89,10 @@ async def get_current_employee(token: str = Depends(oauth2_scheme)) -> Dict[str,
     except Exception as e:
         raise credentials_exception
 
-    # 4. Return permissions in the user dictionary
-    return {"employee_id": employee_id, "role_id": role_id, "permissions": permissions}
+    # Permissions are resolved live from the role, never trusted from the token
+    permissions = await permission_service.get_permissions(role_id, role_version)
+    request.state.current_employee = {"employee_id": employee_id, "role_id": role_id, "permissions": permissions}
+    return request.state.current_employee
 
 def require_role(allowed_roles: List[str]):
     """
@@ -90,7 +116,7 @@ def require_permission(required_permission: str):
     Also grants access if the user has the 'admin' role.
     """
     async def permission_checker(current_user: Dict[str, Any] = Depends(get_current_employee)):
-        user_permissions = current_user.get("permissions", [])
+        user_permissions = current_user.get("permissions", frozenset())
         
         # Super-admin override: 'admin' role can do anything
         if current_user.get("role_id") == 'admin':
@@ -0,0 +1,12 @@
+# backend/app/dependencies/database.py
+from typing import AsyncIterator
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from app.database import mongo
+
+async def get_db() -> AsyncIterator[AsyncIOMotorDatabase]:
+    """FastAPI dependency yielding the worker's shared database handle (overridable in tests)."""
+    yield mongo.db
+
+async def get_mongo_client() -> AsyncIterator[AsyncIOMotorClient]:
+    """FastAPI dependency yielding the worker's pooled client (for sessions/transactions)."""
+    yield mongo.client
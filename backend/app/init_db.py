@@ -1,6 +1,6 @@
 # backend/app/init_db.py
 
-from motor.motor_asyncio import AsyncIOMotorClient
+from .database import mongo
 from passlib.context import CryptContext
 from .config import settings
 from .schemas import (
@@ -9,16 +9,57 @@ from .schemas import (
     asset_schema, allotted_asset_schema, report_schema, audit_schema,
     user_notification_schema,
     ai_conversation_schema,
-    permission_schema  # <-- 1. ADD THIS IMPORT
+    permission_schema,  # <-- 1. ADD THIS IMPORT
+    notification_dead_letter_schema,
+    daily_attendance_status_schema
 )
 from datetime import datetime, date, timezone, timedelta 
 import uuid 
+from typing import Any, List
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+def find_collscans(plan: Any) -> List[str]:
+    """
+    Returns the namespaces of every COLLSCAN stage in a plan tree. Rejected plans
+    (including those of each shard) are skipped: only what will actually run counts.
+    """
+    found = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            found.append(plan.get("namespace", "?"))
+        for key, value in plan.items():
+            if key != "rejectedPlans":
+                found.extend(find_collscans(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            found.extend(find_collscans(value))
+    return found
+
+async def verify_hot_query_indexes(db, schemas) -> List[str]:
+    """
+    Explains each schema's hot_queries() and warns about any that would COLLSCAN.
+    Returns the names of the offending queries.
+    """
+    offenders = []
+    for schema in schemas:
+        if not hasattr(schema, 'hot_queries'):
+            continue
+        for name, query, sort in schema.hot_queries():
+            try:
+                plan = await db[schema.COLLECTION].find(query).sort(sort).explain()
+            except Exception as e:
+                print(f"Could not explain '{name}' on '{schema.COLLECTION}': {e}")
+                continue
+            if find_collscans(plan.get("queryPlanner", {}).get("winningPlan")):
+                offenders.append(f"{schema.COLLECTION}: {name}")
+                print(f"WARNING: hot query '{name}' on '{schema.COLLECTION}' uses COLLSCAN. Check its indexes.")
+    if not offenders:
+        print("Hot query index verification passed.")
+    return offenders
+
 async def init_database():
-    client = AsyncIOMotorClient(settings.MONGO_URI) 
-    db = client[settings.MONGO_DB_NAME] 
+    db = mongo.db
 
     all_schemas = [
         role_schema, employee_schema, attendance_schema, leave_schema,
@@ -26,7 +67,9 @@ async def init_database():
         asset_schema, allotted_asset_schema, report_schema, audit_schema,
         user_notification_schema,
         ai_conversation_schema,
-        permission_schema  # <-- 2. ADD THIS TO THE LIST
+        permission_schema,  # <-- 2. ADD THIS TO THE LIST
+        notification_dead_letter_schema,
+        daily_attendance_status_schema
     ] 
 
     print("Starting database index creation...")
@@ -43,6 +86,9 @@ async def init_database():
 
     print("Database index creation process completed.") 
 
+    if settings.VERIFY_INDEXES_ON_STARTUP:
+        await verify_hot_query_indexes(db, all_schemas)
+
     # --- Seeding Initial Data ---
 
     # 3. ADD NEW PERMISSIONS SEEDING BLOCK
@@ -0,0 +1,57 @@
+# backend/app/json_response.py
+"""
+The app-wide JSON response class with a pluggable encoder.
+
+`JSON_BACKEND` picks the encoder: "orjson" (native datetime/date, only ObjectId
+goes through a callback), "stdlib" (the original json.dumps path), or "auto"
+(orjson when installed). Both produce the same values: datetimes as
+isoformat() strings and ObjectIds as plain strings. orjson output is compact
+and UTF-8 rather than ", "-separated and ASCII-escaped.
+"""
+import json
+from datetime import datetime, date
+from typing import Any, Callable
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from app.config import settings
+
+try:
+    import orjson
+except ImportError: # Optional dependency; fall back to the stdlib encoder
+    orjson = None
+
+def custom_json_serializer(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+def _orjson_default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+def dumps_stdlib(content: Any) -> bytes:
+    return json.dumps(content, default=custom_json_serializer).encode("utf-8")
+
+def dumps_orjson(content: Any) -> bytes:
+    # Non-str keys are stringified like json.dumps does
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+def select_backend(name: str) -> Callable[[Any], bytes]:
+    if name == "stdlib":
+        return dumps_stdlib
+    if name == "orjson":
+        if orjson is None:
+            raise RuntimeError("JSON_BACKEND is 'orjson' but orjson is not installed")
+        return dumps_orjson
+    if name == "auto":
+        return dumps_orjson if orjson is not None else dumps_stdlib
+    raise ValueError(f"Unknown JSON_BACKEND '{name}'")
+
+dumps = select_backend(settings.JSON_BACKEND)
+
+class CustomJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -4,14 +4,19 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from bson import ObjectId
-from datetime import datetime, date
-import json
+from app.static_files import CachedStaticFiles
 
 from app.config import settings
+from app.database import mongo
+from app.json_response import CustomJSONResponse
+from app.pagination import NEXT_CURSOR_HEADER
 from app.init_db import init_database
 from app.dependencies.audit import AuditLogMiddleware
+from app.services.audit_service import audit_writer
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.password_hasher import password_hasher, bulk_password_hasher
+from app.services.upload_writer import upload_writer
+from app.services import attendance_status_service
 from app.routers import (
     auth, # <-- 1. 'roles' is removed from this line
     employees, attendance, leaves, payroll,
@@ -19,27 +24,24 @@ from app.routers import (
     role_management  # <-- 2. ADD 'role_management'
 )
 
-# --- (Serializer, Lifespan, App, and Exception Handler) ---
-def custom_json_serializer(obj):
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
-
-class CustomJSONResponse(JSONResponse):
-    def render(self, content: any) -> bytes:
-        return json.dumps(
-            content,
-            default=custom_json_serializer,
-        ).encode("utf-8")
-
+# --- (Lifespan, App, and Exception Handler) ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
+    mongo.connect() # One pooled client per worker, shared by every router/service
     await init_database()
+    await audit_writer.start()
+    await notification_dispatcher.start()
+    attendance_status_service.start_scheduler()
     yield
     print("Shutting down...")
+    await attendance_status_service.stop_scheduler()
+    await notification_dispatcher.stop() # Deliver queued notifications before closing
+    await audit_writer.stop() # Flush buffered audit entries before the client goes away
+    password_hasher.shutdown()
+    bulk_password_hasher.shutdown()
+    upload_writer.shutdown()
+    mongo.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -76,7 +78,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # --- (End of unchanged section) ---
 
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="app/static"), name="static")
 
 origins = [
     "http://localhost:5173", # Allow frontend origin
@@ -88,6 +90,7 @@ app.add_middleware(
     allow_credentials=True, 
     allow_methods=["*"],
     allow_headers=["*"], 
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.add_middleware(AuditLogMiddleware)
@@ -4,6 +4,7 @@ from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator, va
 from datetime import date, datetime
 from typing import Optional, List
 from .pyobjectid import PyObjectId
+from app.signed_urls import StaticUrl
 import re # Import the regular expression module
 
 class Skill(BaseModel):
@@ -23,10 +24,10 @@ class EmployeeBase(BaseModel):
     department: Optional[str] = Field(None, max_length=100)
     role_id: str = Field(..., description="Foreign key referencing the Roles collection")
     reports_to: Optional[str] = Field(None, description="Employee ID of the manager")
-    photo_url: Optional[str] = None
+    photo_url: Optional[StaticUrl] = None
     salary: Optional[float] = Field(None, ge=0) # Ensure non-negative salary
     skills: Optional[List[Skill]] = []
-    certificates: Optional[List[str]] = []
+    certificates: Optional[List[StaticUrl]] = []
     is_active: bool = True
     is_deleted: bool = Field(default=False)
 
@@ -178,6 +179,7 @@ class EmployeeInDB(EmployeeBase):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    permissions: List[str] = []
 
 class TokenPayload(BaseModel):
     employee_id: str
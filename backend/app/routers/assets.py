@@ -3,13 +3,13 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Dict, Any
 from pydantic import BaseModel, ValidationError
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.dependencies.auth import get_current_employee, require_role, require_permission 
 # --- IMPORT AssetUpdate ---
 from app.models.asset import AssetInDB, AllottedAssetInDB, AssetWithDetails, MyAssetResponse, AssetCreate, AllottedAssetBase, AssetUpdate
 from datetime import datetime, timezone, date
-from app.services import notification_service
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services import employee_directory
 import logging
 
 # Configure logging
@@ -22,8 +22,6 @@ router = APIRouter(
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 assets_collection = db.assets
 allotted_collection = db.allotted_assets
 employees_collection = db.employees
@@ -218,15 +216,12 @@ async def allot_asset(allotment_in: AllotmentRequest, current_user: Dict[str, An
         raise HTTPException(status_code=500, detail="Failed to update asset status after allotment.")
 
     # --- Notification Logic (remains same) ---
-    recipient_ids = [allotment_in.employee_id]
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    admin_hr_ids = [uid for uid in admin_hr_ids if uid != allotment_in.employee_id]
-    all_recipient_ids = list(set(recipient_ids + admin_hr_ids))
     allotter_name = f"{current_user.get('first_name', 'System')} {current_user.get('last_name', '')}".strip()
     employee_name = f"{employee.get('first_name', '')} {employee.get('last_name', '')}".strip()
 
-    await notification_service.create_notification(
-        recipient_ids=all_recipient_ids,
+    await notification_dispatcher.publish(
+        recipient_ids=[allotment_in.employee_id],
+        notify_admin_hr=True,
         message_self=f"Asset '{asset['asset_name']}' ({asset['asset_id']}) has been allotted to you.",
         message_other=f"Asset '{asset['asset_name']}' ({asset['asset_id']}) has been allotted to {employee_name} ({allotment_in.employee_id}) by {allotter_name}.",
         link_self="/employee/my-assets", link_other="/admin/manage-assets",
@@ -274,15 +269,12 @@ async def allot_asset_to_team(allotment_in: TeamAllotmentRequest, current_user:
         raise HTTPException(status_code=500, detail="Failed to update asset status after team allotment.")
 
     # --- Notification Logic (remains same) ---
-    recipient_ids = [allotment_in.manager_id]
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    admin_hr_ids = [uid for uid in admin_hr_ids if uid != allotment_in.manager_id]
-    all_recipient_ids = list(set(recipient_ids + admin_hr_ids))
     allotter_name = f"{current_user.get('first_name', 'System')} {current_user.get('last_name', '')}".strip()
     manager_name = f"{manager.get('first_name', '')} {manager.get('last_name', '')}".strip()
 
-    await notification_service.create_notification(
-        recipient_ids=all_recipient_ids,
+    await notification_dispatcher.publish(
+        recipient_ids=[allotment_in.manager_id],
+        notify_admin_hr=True,
         message_self=f"Asset '{asset['asset_name']}' ({asset['asset_id']}) has been allotted to your team.",
         message_other=f"Team asset '{asset['asset_name']}' ({asset['asset_id']}) has been allotted to {manager_name}'s team by {allotter_name}.",
         link_self="/employee/my-assets", link_other="/admin/manage-assets",
@@ -335,19 +327,16 @@ async def reclaim_asset(reclaim_in: ReclaimRequest, current_user: Dict[str, Any]
         
     # --- Notification Logic (remains same) ---
     reclaimed_from_employee_id = current_allotment["employee_id"]
-    recipient_ids = [reclaimed_from_employee_id]
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    admin_hr_ids = [uid for uid in admin_hr_ids if uid != reclaimed_from_employee_id]
-    all_recipient_ids = list(set(recipient_ids + admin_hr_ids))
     reclaimer_name = f"{current_user.get('first_name', 'System')} {current_user.get('last_name', '')}".strip()
-    reclaimed_from_employee = await employees_collection.find_one({"employee_id": reclaimed_from_employee_id})
-    reclaimed_from_name = f"{reclaimed_from_employee.get('first_name', '')} {reclaimed_from_employee.get('last_name', '')}".strip() if reclaimed_from_employee else reclaimed_from_employee_id
+    reclaimed_from_employee = await employee_directory.get_entry(reclaimed_from_employee_id)
+    reclaimed_from_name = employee_directory.full_name(reclaimed_from_employee, default=reclaimed_from_employee_id)
 
     message_self = f"Asset '{asset['asset_name']}' ({asset_id_to_reclaim}) has been reclaimed from you."
     message_other = f"Asset '{asset['asset_name']}' ({asset_id_to_reclaim}) has been reclaimed from {reclaimed_from_name} by {reclaimer_name}."
 
-    await notification_service.create_notification(
-        recipient_ids=all_recipient_ids,
+    await notification_dispatcher.publish(
+        recipient_ids=[reclaimed_from_employee_id],
+        notify_admin_hr=True,
         message_self=message_self, message_other=message_other,
         link_self="/employee/my-assets", link_other="/admin/manage-assets",
         type="asset_reclaim", subject_employee_id=reclaimed_from_employee_id
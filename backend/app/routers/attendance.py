@@ -1,27 +1,31 @@
 # backend/app/routers/attendance.py
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional # <-- 'Optional' has been added here
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.dependencies.auth import get_current_employee, require_role
 # --- Import the new response model and BaseModel ---
 from app.models.attendance import AttendanceInDB, AttendanceResponseWithName
+from app.trusted_read import TrustedShape
 from pydantic import BaseModel
 from datetime import datetime, date, timedelta, timezone
 from calendar import monthrange
-from app.services import notification_service
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services import employee_directory, attendance_status_service, attendance_export
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(
     tags=["Attendance"],
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 collection = db.attendance
 employees_collection = db.employees
 
+attendance_shape = TrustedShape(AttendanceInDB)
+
 # --- NEW: Add a response model for the status ---
 class AttendanceStatusResponse(BaseModel):
     status: str
@@ -58,45 +62,51 @@ async def check_in(current_user: Dict[str, Any] = Depends(get_current_employee))
     today = date.today()
     start_of_day = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
 
-    existing_attendance = await collection.find_one({
-        "employee_id": employee_id,
-        "check_in_time": {"$gte": start_of_day},
-        "check_out_time": None
-    })
-    if existing_attendance:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have an active check-in for today. Please check out before checking in again."
-        )
-
     attendance_doc = {
         "attendance_id": f"ATT-{uuid.uuid4().hex[:8].upper()}",
         "employee_id": employee_id,
         "check_in_time": datetime.now(timezone.utc),
+        "check_in_date": today.isoformat(), # Key of the unique open check-in index
         "check_out_time": None,
         "status": "Present"
     }
-    insert_result = await collection.insert_one(attendance_doc)
-    if not insert_result.inserted_id:
+    active_check_in_error = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="You have an active check-in for today. Please check out before checking in again."
+    )
+    # Upsert-guarded insert: returns today's open check-in if one exists,
+    # otherwise inserts ours - one round trip either way. Two concurrent upserts
+    # can both miss the filter; the unique attendance_open_check_in index
+    # rejects the second insert.
+    try:
+        attendance_record = await collection.find_one_and_update(
+            {
+                "employee_id": employee_id,
+                "check_in_time": {"$gte": start_of_day},
+                "check_out_time": None
+            },
+            {"$setOnInsert": attendance_doc},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise active_check_in_error
+    if not attendance_record:
         raise HTTPException(status_code=500, detail="Failed to record check-in.")
+    if attendance_record["attendance_id"] != attendance_doc["attendance_id"]:
+        raise active_check_in_error
 
-    created_attendance = await collection.find_one({"attendance_id": attendance_doc["attendance_id"]})
-    if not created_attendance:
-         raise HTTPException(status_code=500, detail="Failed to retrieve created attendance record after check-in.")
-
-    # --- Fetch employee name ---
-    employee = await employees_collection.find_one({"employee_id": employee_id})
-    employee_name = f"{employee.get('first_name', '')} {employee.get('last_name', '')}".strip() if employee else ""
-    first_name = employee.get('first_name') if employee else None
-    last_name = employee.get('last_name') if employee else None
-    # --- End fetch employee name ---
+    # --- Employee name from the cached directory ---
+    employee = await employee_directory.get_entry(employee_id)
+    employee_name = employee_directory.full_name(employee)
 
-    # --- Notification Logic (using fetched name) ---
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    recipient_ids = list(set([employee_id] + admin_hr_ids))
+    await attendance_status_service.record_check_in(attendance_record, today)
 
-    await notification_service.create_notification(
-        recipient_ids=recipient_ids,
+    # --- Notification Logic (using cached name) ---
+    # Persisted by the background dispatcher, not on the request path
+    await notification_dispatcher.publish(
+        recipient_ids=[employee_id],
+        notify_admin_hr=True,
         message_self="You have successfully checked in.",
         message_other=f"{employee_name or employee_id} has checked in.", # Use name if available
         link_self="/employee/my-attendance",
@@ -106,10 +116,11 @@ async def check_in(current_user: Dict[str, Any] = Depends(get_current_employee))
     )
     # --- End Notification Logic ---
 
-    # --- Combine data for response ---
-    response_data = {**created_attendance, "first_name": first_name, "last_name": last_name}
-    return response_data
-    # --- End combine data ---
+    return {
+        **attendance_record,
+        "first_name": employee.get("first_name") if employee else None,
+        "last_name": employee.get("last_name") if employee else None
+    }
 
 # --- Use AttendanceResponseWithName as response_model ---
 @router.put("/check-out", status_code=status.HTTP_200_OK, response_model=AttendanceResponseWithName)
@@ -119,44 +130,34 @@ async def check_out(current_user: Dict[str, Any] = Depends(get_current_employee)
     today = date.today()
     start_of_day = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
 
-    attendance_record = await collection.find_one({
-        "employee_id": employee_id,
-        "check_in_time": {"$gte": start_of_day},
-        "check_out_time": None
-    }, sort=[("check_in_time", -1)])
-
-    if not attendance_record:
+    # Close the most recent open check-in and get the final document in one round trip
+    updated_attendance_record = await collection.find_one_and_update(
+        {
+            "employee_id": employee_id,
+            "check_in_time": {"$gte": start_of_day},
+            "check_out_time": None
+        },
+        {"$set": {"check_out_time": datetime.now(timezone.utc)}},
+        sort=[("check_in_time", -1)],
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_attendance_record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No active check-in found for today to check out from."
         )
 
-    update_result = await collection.update_one(
-        {"_id": attendance_record["_id"]},
-        {"$set": {"check_out_time": datetime.now(timezone.utc)}}
-    )
-
-    if update_result.matched_count == 0:
-         raise HTTPException(status_code=404, detail="Could not find the specific check-in record to update during check-out.")
-
-    updated_attendance_record = await collection.find_one({"_id": attendance_record["_id"]})
-    if not updated_attendance_record:
-         raise HTTPException(status_code=404, detail="Could not retrieve updated attendance record after check-out.")
-
+    # --- Employee name from the cached directory ---
+    employee = await employee_directory.get_entry(employee_id)
+    employee_name = employee_directory.full_name(employee)
 
-    # --- Fetch employee name ---
-    employee = await employees_collection.find_one({"employee_id": employee_id})
-    employee_name = f"{employee.get('first_name', '')} {employee.get('last_name', '')}".strip() if employee else ""
-    first_name = employee.get('first_name') if employee else None
-    last_name = employee.get('last_name') if employee else None
-    # --- End fetch employee name ---
+    await attendance_status_service.record_check_out(updated_attendance_record, today)
 
-    # --- Notification Logic (using fetched name) ---
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    recipient_ids = list(set([employee_id] + admin_hr_ids))
-
-    await notification_service.create_notification(
-        recipient_ids=recipient_ids,
+    # --- Notification Logic (using cached name) ---
+    # Persisted by the background dispatcher, not on the request path
+    await notification_dispatcher.publish(
+        recipient_ids=[employee_id],
+        notify_admin_hr=True,
         message_self="You have successfully checked out.",
         message_other=f"{employee_name or employee_id} has checked out.", # Use name if available
         link_self="/employee/my-attendance",
@@ -166,102 +167,21 @@ async def check_out(current_user: Dict[str, Any] = Depends(get_current_employee)
     )
     # --- End Notification Logic ---
 
-    # --- Combine data for response ---
-    response_data = {**updated_attendance_record, "first_name": first_name, "last_name": last_name}
-    return response_data
-    # --- End combine data ---
+    return {
+        **updated_attendance_record,
+        "first_name": employee.get("first_name") if employee else None,
+        "last_name": employee.get("last_name") if employee else None
+    }
 
 
-# --- Rest of the endpoints (get_today_status_report, etc.) remain unchanged ---
+# --- Rest of the endpoints (get_today_status_report, etc.) ---
 @router.get("/today-status", response_model=List[Dict[str, Any]], dependencies=[Depends(require_role(["admin", "hr"]))])
 async def get_today_status_report():
-    # ... (implementation remains the same) ...
-    today = date.today()
-    start_of_day = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
-    end_of_day = datetime.combine(today, datetime.max.time(), tzinfo=timezone.utc)
-    today_start_dt = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
-
-
-    pipeline = [
-        {
-            "$lookup": {
-                "from": "attendance",
-                "let": {"employee_id_lookup": "$employee_id"},
-                "pipeline": [
-                    {
-                        "$match": {
-                            "$expr": {
-                                "$and": [
-                                    {"$eq": ["$employee_id", "$$employee_id_lookup"]},
-                                    {"$gte": ["$check_in_time", start_of_day]},
-                                    {"$lt": ["$check_in_time", end_of_day]}
-                                ]
-                            }
-                        }
-                    },
-                    {"$sort": {"check_in_time": -1}},
-                    {"$limit": 1}
-                ],
-                "as": "today_attendance"
-            }
-        },
-        {
-            "$unwind": {
-                "path": "$today_attendance",
-                "preserveNullAndEmptyArrays": True
-            }
-        },
-        {
-             "$lookup": {
-                 "from": "leaves",
-                 "let": {"employee_id_leave": "$employee_id"},
-                 "pipeline": [
-                     {
-                         "$match": {
-                             "$expr": {
-                                 "$and": [
-                                     {"$eq": ["$employee_id", "$$employee_id_leave"]},
-                                     {"$in": ["$status", ["approved", "partially_approved"]]},
-                                     {"$lte": ["$start_date", today_start_dt]},
-                                     {"$gte": ["$end_date", today_start_dt]}
-                                 ]
-                             }
-                         }
-                     },
-                     {"$limit": 1}
-                 ],
-                 "as": "today_leave"
-             }
-         },
-        {
-            "$project": {
-                "_id": 0,
-                "employee_id": 1,
-                "first_name": 1,
-                "last_name": 1,
-                "check_in_time": "$today_attendance.check_in_time",
-                "check_out_time": "$today_attendance.check_out_time",
-                "status": {
-                    "$cond": {
-                        "if": {"$ifNull": ["$today_attendance.status", False]},
-                        "then": "$today_attendance.status",
-                        "else": {
-                            "$cond": {
-                                "if": {"$gt": [{"$size": "$today_leave"}, 0]},
-                                "then": "On Leave",
-                                "else": "Absent"
-                            }
-                        }
-                    }
-                }
-            }
-        },
-         {
-            "$sort": {"first_name": 1, "last_name": 1}
-         }
-    ]
-    report = await employees_collection.aggregate(pipeline).to_list(None)
-    return report
+    """
+    Today's status for every employee, read from the materialized
+    daily_attendance_status collection (one indexed query).
+    """
+    return await attendance_status_service.get_day_status(date.today())
 
 @router.get("/employee/{employee_id}/first-checkin", dependencies=[Depends(require_role(["admin", "hr"]))])
 async def get_first_checkin(employee_id: str):
@@ -302,9 +222,9 @@ async def get_employee_attendance_by_month(employee_id: str, year: int, month: i
 async def get_my_attendance(current_user: Dict[str, Any] = Depends(get_current_employee)):
     # ... (implementation remains the same) ...
     records = await collection.find(
-        {"employee_id": current_user["employee_id"]}
+        {"employee_id": current_user["employee_id"]}, attendance_shape.projection
     ).sort("check_in_time", -1).to_list(1000)
-    return records
+    return attendance_shape.response(records)
 
 @router.get("/report", response_model=List[Dict[str, Any]], dependencies=[Depends(require_role(["admin", "hr"]))])
 async def get_full_attendance_report(
@@ -356,4 +276,25 @@ async def get_full_attendance_report(
     ]
 
     report = await collection.aggregate(pipeline).to_list(None)
-    return report
\ No newline at end of file
+    return report
+
+@router.get("/report/export", dependencies=[Depends(require_role(["admin", "hr"]))])
+async def export_attendance_report(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    employee_id: str | None = None,
+    cursor: str | None = Query(None, description="Resume after the row carrying this cursor")
+    ):
+    """
+    Streams the full report, newest first, without loading it into memory.
+    Each row includes a `cursor`; pass the last one received to resume.
+    """
+    after = attendance_export.parse_cursor(cursor) if cursor else None
+    rows = attendance_export.iter_rows(attendance_export.build_match(start_date, end_date, employee_id), after)
+    body = attendance_export.stream_csv(rows) if format == "csv" else attendance_export.stream_ndjson(rows)
+    return StreamingResponse(
+        body,
+        media_type=attendance_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="attendance_report.{format}"'}
+    )
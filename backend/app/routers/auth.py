@@ -1,19 +1,18 @@
 # backend/app/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import timedelta
 
 from app.config import settings
 from app.dependencies.auth import (
-    verify_password,
     get_current_employee,
     create_access_token,
-    db, # <-- 1. Import db from auth dependency
-    roles_collection # <-- 2. Import roles_collection from auth dependency
+    db # <-- 1. Import db from auth dependency
 )
 from app.schemas import employee_schema
+from app.services import permission_service
+from app.services.password_hasher import password_hasher
 from app.models.employee import Token
 from app.models.employee import EmployeeBase
 
@@ -30,29 +29,32 @@ async def read_users_me(current_user: Dict[str, Any] = Depends(get_current_emplo
 
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    # Use the db instance from the auth dependency
-    employee = await employee_schema.get_employee_by_id(db, employee_id=form_data.username)
-    if not employee or not verify_password(form_data.password, employee["hashed_password"]):
+    employee = await employee_schema.get_login_credentials(db, employee_id=form_data.username)
+    valid, new_hash = (
+        await password_hasher.verify_and_update(form_data.password, employee["hashed_password"])
+        if employee and employee.get("hashed_password") else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect employee ID or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if employee.get("is_deleted") or employee.get("is_active") is False:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="This account is disabled")
+    if new_hash:
+        # Cost parameters changed since this hash was made; upgrade it transparently
+        await employee_schema.update_password_hash(db, employee["employee_id"], employee["hashed_password"], new_hash)
         
-    # --- 3. ADD PERMISSION FETCHING LOGIC ---
-    user_permissions: List[str] = []
-    role = await roles_collection.find_one({"role_id": employee["role_id"], "is_deleted": {"$ne": True}})
-    if role:
-        user_permissions = role.get("permission_keys", [])
-    # --- END PERMISSION LOGIC ---
+    # The token carries only the role and its version; permissions are resolved per request
+    role = await permission_service.get_role_entry(employee["role_id"])
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    # --- 4. ADD PERMISSIONS TO TOKEN DATA ---
     token_data = {
         "Employee_id": employee["employee_id"], 
         "role": employee["role_id"],
-        "permissions": user_permissions # Add permissions list
+        "rv": role["version"]
     }
     
     access_token = create_access_token(
@@ -60,7 +62,12 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         expires_delta=access_token_expires
     )
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "token_type": "bearer", "permissions": sorted(role["permissions"])}
+
+@router.get("/permissions", response_model=List[str])
+async def read_my_permissions(current_user: Dict[str, Any] = Depends(get_current_employee)):
+    """The caller's current permission keys (the UI refreshes these instead of reading the token)."""
+    return sorted(current_user["permissions"])
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(response: Response):
@@ -1,20 +1,21 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.dependencies.auth import get_current_employee, require_role, require_permission
 from app.models.employee_skill import EmployeeSkillInDB, EmployeeSkillCreate, EmployeeSkillUpdate
+from app.services import employee_directory
 
 router = APIRouter(
     tags=["Employee Skills"],
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 collection = db.employee_skills
 
+LIST_LIMIT = 1000
+LIST_BATCH_SIZE = 200
+
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=EmployeeSkillInDB, dependencies=[Depends(require_permission("skill:create"))])
 async def add_employee_skill(skill_in: EmployeeSkillCreate):
     skill_doc = skill_in.model_dump()
@@ -36,33 +37,28 @@ async def add_employee_skill(skill_in: EmployeeSkillCreate):
 
 @router.get("", response_model=List[Dict[str, Any]], dependencies=[Depends(require_permission("skill:read_all"))])
 async def list_all_employee_skills():
-    pipeline = [
-        {"$match": {"is_deleted": {"$ne": True}}}, # <-- ADD FILTER
-        {
-            "$lookup": {
-                "from": "employees",
-                "localField": "employee_id",
-                "foreignField": "employee_id",
-                "as": "employee_details"
-            }
-        },
-        {"$unwind": {"path": "$employee_details", "preserveNullAndEmptyArrays": True}},
-        # Also filter out deleted employees
-        {"$match": {"employee_details.is_deleted": {"$ne": True}}}, # <-- ADD FILTER
-        {
-            "$project": {
-                "_id": 0,
-                "employee_skill_id": 1,
-                "employee_id": 1,
-                "first_name": {"$ifNull": ["$employee_details.first_name", "N/A"]},
-                "last_name": {"$ifNull": ["$employee_details.last_name", ""]},
-                "skill_name": 1,
-                "proficiency_level": 1
-            }
-        }
-    ]
-    skills = await collection.aggregate(pipeline).to_list(1000)
-    return skills
+    """
+    Lists up to LIST_LIMIT skills with employee names from the employee directory.
+    Rows are read a batch at a time until the page is full, so skills of deleted
+    employees (dropped here) never shorten the page or pull the whole collection.
+    """
+    cursor = collection.find(
+        {"is_deleted": {"$ne": True}}, # <-- ADD FILTER
+        {"_id": 0, "employee_skill_id": 1, "employee_id": 1, "skill_name": 1, "proficiency_level": 1}
+    ).batch_size(LIST_BATCH_SIZE)
+
+    listed = []
+    while len(listed) < LIST_LIMIT and (batch := await cursor.to_list(LIST_BATCH_SIZE)):
+        names = await employee_directory.get_entries(skill["employee_id"] for skill in batch)
+        for skill in batch:
+            employee = names.get(skill["employee_id"])
+            # Also filter out deleted employees
+            if employee_directory.is_deleted(employee):
+                continue
+            skill["first_name"] = (employee or {}).get("first_name") or "N/A"
+            skill["last_name"] = (employee or {}).get("last_name") or ""
+            listed.append(skill)
+    return listed[:LIST_LIMIT]
 
 @router.get("/me", response_model=List[EmployeeSkillInDB], dependencies=[Depends(require_permission("skill:read_self"))])
 async def get_my_skills(current_user: Dict[str, Any] = Depends(get_current_employee)):
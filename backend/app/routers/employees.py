@@ -1,19 +1,28 @@
 # backend/app/routers/employees.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, Body, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 from typing import Any, List, Optional
-import shutil
-from pathlib import Path
-from motor.motor_asyncio import AsyncIOMotorClient
-from datetime import datetime, date, timedelta
+from app.database import db
+from datetime import datetime, date
 import uuid
 import json
-from pymongo import DESCENDING # Import DESCENDING for sorting
+import re
+from pymongo import ASCENDING, DESCENDING # Import DESCENDING for sorting
 
 from app.config import settings
-from app.dependencies.auth import get_current_employee, require_role, get_password_hash, require_permission
+from app.json_response import CustomJSONResponse
+from app.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.trusted_read import TrustedShape
+from app.signed_urls import sign_url
+from app.dependencies.auth import get_current_employee, require_role, require_permission
 from app.models.employee import EmployeeBase, EmployeeCreate, EmployeeUpdate
 from app.schemas import employee_schema
+from app.services import notification_service, employee_directory, attendance_status_service, employee_service, bulk_onboarding
+from app.services.password_hasher import password_hasher
+from app.services.id_sequence import employee_id_sequence
+from app.services.upload_writer import upload_writer, PHOTO_POLICY, CERTIFICATE_POLICY
+from app.services import blob_store, photo_variants
 from pydantic import BaseModel, EmailStr
 
 router = APIRouter(
@@ -21,16 +30,21 @@ router = APIRouter(
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 collection = db.employees
 skills_collection = db.employee_skills
 payroll_collection = db.payroll
 user_notifications_collection = db.user_notifications # <-- ADD THIS
 
-IMAGE_DIR = Path("app/static/images")
+# Fields whose change can add/remove someone from the cached admin/HR recipient set
+RECIPIENT_AFFECTING_FIELDS = {"role_id", "is_active", "is_deleted"}
+
+# Fields a caller may ask list_employees to project (never hashed_password)
+LISTABLE_FIELDS = set(EmployeeBase.model_fields) - {"id"}
+employee_shape = TrustedShape(EmployeeBase)
+
+IMAGE_DIR = PHOTO_POLICY.directory
 IMAGE_DIR.mkdir(parents=True, exist_ok=True)
-CERTIFICATES_DIR = Path("app/static/certificates")
+CERTIFICATES_DIR = CERTIFICATE_POLICY.directory
 CERTIFICATES_DIR.mkdir(parents=True, exist_ok=True)
 
 class Skill(BaseModel):
@@ -52,19 +66,17 @@ async def upload_employee_photo(employee_id: str, file: UploadFile = File(...)):
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    file_extension = Path(file.filename).suffix
-    photo_filename = f"{employee_id}{file_extension}"
-    photo_path = IMAGE_DIR / photo_filename
-
-    with photo_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    blob = await photo_variants.store_photo(file)
 
-    photo_url = f"/static/images/{photo_filename}"
-
-    await collection.update_one(
+    previous = await collection.find_one_and_update(
         {"employee_id": employee_id},
-        {"$set": {"photo_url": photo_url}}
+        {"$set": {"photo_url": blob["url"]}},
+        projection={"_id": 0, "photo_url": 1}
     )
+    if previous and previous.get("photo_url") != blob["url"]:
+        await blob_store.release_url(previous.get("photo_url"))
+    else:
+        await blob_store.release(blob["sha256"]) # Same photo again; keep a single reference
 
     updated_employee = await collection.find_one({"employee_id": employee_id})
     return updated_employee
@@ -75,19 +87,14 @@ async def upload_employee_certificate(employee_id: str, file: UploadFile = File(
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    file_extension = Path(file.filename).suffix
-    unique_filename = f"{employee_id}_{uuid.uuid4().hex[:8]}{file_extension}"
-    certificate_path = CERTIFICATES_DIR / unique_filename
+    blob = await blob_store.put(file, CERTIFICATE_POLICY)
 
-    with certificate_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    certificate_url = f"/static/certificates/{unique_filename}"
-
-    await collection.update_one(
-        {"employee_id": employee_id},
-        {"$push": {"certificates": certificate_url}}
+    result = await collection.update_one(
+        {"employee_id": employee_id, "certificates": {"$ne": blob["url"]}},
+        {"$push": {"certificates": blob["url"]}}
     )
+    if result.modified_count == 0:
+        await blob_store.release(blob["sha256"]) # Already attached to this employee
 
     updated_employee = await collection.find_one({"employee_id": employee_id})
     return updated_employee
@@ -98,7 +105,7 @@ async def delete_employee_certificate(employee_id: str, request: CertificateDele
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    certificate_url = request.certificate_url
+    certificate_url = request.certificate_url.split("?", 1)[0] # Drop any URL signature
 
     result = await collection.update_one(
         {"employee_id": employee_id},
@@ -107,26 +114,19 @@ async def delete_employee_certificate(employee_id: str, request: CertificateDele
 
     if result.modified_count > 0:
         try:
-            filename = certificate_url.split('/')[-1]
-            file_path = CERTIFICATES_DIR / filename
-            if file_path.exists():
-                file_path.unlink()
+            if blob_store.ref_from_url(certificate_url):
+                # Other employees may share this file; it goes when the last reference does
+                await blob_store.release_url(certificate_url)
+            else:
+                filename = certificate_url.split('/')[-1]
+                file_path = CERTIFICATES_DIR / filename
+                await upload_writer.discard_path(file_path)
         except Exception as e:
             print(f"Error deleting certificate file: {e}")
 
     updated_employee = await collection.find_one({"employee_id": employee_id})
     return updated_employee
 
-async def get_next_employee_id():
-    # This logic remains fine, it just needs the last *ever* employee
-    last_employee = await collection.find_one(sort=[("employee_id", DESCENDING)])
-    if not last_employee or not last_employee["employee_id"].startswith("EMP"):
-        return "EMP001"
-
-    last_id_num = int(last_employee["employee_id"][3:])
-    new_id_num = last_id_num + 1
-    return f"EMP{new_id_num:03d}"
-
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=EmployeeBase, dependencies=[Depends(require_permission("employee:create"))])
 async def create_employee(
     first_name: str = Form(...),
@@ -149,8 +149,8 @@ async def create_employee(
     if await collection.find_one({"email": email, "is_deleted": {"$ne": True}}): # <-- FILTER
         raise HTTPException(status_code=400, detail="Employee with this email already exists")
 
-    new_employee_id = await get_next_employee_id()
-    hashed_password = get_password_hash(password)
+    new_employee_id = await employee_id_sequence.next_id()
+    hashed_password = await password_hasher.hash(password)
 
     parsed_skills = [Skill(**json.loads(s)) for s in skills] if skills else []
 
@@ -167,47 +167,26 @@ async def create_employee(
 
     # Handle photo upload
     if photo:
-        file_extension = Path(photo.filename).suffix
-        photo_filename = f"{new_employee_id}{file_extension}"
-        photo_path = IMAGE_DIR / photo_filename
-        with photo_path.open("wb") as buffer:
-            shutil.copyfileobj(photo.file, buffer)
-        new_employee_data["photo_url"] = f"/static/images/{photo_filename}"
+        new_employee_data["photo_url"] = (await photo_variants.store_photo(photo))["url"]
 
     # Handle certificate uploads
     certificate_urls = []
     for cert_file in certificates:
-        file_extension = Path(cert_file.filename).suffix
-        unique_filename = f"{new_employee_id}_{uuid.uuid4().hex[:8]}{file_extension}"
-        certificate_path = CERTIFICATES_DIR / unique_filename
-        with certificate_path.open("wb") as buffer:
-            shutil.copyfileobj(cert_file.file, buffer)
-        certificate_urls.append(f"/static/certificates/{unique_filename}")
+        blob = await blob_store.put(cert_file, CERTIFICATE_POLICY)
+        if blob["url"] in certificate_urls:
+            await blob_store.release(blob["sha256"]) # Same file attached twice
+        else:
+            certificate_urls.append(blob["url"])
     new_employee_data["certificates"] = certificate_urls
 
     created_employee = await employee_schema.create_employee(db, new_employee_data)
+    employee_directory.prime(created_employee)
+    if role_id in notification_service.ADMIN_HR_ROLES:
+        await notification_service.invalidate_admin_hr_ids()
+    await attendance_status_service.sync_employee(new_employee_id)
 
     # --- NEW: Automatically create initial payroll record ---
-    net_salary = gross_salary - deductions
-    start_of_month = hire_date.replace(day=1)
-    if start_of_month.month == 12:
-        end_of_month = start_of_month.replace(year=start_of_month.year + 1, month=1, day=1) - timedelta(days=1)
-    else:
-        end_of_month = start_of_month.replace(month=start_of_month.month + 1, day=1) - timedelta(days=1)
-
-
-    initial_payroll_doc = {
-        "payroll_id": f"PAY-{uuid.uuid4().hex[:8].upper()}",
-        "employee_id": new_employee_id,
-        "pay_period_start": datetime.combine(start_of_month, datetime.min.time()),
-        "pay_period_end": datetime.combine(end_of_month, datetime.min.time()),
-        "gross_salary": gross_salary,
-        "deductions": deductions,
-        "net_salary": net_salary,
-        "status": "Generated",
-        "is_deleted": False # <-- ADD THIS
-    }
-    await payroll_collection.insert_one(initial_payroll_doc)
+    await payroll_collection.insert_one(employee_service.initial_payroll_doc(new_employee_id, hire_date, gross_salary, deductions))
     # --- END NEW LOGIC ---
 
     # Create skills in the employee_skills collection
@@ -226,6 +205,24 @@ async def create_employee(
 
     return created_employee
 
+@router.post("/bulk", dependencies=[Depends(require_permission("employee:create"))])
+async def bulk_create_employees(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults from the file extension")
+):
+    """
+    Onboards many employees from a CSV or NDJSON file (EmployeeCreate fields per row).
+    Streams back one NDJSON result per row, then a final summary line.
+    """
+    file_format = bulk_onboarding.detect_format(file.filename, format)
+    if file_format is None:
+        raise HTTPException(status_code=400, detail="Upload a .csv or .ndjson file, or pass ?format=")
+    spooled = await bulk_onboarding.spool_upload(file)
+    return StreamingResponse(
+        bulk_onboarding.stream_report(spooled, file_format),
+        media_type="application/x-ndjson"
+    )
+
 
 @router.put("/{employee_id}", response_model=EmployeeBase, dependencies=[Depends(require_permission("employee:update"))])
 async def update_employee(employee_id: str, employee_update: EmployeeUpdate):
@@ -277,9 +274,16 @@ async def update_employee(employee_id: str, employee_update: EmployeeUpdate):
         {"$set": update_data}
     )
 
+    if RECIPIENT_AFFECTING_FIELDS & update_data.keys():
+        await notification_service.invalidate_admin_hr_ids()
+    await employee_directory.invalidate(employee_id)
+    if {"first_name", "last_name", "is_deleted"} & update_data.keys():
+        await attendance_status_service.sync_employee(employee_id)
+
     updated_employee = await collection.find_one({"employee_id": employee_id})
     if not updated_employee:
          raise HTTPException(status_code=404, detail="Employee not found after update.") 
+    employee_directory.prime(updated_employee)
 
     return updated_employee
 
@@ -296,6 +300,9 @@ async def delete_employee(employee_id: str):
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Employee not found")
+    await notification_service.invalidate_admin_hr_ids()
+    await employee_directory.invalidate(employee_id)
+    await attendance_status_service.sync_employee(employee_id)
 
     # Soft delete associated payroll and skills
     await payroll_collection.update_many({"employee_id": employee_id}, delete_payload)
@@ -318,7 +325,7 @@ async def delete_employee(employee_id: str):
 
 @router.put("/{employee_id}/password", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_permission("employee:update"))])
 async def change_employee_password(employee_id: str, new_password: str = Body(..., embed=True)):
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await password_hasher.hash(new_password)
     result = await collection.update_one(
         {"employee_id": employee_id, "is_deleted": {"$ne": True}}, # <-- FILTER
         {"$set": {"hashed_password": hashed_password}}
@@ -327,13 +334,65 @@ async def change_employee_password(employee_id: str, new_password: str = Body(..
         raise HTTPException(status_code=404, detail="Employee not found")
     return
 
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in LISTABLE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["employee_id"] + [f for f in requested if f != "employee_id"]
+
 @router.get("", response_model=List[EmployeeBase], dependencies=[Depends(require_permission("employee:read_all"))])
-async def list_employees():
-    employees = []
-    cursor = collection.find({"is_deleted": {"$ne": True}}) # <-- FILTER
-    async for employee in cursor:
-        employees.append(employee)
-    return employees
+async def list_employees(
+    limit: int = Query(settings.EMPLOYEE_PAGE_DEFAULT_LIMIT, ge=1, le=settings.EMPLOYEE_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    department: Optional[str] = None,
+    role_id: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=50, description="Case-sensitive first or last name prefix"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; employee_id is always included"),
+):
+    """
+    Keyset-paginated on employee_id. The cursor for the next page is returned in
+    the X-Next-Cursor header; it is absent on the last page.
+    """
+    query: dict[str, Any] = {"is_deleted": {"$ne": True}} # <-- FILTER
+    if cursor:
+        query["employee_id"] = {"$gt": decode_cursor(cursor)}
+    if department is not None:
+        query["department"] = department
+    if role_id is not None:
+        query["role_id"] = role_id
+    if is_active is not None:
+        query["is_active"] = is_active
+    if name_prefix:
+        # Anchored, case-sensitive regexes can use the name indexes
+        pattern = f"^{re.escape(name_prefix)}"
+        query["$or"] = [{"first_name": {"$regex": pattern}}, {"last_name": {"$regex": pattern}}]
+
+    projected_fields = _parse_fields(fields)
+    if projected_fields:
+        projection = {"_id": 0, **{field: 1 for field in projected_fields}}
+    else:
+        projection = employee_shape.projection
+
+    # One extra row tells us whether there is a next page
+    employees = await collection.find(query, projection).sort("employee_id", ASCENDING).limit(limit + 1).to_list(limit + 1)
+    headers = {}
+    if len(employees) > limit:
+        employees = employees[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(employees[-1]["employee_id"])
+
+    if projected_fields:
+        # Partial documents can't satisfy EmployeeBase's required fields
+        for employee in employees:
+            if employee.get("photo_url"):
+                employee["photo_url"] = sign_url(employee["photo_url"])
+            if employee.get("certificates"):
+                employee["certificates"] = [sign_url(url) for url in employee["certificates"]]
+        return CustomJSONResponse(employees, headers=headers)
+    return employee_shape.response(employees, headers=headers)
 
 @router.get("/me", response_model=EmployeeBase, dependencies=[Depends(require_permission("employee:read_self"))])
 async def read_employee_me(current_user: dict[str, Any] = Depends(get_current_employee)):
@@ -1,14 +1,15 @@
 # backend/app/routers/leaves.py
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from typing import List, Dict, Any, Optional
+from app.database import db
 from app.dependencies.auth import get_current_employee, require_role, require_permission
 # Import the specific service functions
 from app.services.leave_service import create_leave_request_service, update_leave_status_service
-from app.models.leave import LeaveCreate, LeaveInDB, LeaveUpdate, LeaveStatusEnum, DailyBreakdownItem # Added DailyBreakdownItem
-from datetime import datetime, timezone # Added timezone
+from app.services import leave_service
+from app.models.leave import LeaveCreate, LeaveInDB, LeaveUpdate, LeaveStatusEnum, LeaveDurationEnum, DailyBreakdownItem # Added DailyBreakdownItem
+from app.trusted_read import TrustedShape
+from datetime import date, datetime, timezone # Added timezone
 # REMOVED: from app.services import notification_service
 
 router = APIRouter(
@@ -16,11 +17,11 @@ router = APIRouter(
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 collection = db.leaves # Keep for GET endpoints
 employees_collection = db.employees # Keep for validation
 
+leave_shape = TrustedShape(LeaveInDB)
+
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=LeaveInDB)
 async def create_leave_request(
     leave_in: LeaveCreate,
@@ -133,5 +134,72 @@ async def list_all_leave_requests():
 @router.get("/me", response_model=List[LeaveInDB], dependencies=[Depends(require_permission("leave:read_self"))])
 async def get_my_leave_requests(current_user: Dict[str, Any] = Depends(get_current_employee)):
      # Use the 'collection' defined in this router
-    leaves = await collection.find({"employee_id": current_user["employee_id"]}).sort("start_date", -1).to_list(1000)
-    return leaves
\ No newline at end of file
+    leaves = await collection.find({"employee_id": current_user["employee_id"]}, leave_shape.projection).sort("start_date", -1).to_list(1000)
+    return leave_shape.response(leaves)
+
+# --- Overlap checks ---
+MAX_CALENDAR_DAYS = 366
+
+def _check_window(start_date: date, end_date: date):
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date cannot be after end date.")
+    if (end_date - start_date).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_CALENDAR_DAYS} days.")
+
+@router.get("/conflicts", dependencies=[Depends(require_permission("leave:read_self"))])
+async def get_leave_conflicts(
+    start_date: date,
+    end_date: date,
+    employee_id: Optional[str] = None,
+    duration: LeaveDurationEnum = LeaveDurationEnum.full_day,
+    current_user: Dict[str, Any] = Depends(get_current_employee)
+):
+    """
+    Days in the range already covered by the employee's pending/approved leaves,
+    one entry per conflicting daily_breakdown day. Lets the UI warn before submitting.
+    """
+    employee_id = employee_id or current_user["employee_id"]
+    if employee_id != current_user["employee_id"] and "leave:read_all" not in current_user.get("permissions", []):
+        raise HTTPException(status_code=403, detail="You do not have permission to view other employees' leave.")
+    _check_window(start_date, end_date)
+    conflicts = await leave_service.find_overlaps(employee_id, start_date, end_date, duration.value)
+    return {"employee_id": employee_id, "conflicts": conflicts}
+
+@router.get("/team-calendar", dependencies=[Depends(require_permission("leave:read_self"))])
+async def get_team_leave_calendar(
+    start_date: date,
+    end_date: date,
+    manager_id: Optional[str] = None,
+    current_user: Dict[str, Any] = Depends(get_current_employee)
+):
+    """
+    Bulk mode for managers: every direct report's blocked days in the range, from a
+    single indexed query, plus who is away on each date.
+    """
+    manager_id = manager_id or current_user["employee_id"]
+    if manager_id != current_user["employee_id"] and "leave:read_all" not in current_user.get("permissions", []):
+        raise HTTPException(status_code=403, detail="You can only view your own team's calendar.")
+    _check_window(start_date, end_date)
+
+    team = await employees_collection.find(
+        {"reports_to": manager_id, "is_deleted": {"$ne": True}},
+        {"_id": 0, "employee_id": 1, "first_name": 1, "last_name": 1}
+    ).to_list(None)
+    calendar = await leave_service.team_calendar((member["employee_id"] for member in team), start_date, end_date)
+
+    by_date: Dict[str, List[str]] = {}
+    for employee_id, days in calendar.items():
+        for day in days:
+            away = by_date.setdefault(day["date"], [])
+            if employee_id not in away:
+                away.append(employee_id)
+    return {
+        "manager_id": manager_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "employees": [
+            {**member, "days": calendar[member["employee_id"]]}
+            for member in sorted(team, key=lambda m: m["employee_id"])
+        ],
+        "by_date": dict(sorted(by_date.items())),
+    }
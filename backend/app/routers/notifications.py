@@ -1,8 +1,7 @@
 # backend/app/routers/notifications.py
 from fastapi import APIRouter, Depends, status, HTTPException
 from typing import List, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.dependencies.auth import get_current_employee
 # Use the new combined model
 from app.models.notification import NotificationWithStatus
@@ -13,8 +12,6 @@ router = APIRouter(
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 notifications_collection = db.notifications
 user_notifications_collection = db.user_notifications
 
@@ -1,10 +1,11 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.dependencies.auth import get_current_employee, require_role, require_permission
 from app.models.payroll import PayrollInDB, PayrollGenerate, PayrollUpdate
+from app.trusted_read import TrustedShape
+from app.services import employee_directory
 from datetime import datetime # Make sure datetime is imported
 
 router = APIRouter(
@@ -12,10 +13,13 @@ router = APIRouter(
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 collection = db.payroll
 
+payroll_shape = TrustedShape(PayrollInDB)
+
+LIST_LIMIT = 1000
+LIST_BATCH_SIZE = 200
+
 @router.post("/generate", status_code=status.HTTP_201_CREATED, response_model=PayrollInDB, dependencies=[Depends(require_permission("payroll:create"))])
 async def generate_payroll(payroll_in: PayrollGenerate):
     """
@@ -47,42 +51,37 @@ async def generate_payroll(payroll_in: PayrollGenerate):
 @router.get("", response_model=List[Dict[str, Any]], dependencies=[Depends(require_permission("payroll:read_all"))])
 async def list_all_payroll():
     """
-    Lists all payroll records, joining with employee details to include names.
-    Uses an aggregation pipeline for efficient joining and projection.
+    Lists the newest LIST_LIMIT payroll records (newest period first, then by last
+    name) with employee names from the employee directory. Records are read in
+    pay_period_end order from Mongo, a batch at a time, so only about one
+    page's worth is ever held in memory.
     """
-    pipeline = [
-        {"$match": {"is_deleted": {"$ne": True}}}, # <-- ADD FILTER
-        {
-            "$lookup": {
-                "from": "employees",
-                "localField": "employee_id",
-                "foreignField": "employee_id",
-                "as": "employee_details"
-            }
-        },
-        {"$unwind": {"path": "$employee_details", "preserveNullAndEmptyArrays": True}},
-        # Also filter out payroll for deleted employees
-        {"$match": {"employee_details.is_deleted": {"$ne": True}}}, # <-- ADD FILTER
-        {
-            "$project": {
-                "_id": 0, # Exclude the default MongoDB _id
-                "payroll_id": 1,
-                "employee_id": 1,
-                # Use $ifNull to handle cases where employee might not be found
-                "first_name": {"$ifNull": ["$employee_details.first_name", "N/A"]},
-                "last_name": {"$ifNull": ["$employee_details.last_name", ""]},
-                "pay_period_start": 1,
-                "pay_period_end": 1,
-                "gross_salary": 1,
-                "deductions": 1,
-                "net_salary": 1,
-                "status": 1
-            }
-        },
-        {"$sort": {"pay_period_end": -1, "last_name": 1}}
-    ]
-    records = await collection.aggregate(pipeline).to_list(1000) 
-    return records
+    cursor = collection.find(
+        {"is_deleted": {"$ne": True}}, # <-- ADD FILTER
+        {"_id": 0, "payroll_id": 1, "employee_id": 1, "pay_period_start": 1, "pay_period_end": 1,
+         "gross_salary": 1, "deductions": 1, "net_salary": 1, "status": 1}
+    ).sort([("pay_period_end", -1)]).batch_size(LIST_BATCH_SIZE)
+
+    report = []
+    while batch := await cursor.to_list(LIST_BATCH_SIZE):
+        names = await employee_directory.get_entries(record["employee_id"] for record in batch)
+        for record in batch:
+            employee = names.get(record["employee_id"])
+            # Also filter out payroll for deleted employees
+            if employee_directory.is_deleted(employee):
+                continue
+            # Fall back to N/A when the employee can't be found
+            record["first_name"] = (employee or {}).get("first_name") or "N/A"
+            record["last_name"] = (employee or {}).get("last_name") or ""
+            report.append(record)
+        # Stop once the page is full and the period it ends in has been read completely,
+        # so that period's records are still the first ones by last name
+        if len(report) >= LIST_LIMIT and batch[-1]["pay_period_end"] < report[LIST_LIMIT - 1]["pay_period_end"]:
+            break
+    # Newest period first, then by last name
+    report.sort(key=lambda record: record["last_name"])
+    report.sort(key=lambda record: record["pay_period_end"], reverse=True)
+    return report[:LIST_LIMIT]
 
 @router.get("/me", response_model=List[PayrollInDB], dependencies=[Depends(require_permission("payroll:read_self"))])
 async def get_my_payroll(current_user: Dict[str, Any] = Depends(get_current_employee)):
@@ -90,9 +89,10 @@ async def get_my_payroll(current_user: Dict[str, Any] = Depends(get_current_empl
     Retrieves all payroll records for the currently authenticated employee.
     """
     records = await collection.find(
-        {"employee_id": current_user["employee_id"], "is_deleted": {"$ne": True}} # <-- FILTER
+        {"employee_id": current_user["employee_id"], "is_deleted": {"$ne": True}}, # <-- FILTER
+        payroll_shape.projection
     ).sort("pay_period_end", -1).to_list(1000) # Sort newest first
-    return records
+    return payroll_shape.response(records)
 
 @router.put("/{payroll_id}", response_model=PayrollInDB, dependencies=[Depends(require_permission("payroll:update"))])
 async def update_payroll(payroll_id: str, payroll_update: PayrollUpdate):
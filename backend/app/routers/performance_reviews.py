@@ -2,23 +2,24 @@
 import uuid
 from fastapi import APIRouter, Depends, status, HTTPException
 from typing import List, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.dependencies.auth import get_current_employee, require_role, require_permission
 from app.models.performance_review import PerformanceReviewInDB, PerformanceReviewCreate, PerformanceReviewUpdate
 from datetime import datetime, timezone # Added timezone
-from app.services import notification_service # Ensure import
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services import employee_directory
 
 router = APIRouter(
     tags=["Performance Reviews"],
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 collection = db.performance_reviews
 employees_collection = db.employees # Needed for validation and names
 
+LIST_LIMIT = 1000
+LIST_BATCH_SIZE = 200
+
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=PerformanceReviewInDB, dependencies=[Depends(require_permission("performance:create"))])
 async def create_performance_review(review_in: PerformanceReviewCreate, current_user: Dict[str, Any] = Depends(get_current_employee)):
     # Check against active employees
@@ -43,18 +44,13 @@ async def create_performance_review(review_in: PerformanceReviewCreate, current_
         raise HTTPException(status_code=500, detail="Failed to retrieve created performance review.")
 
     # --- Notification Logic ---
-    recipient_ids = [review_in.employee_id] 
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    admin_hr_ids = [uid for uid in admin_hr_ids if uid != review_in.employee_id] 
-
-    all_recipient_ids = list(set(recipient_ids + admin_hr_ids))
-
-    reviewer = await employees_collection.find_one({"employee_id": current_user["employee_id"]})
-    reviewer_name = f"{reviewer.get('first_name', '')} {reviewer.get('last_name', '')}".strip() if reviewer else "Reviewer"
+    reviewer = await employee_directory.get_entry(current_user["employee_id"])
+    reviewer_name = employee_directory.full_name(reviewer, default="Reviewer")
     employee_name = f"{employee_to_review.get('first_name', '')} {employee_to_review.get('last_name', '')}".strip()
 
-    await notification_service.create_notification(
-        recipient_ids=all_recipient_ids,
+    await notification_dispatcher.publish(
+        recipient_ids=[review_in.employee_id],
+        notify_admin_hr=True,
         message_self=f"You have received a new performance review from {reviewer_name}.",
         message_other=f"A performance review for {employee_name} ({review_in.employee_id}) was submitted by {reviewer_name}.",
         link_self="/employee/my-performance-reviews",
@@ -68,24 +64,32 @@ async def create_performance_review(review_in: PerformanceReviewCreate, current_
 
 @router.get("", response_model=List[Dict[str, Any]], dependencies=[Depends(require_permission("performance:read_all"))])
 async def list_all_performance_reviews():
-    pipeline = [
-        {"$match": {"is_deleted": {"$ne": True}}}, # <-- ADD FILTER
-        {"$lookup": {"from": "employees", "localField": "employee_id", "foreignField": "employee_id", "as": "employee_details"}},
-        {"$unwind": {"path": "$employee_details", "preserveNullAndEmptyArrays": True}},
-        # Also filter out reviews for deleted employees
-        {"$match": {"employee_details.is_deleted": {"$ne": True}}}, # <-- ADD FILTER
-        {"$lookup": {"from": "employees", "localField": "reviewer_id", "foreignField": "employee_id", "as": "reviewer_details"}},
-        {"$unwind": {"path": "$reviewer_details", "preserveNullAndEmptyArrays": True}},
-        {"$project": {
-            "_id": 0, "review_id": 1, "employee_id": 1,
-            "first_name": "$employee_details.first_name", "last_name": "$employee_details.last_name",
-            "reviewer_id": 1, "reviewer_name": { "$concat": ["$reviewer_details.first_name", " ", "$reviewer_details.last_name"] },
-            "review_date": 1, "rating": 1, "comments": 1
-        }},
-        {"$sort": {"review_date": -1}}
-    ]
-    reviews = await collection.aggregate(pipeline).to_list(None)
-    return reviews
+    """
+    Lists the newest LIST_LIMIT reviews with employee and reviewer names. Reviews
+    are read in review_date order from Mongo a batch at a time until the page is
+    full, rather than loading the whole collection.
+    """
+    cursor = collection.find(
+        {"is_deleted": {"$ne": True}}, # <-- ADD FILTER
+        {"_id": 0, "review_id": 1, "employee_id": 1, "reviewer_id": 1, "review_date": 1, "rating": 1, "comments": 1}
+    ).sort([("review_date", -1)]).batch_size(LIST_BATCH_SIZE)
+
+    listed = []
+    while len(listed) < LIST_LIMIT and (batch := await cursor.to_list(LIST_BATCH_SIZE)):
+        names = await employee_directory.get_entries(
+            [review["employee_id"] for review in batch] + [review.get("reviewer_id") for review in batch]
+        )
+        for review in batch:
+            employee = names.get(review["employee_id"])
+            # Also filter out reviews for deleted employees
+            if employee_directory.is_deleted(employee):
+                continue
+            reviewer = names.get(review.get("reviewer_id"))
+            review["first_name"] = (employee or {}).get("first_name")
+            review["last_name"] = (employee or {}).get("last_name")
+            review["reviewer_name"] = employee_directory.full_name(reviewer) if reviewer else None
+            listed.append(review)
+    return listed[:LIST_LIMIT]
 
 @router.get("/me", response_model=List[PerformanceReviewInDB], dependencies=[Depends(require_permission("performance:read_self"))])
 async def get_my_performance_reviews(current_user: Dict[str, Any] = Depends(get_current_employee)):
@@ -1,38 +1,38 @@
 # backend/app/routers/role_management.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorClient
+from app.database import db
 from typing import List
-from app.config import settings
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.dependencies.auth import require_role # Use require_role for bootstrapping
+from app.dependencies.database import get_db
 from app.models.role import RoleInDB, RoleCreate, RoleUpdate
 from app.models.permission import PermissionInDB
+from app.services import permission_service
 
 router = APIRouter(
     tags=["Role Management"],
     redirect_slashes=False
 )
 
-db_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = db_client[settings.MONGO_DB_NAME]
 roles_collection = db.roles
 permissions_collection = db.permissions
 
 @router.get("/permissions", response_model=List[PermissionInDB], dependencies=[Depends(require_role(["admin"]))])
-async def list_all_permissions():
+async def list_all_permissions(database: AsyncIOMotorDatabase = Depends(get_db)):
     """
     Retrieves a list of all available permissions in the system.
     (Path: GET /roles/permissions)
     """
-    permissions = await permissions_collection.find().to_list(1000)
+    permissions = await database.permissions.find().to_list(1000)
     return permissions
 
 @router.get("", response_model=List[RoleInDB], dependencies=[Depends(require_role(["admin"]))])
-async def list_all_roles():
+async def list_all_roles(database: AsyncIOMotorDatabase = Depends(get_db)):
     """
     Retrieves a list of all non-deleted roles.
     (Path: GET /roles)
     """
-    roles = await roles_collection.find({"is_deleted": {"$ne": True}}).to_list(1000)
+    roles = await database.roles.find({"is_deleted": {"$ne": True}}).to_list(1000)
     return roles
 
 @router.get("/{role_id}", response_model=RoleInDB, dependencies=[Depends(require_role(["admin"]))])
@@ -58,8 +58,10 @@ async def create_new_role(role_in: RoleCreate):
     
     role_doc = role_in.model_dump()
     role_doc["is_deleted"] = False
+    role_doc["version"] = 1
     
     await roles_collection.insert_one(role_doc)
+    await permission_service.invalidate_role(role_in.role_id)
     
     created_role = await roles_collection.find_one({"role_id": role_in.role_id})
     return created_role
@@ -76,11 +78,12 @@ async def update_existing_role(role_id: str, role_update: RoleUpdate):
         
     result = await roles_collection.update_one(
         {"role_id": role_id, "is_deleted": {"$ne": True}},
-        {"$set": update_data}
+        {"$set": update_data, "$inc": {"version": 1}}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+    await permission_service.invalidate_role(role_id)
         
     updated_role = await roles_collection.find_one({"role_id": role_id})
     return updated_role
@@ -96,10 +99,11 @@ async def delete_existing_role(role_id: str):
         
     result = await roles_collection.update_one(
         {"role_id": role_id},
-        {"$set": {"is_deleted": True}}
+        {"$set": {"is_deleted": True}, "$inc": {"version": 1}}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+    await permission_service.invalidate_role(role_id)
     
     return
\ No newline at end of file
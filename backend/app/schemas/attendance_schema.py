@@ -1,13 +1,47 @@
-# TODO: implement later
 # backend/app/schemas/attendance_schema.py
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from datetime import datetime, timezone
 
 COLLECTION = "attendance"
 
 async def create_indexes(db: AsyncIOMotorDatabase):
     collection = db[COLLECTION]
+    existing = await collection.index_information()
+    if "attendance_employee_id" in existing: # Redundant prefix of attendance_employee_check_in
+        await collection.drop_index("attendance_employee_id")
     await collection.create_indexes([
         IndexModel([("attendance_id", ASCENDING)], name="attendance_id_unique", unique=True),
-        IndexModel([("employee_id", ASCENDING)], name="attendance_employee_id")
-    ])
\ No newline at end of file
+        # Per-employee time ranges: /me/status, check-in/out, monthly view, the today-status $lookup
+        IndexModel([("employee_id", ASCENDING), ("check_in_time", DESCENDING)], name="attendance_employee_check_in"),
+        # Global time ranges for /report
+        IndexModel([("check_in_time", DESCENDING)], name="attendance_check_in_time"),
+        # Keyset order of the streaming export
+        IndexModel([("check_in_time", DESCENDING), ("attendance_id", DESCENDING)], name="attendance_check_in_id"),
+    ])
+    # Small index holding only open check-ins (check_out_time is null). Unique per
+    # employee and day, so two concurrent check-ins can't both insert; keyed by day
+    # so a check-out forgotten yesterday doesn't block today's check-in. Records
+    # written before check_in_date existed are left out.
+    open_check_in = existing.get("attendance_open_check_in")
+    if open_check_in and not open_check_in.get("unique"): # Replaces the earlier non-unique version
+        await collection.drop_index("attendance_open_check_in")
+    await collection.create_indexes([
+        IndexModel(
+            [("employee_id", ASCENDING), ("check_in_date", ASCENDING)],
+            name="attendance_open_check_in",
+            unique=True,
+            partialFilterExpression={"check_out_time": None, "check_in_date": {"$exists": True}}
+        )
+    ])
+
+def hot_queries():
+    """(name, filter, sort) for the queries that must never COLLSCAN; checked at startup."""
+    start_of_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        ("open check-in", {"employee_id": "EMP001", "check_in_time": {"$gte": start_of_day}, "check_out_time": None}, [("check_in_time", -1)]),
+        ("employee month", {"employee_id": "EMP001", "check_in_time": {"$gte": start_of_day, "$lte": start_of_day}}, [("check_in_time", 1)]),
+        ("my attendance", {"employee_id": "EMP001"}, [("check_in_time", -1)]),
+        ("report range", {"check_in_time": {"$gte": start_of_day, "$lte": start_of_day}}, [("check_in_time", -1)]),
+        ("export page", {"check_in_time": {"$lt": start_of_day}}, [("check_in_time", -1), ("attendance_id", -1)]),
+    ]
@@ -0,0 +1,15 @@
+# backend/app/schemas/daily_attendance_status_schema.py
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING
+
+COLLECTION = "daily_attendance_status"
+
+async def create_indexes(db: AsyncIOMotorDatabase):
+    """Creates indexes for the materialized per-day attendance status."""
+    collection = db[COLLECTION]
+    await collection.create_indexes([
+        # One row per employee per day; date is an ISO 'YYYY-MM-DD' string
+        IndexModel([("date", ASCENDING), ("employee_id", ASCENDING)], name="daily_status_date_employee_unique", unique=True),
+        # Serves the today-status report's filter and name sort
+        IndexModel([("date", ASCENDING), ("first_name", ASCENDING), ("last_name", ASCENDING)], name="daily_status_date_name"),
+    ])
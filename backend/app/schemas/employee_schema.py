@@ -20,9 +20,38 @@ async def create_indexes(db: AsyncIOMotorDatabase):
         # --- END MODIFICATION ---
 
         IndexModel([("is_active", ASCENDING)], name="is_active_idx"),
-        IndexModel([("is_deleted", ASCENDING)], name="is_deleted_idx") # <-- ADD THIS
+        IndexModel([("is_deleted", ASCENDING)], name="is_deleted_idx"), # <-- ADD THIS
+
+        # list_employees filters, each followed by the employee_id keyset sort
+        IndexModel([("department", ASCENDING), ("employee_id", ASCENDING)], name="employee_department_id"),
+        IndexModel([("role_id", ASCENDING), ("employee_id", ASCENDING)], name="employee_role_id"),
+        IndexModel([("is_active", ASCENDING), ("employee_id", ASCENDING)], name="employee_active_id"),
+        # Anchored name-prefix searches
+        IndexModel([("first_name", ASCENDING)], name="employee_first_name"),
+        IndexModel([("last_name", ASCENDING)], name="employee_last_name"),
     ])
 
+def hot_queries():
+    """(name, filter, sort) for the queries that must never COLLSCAN; checked at startup."""
+    return [
+        ("list page", {"is_deleted": {"$ne": True}, "employee_id": {"$gt": "EMP001"}}, [("employee_id", 1)]),
+        ("list by department", {"is_deleted": {"$ne": True}, "department": "Engineering"}, [("employee_id", 1)]),
+        ("list by role", {"is_deleted": {"$ne": True}, "role_id": "employee"}, [("employee_id", 1)]),
+    ]
+
+# Just what login needs; skips skills, certificates and the rest of the profile
+LOGIN_PROJECTION = {"_id": 0, "employee_id": 1, "hashed_password": 1, "role_id": 1, "is_active": 1, "is_deleted": 1}
+
+async def get_login_credentials(db: AsyncIOMotorDatabase, employee_id: str):
+    return await db[COLLECTION].find_one({"employee_id": employee_id}, LOGIN_PROJECTION)
+
+async def update_password_hash(db: AsyncIOMotorDatabase, employee_id: str, old_hash: str, new_hash: str):
+    # Guarded on the old hash so a concurrent password change is never overwritten
+    await db[COLLECTION].update_one(
+        {"employee_id": employee_id, "hashed_password": old_hash},
+        {"$set": {"hashed_password": new_hash}}
+    )
+
 async def get_employee_by_id(db: AsyncIOMotorDatabase, employee_id: str):
     # This function is used by auth, so it should fetch even if deleted/inactive
     # The routers will handle filtering
@@ -4,7 +4,7 @@ import uuid
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import IndexModel, ASCENDING
 from app.models.leave import LeaveCreate
-from datetime import date
+from datetime import date, datetime, timezone
 from typing import List, Dict, Any
 
 COLLECTION = "leaves"
@@ -13,9 +13,29 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     collection = db[COLLECTION]
     await collection.create_indexes([
         IndexModel([("leave_id", ASCENDING)], name="leave_id_unique", unique=True),
-        IndexModel([("employee_id", ASCENDING)], name="leave_employee_id")
+        IndexModel([("employee_id", ASCENDING)], name="leave_employee_id"),
+        # Overlap checks: end_date leads the range so the scan only covers leaves that
+        # haven't ended before the requested start (a few upcoming ones, not all history)
+        IndexModel(
+            [("employee_id", ASCENDING), ("end_date", ASCENDING), ("start_date", ASCENDING), ("status", ASCENDING)],
+            name="leave_employee_interval"
+        ),
     ])
 
+def hot_queries():
+    """(name, filter, sort) for the queries that must never COLLSCAN; checked at startup."""
+    window_start, window_end = datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 31, tzinfo=timezone.utc)
+    return [
+        ("overlap check", {
+            "employee_id": "EMP001", "end_date": {"$gte": window_start},
+            "start_date": {"$lte": window_end}, "status": {"$in": ["pending", "approved", "partially_approved"]},
+        }, [("end_date", 1)]),
+        ("team calendar", {
+            "employee_id": {"$in": ["EMP001", "EMP002"]}, "end_date": {"$gte": window_start},
+            "start_date": {"$lte": window_end}, "status": {"$in": ["pending", "approved", "partially_approved"]},
+        }, [("employee_id", 1), ("end_date", 1)]),
+    ]
+
 async def create_leave_request(db: AsyncIOMotorDatabase, leave_data: LeaveCreate) -> Dict[str, Any]:
     start_date = min(d.date for d in leave_data.daily_breakdown)
     end_date = max(d.date for d in leave_data.daily_breakdown)
@@ -0,0 +1,13 @@
+# backend/app/schemas/notification_dead_letter_schema.py
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+COLLECTION = "notification_dead_letters"
+
+async def create_indexes(db: AsyncIOMotorDatabase):
+    """Creates indexes for notification events that exhausted their retries."""
+    collection = db[COLLECTION]
+    await collection.create_indexes([
+        IndexModel([("failed_at", DESCENDING)], name="dead_letter_failed_at"),
+        IndexModel([("event.type", ASCENDING)], name="dead_letter_event_type")
+    ])
@@ -1,6 +1,6 @@
 # backend/app/schemas/payroll_schema.py
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 COLLECTION = "payroll"
 
@@ -9,5 +9,7 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await collection.create_indexes([
         IndexModel([("payroll_id", ASCENDING)], name="payroll_id_unique", unique=True),
         IndexModel([("employee_id", ASCENDING)], name="payroll_employee_id"),
+        # Newest-first order of the payroll listing
+        IndexModel([("pay_period_end", DESCENDING)], name="payroll_pay_period_end"),
         IndexModel([("is_deleted", ASCENDING)], name="is_deleted_idx") # <-- ADD THIS
     ])
\ No newline at end of file
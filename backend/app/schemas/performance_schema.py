@@ -1,6 +1,6 @@
 # backend/app/schemas/performance_schema.py
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 COLLECTION = "performance_reviews"
 
@@ -9,5 +9,7 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await collection.create_indexes([
         IndexModel([("review_id", ASCENDING)], name="review_id_unique", unique=True),
         IndexModel([("employee_id", ASCENDING)], name="performance_employee_id"),
+        # Newest-first order of the review listing
+        IndexModel([("review_date", DESCENDING)], name="performance_review_date"),
         IndexModel([("is_deleted", ASCENDING)], name="is_deleted_idx") # <-- ADD THIS
     ])
\ No newline at end of file
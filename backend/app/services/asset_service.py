@@ -1,12 +1,9 @@
 # backend/app/services/asset_service.py
 import uuid
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from datetime import datetime
 from fastapi import HTTPException
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB_NAME]
 assets_collection = db.assets
 allotted_collection = db.allotted_assets
 
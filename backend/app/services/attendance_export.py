@@ -0,0 +1,114 @@
+# backend/app/services/attendance_export.py
+"""
+Streams the attendance report as NDJSON or CSV.
+
+Rows are read in keyset pages ordered by (check_in_time, attendance_id)
+descending, so memory stays bounded by the page size and no server-side cursor
+is held open while a slow client drains the response. Every row carries the
+opaque cursor that resumes the export just after it.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from app.database import db
+from app.config import settings
+from app.pagination import encode_cursor, decode_cursor
+
+collection = db.attendance
+
+EXPORT_FIELDS = [
+    "attendance_id", "employee_id", "first_name", "last_name",
+    "check_in_time", "check_out_time", "status", "cursor",
+]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def build_match(start_date: Optional[date], end_date: Optional[date], employee_id: Optional[str]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    if employee_id:
+        query["employee_id"] = employee_id
+    date_filter = {}
+    if start_date:
+        date_filter["$gte"] = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
+    if end_date:
+        date_filter["$lte"] = datetime.combine(end_date, datetime.max.time(), tzinfo=timezone.utc)
+    if date_filter:
+        query["check_in_time"] = date_filter
+    return query
+
+def row_cursor(row: Dict[str, Any]) -> str:
+    return encode_cursor([row["check_in_time"].isoformat(), row["attendance_id"]])
+
+def parse_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        check_in_time, attendance_id = decode_cursor(cursor)
+        return datetime.fromisoformat(check_in_time), str(attendance_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def page_pipeline(match: Dict[str, Any], after: Optional[Tuple[datetime, str]], page_size: int) -> List[Dict[str, Any]]:
+    if after:
+        check_in_time, attendance_id = after
+        match = {"$and": [match, {"$or": [
+            {"check_in_time": {"$lt": check_in_time}},
+            {"check_in_time": check_in_time, "attendance_id": {"$lt": attendance_id}},
+        ]}]}
+    return [
+        {"$match": match},
+        {"$sort": {"check_in_time": -1, "attendance_id": -1}},
+        {"$limit": page_size},
+        # Join after the limit so only this page's rows are looked up
+        {"$lookup": {
+            "from": "employees",
+            "localField": "employee_id",
+            "foreignField": "employee_id",
+            "pipeline": [{"$project": {"_id": 0, "first_name": 1, "last_name": 1}}],
+            "as": "employee_details"
+        }},
+        {"$unwind": {"path": "$employee_details", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "_id": 0,
+            "attendance_id": 1,
+            "employee_id": 1,
+            "first_name": "$employee_details.first_name",
+            "last_name": "$employee_details.last_name",
+            "check_in_time": 1,
+            "check_out_time": 1,
+            "status": 1
+        }}
+    ]
+
+async def iter_rows(match: Dict[str, Any], after: Optional[Tuple[datetime, str]] = None, page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yields report rows page by page; `after` is a parsed cursor to resume from."""
+    page_size = page_size or settings.ATTENDANCE_EXPORT_PAGE_SIZE
+    while True:
+        page = await collection.aggregate(page_pipeline(match, after, page_size)).to_list(page_size)
+        for row in page:
+            row["cursor"] = row_cursor(row)
+            yield row
+        if len(page) < page_size:
+            return
+        after = (page[-1]["check_in_time"], page[-1]["attendance_id"])
+
+def _text(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+async def stream_ndjson(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield (json.dumps({field: _text(row.get(field)) for field in EXPORT_FIELDS}) + "\n").encode("utf-8")
+
+async def stream_csv(rows: AsyncIterator[Dict[str, Any]], chunk_rows: int = 500) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    async for row in rows:
+        writer.writerow([_text(row.get(field)) for field in EXPORT_FIELDS])
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,305 @@
+# backend/app/services/attendance_status_service.py
+"""
+Maintains `daily_attendance_status`: one row per (date, employee) holding the
+latest check-in/out of the day and whether an approved leave covers it.
+
+Check-in, check-out, leave approval and employee changes update rows
+incrementally; the today-status report is a single indexed read. Each worker
+materializes today at startup and again just after midnight, so reads rarely
+find a day unbuilt. Days that were never materialized (or need repair) are
+rebuilt from attendance + leaves:
+
+    python -m app.services.attendance_status_service --start 2025-01-01 --end 2025-01-31
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from app.database import db, mongo
+from app.services import employee_directory
+
+status_collection = db.daily_attendance_status
+employees_collection = db.employees
+markers_collection = db.cache_versions # Records which days have been materialized
+
+ON_LEAVE_STATUSES = ["approved", "partially_approved"]
+MATERIALIZE_CLAIM_TIMEOUT = timedelta(minutes=10) # A claim older than this is from a worker that died mid-rebuild
+
+_materialized_days = set()
+_scheduler_task: Optional[asyncio.Task] = None
+
+def day_key(day: date) -> str:
+    return day.isoformat()
+
+def _marker_id(day: date) -> str:
+    return f"daily_attendance_status:{day_key(day)}"
+
+def row_status(row: Dict[str, Any]) -> str:
+    """Same precedence as the old $lookup report: attendance, then leave, then Absent."""
+    if row.get("attendance_status"):
+        return row["attendance_status"]
+    return "On Leave" if row.get("on_leave") else "Absent"
+
+def _name_fields(entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "first_name": entry.get("first_name") if entry else None,
+        "last_name": entry.get("last_name") if entry else None,
+    }
+
+# --- Incremental updates ---
+
+async def record_check_in(attendance_doc: Dict[str, Any], day: Optional[date] = None):
+    employee_id = attendance_doc["employee_id"]
+    entry = await employee_directory.get_entry(employee_id)
+    await status_collection.update_one(
+        {"date": day_key(day or date.today()), "employee_id": employee_id},
+        {"$set": {
+            **_name_fields(entry),
+            "attendance_id": attendance_doc["attendance_id"],
+            "check_in_time": attendance_doc["check_in_time"],
+            "check_out_time": attendance_doc.get("check_out_time"),
+            "attendance_status": attendance_doc.get("status", "Present"),
+        }},
+        upsert=True
+    )
+
+async def record_check_out(attendance_doc: Dict[str, Any], day: Optional[date] = None):
+    await status_collection.update_one(
+        {
+            "date": day_key(day or date.today()),
+            "employee_id": attendance_doc["employee_id"],
+            "attendance_id": attendance_doc["attendance_id"]
+        },
+        {"$set": {"check_out_time": attendance_doc["check_out_time"]}}
+    )
+
+async def record_leave_approved(leave_doc: Dict[str, Any]):
+    """Flags every day of an approved leave; attendance on those days still takes precedence."""
+    employee_id = leave_doc["employee_id"]
+    entry = await employee_directory.get_entry(employee_id)
+    operations = []
+    current = leave_doc["start_date"].date()
+    end = leave_doc["end_date"].date()
+    while current <= end:
+        operations.append(UpdateOne(
+            {"date": day_key(current), "employee_id": employee_id},
+            {"$set": {"on_leave": True}, "$setOnInsert": _name_fields(entry)},
+            upsert=True
+        ))
+        current += timedelta(days=1)
+    if operations:
+        await status_collection.bulk_write(operations, ordered=False)
+
+async def sync_employee(employee_id: str, day: Optional[date] = None):
+    """Keeps today's row in step with employee create/update/delete."""
+    key = {"date": day_key(day or date.today()), "employee_id": employee_id}
+    employee = await employees_collection.find_one(
+        {"employee_id": employee_id},
+        {"_id": 0, "first_name": 1, "last_name": 1, "is_deleted": 1}
+    )
+    if not employee or employee.get("is_deleted"):
+        await status_collection.delete_one(key)
+        return
+    await status_collection.update_one(key, {"$set": _name_fields(employee)}, upsert=True)
+
+async def sync_new_employees(employee_docs: List[Dict[str, Any]], day: Optional[date] = None):
+    """sync_employee for a batch of just-inserted employees, in one bulk write."""
+    key_date = day_key(day or date.today())
+    operations = [
+        UpdateOne(
+            {"date": key_date, "employee_id": doc["employee_id"]},
+            {"$set": _name_fields(doc)},
+            upsert=True
+        )
+        for doc in employee_docs
+    ]
+    if operations:
+        await status_collection.bulk_write(operations, ordered=False)
+
+# --- Reads ---
+
+async def get_day_status(day: date) -> List[Dict[str, Any]]:
+    """The status report for a day, materializing the day first if needed."""
+    await ensure_materialized(day)
+    rows = await status_collection.find(
+        {"date": day_key(day)},
+        {"_id": 0, "employee_id": 1, "first_name": 1, "last_name": 1,
+         "check_in_time": 1, "check_out_time": 1, "attendance_status": 1, "on_leave": 1}
+    ).sort([("first_name", 1), ("last_name", 1)]).to_list(None)
+    return [
+        {
+            "employee_id": row["employee_id"],
+            "first_name": row.get("first_name"),
+            "last_name": row.get("last_name"),
+            "check_in_time": row.get("check_in_time"),
+            "check_out_time": row.get("check_out_time"),
+            "status": row_status(row),
+        }
+        for row in rows
+    ]
+
+async def ensure_materialized(day: date):
+    """
+    Rebuilds a day once across all workers. The first caller claims the day's
+    marker atomically and rebuilds; everyone else returns straight away and
+    reads the rows as they stand (the incremental updates keep them current).
+    """
+    if day in _materialized_days:
+        return
+    now = datetime.now(timezone.utc)
+    marker = await markers_collection.find_one_and_update(
+        {"_id": _marker_id(day)},
+        {"$setOnInsert": {"claimed_at": now}},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE
+    )
+    if marker is not None:
+        if marker.get("built_at"):
+            _materialized_days.add(day)
+            return
+        claimed_at = marker.get("claimed_at")
+        if claimed_at and claimed_at.replace(tzinfo=timezone.utc) > now - MATERIALIZE_CLAIM_TIMEOUT:
+            return # Another worker is rebuilding
+        # The claimant died; take over only if nobody else has meanwhile
+        result = await markers_collection.update_one(
+            {"_id": _marker_id(day), "claimed_at": claimed_at, "built_at": {"$exists": False}},
+            {"$set": {"claimed_at": now}}
+        )
+        if result.modified_count == 0:
+            return
+    await rebuild_day(day)
+    await markers_collection.update_one(
+        {"_id": _marker_id(day)},
+        {"$set": {"built_at": datetime.now(timezone.utc)}}
+    )
+    _materialized_days.add(day)
+
+async def _materialize_daily():
+    while True:
+        try:
+            await ensure_materialized(date.today())
+        except Exception as e:
+            print(f"Failed to materialize daily attendance status: {e}")
+        now = datetime.now()
+        next_run = datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) + timedelta(seconds=5)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+def start_scheduler():
+    """Materializes today now and after every midnight, off the request path."""
+    global _scheduler_task
+    if _scheduler_task is None or _scheduler_task.done():
+        _scheduler_task = asyncio.create_task(_materialize_daily())
+
+async def stop_scheduler():
+    global _scheduler_task
+    if _scheduler_task is not None:
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except asyncio.CancelledError:
+            pass
+        _scheduler_task = None
+
+# --- Rebuild / backfill ---
+
+def build_day_pipeline(day: date) -> List[Dict[str, Any]]:
+    """The original per-employee $lookup aggregation, emitting snapshot rows for one day."""
+    start_of_day = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+    end_of_day = datetime.combine(day, datetime.max.time(), tzinfo=timezone.utc)
+    return [
+        {"$match": {"is_deleted": {"$ne": True}}},
+        {"$lookup": {
+            "from": "attendance",
+            "let": {"employee_id_lookup": "$employee_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$employee_id", "$$employee_id_lookup"]},
+                    {"$gte": ["$check_in_time", start_of_day]},
+                    {"$lt": ["$check_in_time", end_of_day]}
+                ]}}},
+                {"$sort": {"check_in_time": -1}},
+                {"$limit": 1}
+            ],
+            "as": "day_attendance"
+        }},
+        {"$unwind": {"path": "$day_attendance", "preserveNullAndEmptyArrays": True}},
+        {"$lookup": {
+            "from": "leaves",
+            "let": {"employee_id_leave": "$employee_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$employee_id", "$$employee_id_leave"]},
+                    {"$in": ["$status", ON_LEAVE_STATUSES]},
+                    {"$lte": ["$start_date", start_of_day]},
+                    {"$gte": ["$end_date", start_of_day]}
+                ]}}},
+                {"$limit": 1}
+            ],
+            "as": "day_leave"
+        }},
+        {"$project": {
+            "_id": 0,
+            "date": {"$literal": day_key(day)},
+            "employee_id": 1,
+            "first_name": 1,
+            "last_name": 1,
+            "attendance_id": {"$ifNull": ["$day_attendance.attendance_id", None]},
+            "check_in_time": {"$ifNull": ["$day_attendance.check_in_time", None]},
+            "check_out_time": {"$ifNull": ["$day_attendance.check_out_time", None]},
+            "attendance_status": {"$ifNull": ["$day_attendance.status", None]},
+            "on_leave": {"$gt": [{"$size": "$day_leave"}, 0]}
+        }}
+    ]
+
+async def rebuild_day(day: date, chunk_size: int = 1000) -> int:
+    """Recomputes every row for a day from the source collections. Returns rows written."""
+    written = 0
+    operations = []
+    async for row in employees_collection.aggregate(build_day_pipeline(day)):
+        operations.append(ReplaceOne({"date": row["date"], "employee_id": row["employee_id"]}, row, upsert=True))
+        if len(operations) >= chunk_size:
+            await status_collection.bulk_write(operations, ordered=False)
+            written += len(operations)
+            operations = []
+    if operations:
+        await status_collection.bulk_write(operations, ordered=False)
+        written += len(operations)
+    # Rows for employees that have since been deleted
+    await status_collection.delete_many({
+        "date": day_key(day),
+        "employee_id": {"$in": await employees_collection.distinct("employee_id", {"is_deleted": True})}
+    })
+    return written
+
+async def rebuild_range(start: date, end: date) -> int:
+    total = 0
+    current = start
+    while current <= end:
+        count = await rebuild_day(current)
+        await markers_collection.update_one(
+            {"_id": _marker_id(current)},
+            {"$set": {"built_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        print(f"Rebuilt daily attendance status for {day_key(current)}: {count} rows.")
+        total += count
+        current += timedelta(days=1)
+    return total
+
+
+async def _main(args: argparse.Namespace):
+    mongo.connect()
+    try:
+        total = await rebuild_range(args.start, args.end)
+        print(f"Done. {total} rows written.")
+    finally:
+        mongo.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill/rebuild the daily_attendance_status collection.")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today(), help="First day (YYYY-MM-DD), default today")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last day (YYYY-MM-DD), default --start")
+    parsed = parser.parse_args()
+    parsed.end = parsed.end or parsed.start
+    asyncio.run(_main(parsed))
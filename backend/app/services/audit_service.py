@@ -0,0 +1,120 @@
+# backend/app/services/audit_service.py
+import asyncio
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.database import db
+from app.config import settings
+
+audit_collection = db.audit_logs
+
+class AuditLogWriter:
+    """
+    Buffers audit entries in a bounded in-memory queue and persists them with
+    insert_many from a background task. The request path only ever does a
+    non-blocking put; when the queue is full the entry is dropped and counted.
+
+    Entries get their _id before the first insert attempt. If a shutdown
+    cancels an insert that has already reached the server, stop() re-sends
+    the batch and the entries that landed come back as duplicate-key errors
+    rather than second copies.
+    """
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._batch: List[Dict[str, Any]] = []  # Entries taken off the queue but not yet written
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def enqueue(self, entry: Dict[str, Any]) -> bool:
+        """Queues an entry without waiting. Returns False if it had to be dropped."""
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                print(f"Audit log queue full; {self.dropped} entries dropped so far.")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def stop(self):
+        """Stops the background task and flushes everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        """Writes every buffered entry immediately, in batch_size chunks."""
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+        while self._batch:
+            chunk, self._batch = self._batch[:self.batch_size], self._batch[self.batch_size:]
+            await self._write(chunk)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block until there is at least one entry, then fill the batch until
+            # it is full or the flush interval has elapsed.
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        for entry in batch:
+            entry.setdefault("_id", ObjectId())
+        try:
+            await audit_collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except asyncio.CancelledError:
+            # Shutdown mid-insert: hand the batch back for stop() to flush
+            self._batch[:0] = batch
+            raise
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            duplicates = sum(1 for error in errors if error.get("code") == 11000) # Landed on an earlier attempt
+            written = e.details.get("nInserted", 0) + duplicates
+            self.written += written
+            self.failed += len(batch) - written
+            if written < len(batch):
+                print(f"Failed to write {len(batch) - written} audit log entries: {e}")
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Failed to write {len(batch)} audit log entries: {e}")
+
+
+audit_writer = AuditLogWriter(
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
@@ -0,0 +1,124 @@
+# backend/app/services/blob_store.py
+"""
+Content-addressed storage for photos and certificates.
+
+A blob is stored once per distinct content at
+app/static/blobs/<sha[:2]>/<sha[2:4]>/<sha><ext>. Its URL is its reference:
+employee documents keep these URLs in `photo_url` / `certificates`, and
+ref_from_url() turns one back into the hash. Each blob's document in `blobs`
+counts its references. put() adds one, re-using the file when the content is
+already stored, and release() drops one. The file is removed only when the last
+reference goes, so deleting one employee's certificate never breaks another
+that points at the same file. Because content never changes under a URL, blob
+URLs can be cached forever.
+"""
+import os
+import re
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+from fastapi import UploadFile
+from pymongo import ReturnDocument
+from app.database import db
+from app.services.upload_writer import upload_writer, UploadPolicy
+
+blobs_collection = db.blobs
+
+BLOB_DIR = Path("app/static/blobs")
+BLOB_URL_PREFIX = "/static/blobs/"
+_BLOB_URL = re.compile(r"^/static/blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.[a-z0-9]+$")
+
+def blob_path(sha256: str, extension: str) -> Path:
+    return BLOB_DIR / sha256[:2] / sha256[2:4] / f"{sha256}{extension}"
+
+def blob_url(sha256: str, extension: str) -> str:
+    return f"{BLOB_URL_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+def ref_from_url(url: Optional[str]) -> Optional[str]:
+    """The blob hash behind a URL, or None for legacy (non content-addressed) files."""
+    match = _BLOB_URL.match(url or "")
+    return match.group(1) if match else None
+
+async def put(upload: UploadFile, policy: UploadPolicy) -> Dict[str, Any]:
+    """Stores an upload (or re-uses identical content) and takes one reference to it."""
+    received = await upload_writer.receive(upload, policy, temp_dir=BLOB_DIR)
+    path = blob_path(received.sha256, received.extension)
+    await blobs_collection.update_one(
+        {"_id": received.sha256},
+        {
+            "$inc": {"ref_count": 1},
+            "$setOnInsert": {
+                "size": received.size,
+                "content_type": received.content_type,
+                "extension": received.extension,
+                "created_at": datetime.now(timezone.utc),
+            },
+        },
+        upsert=True
+    )
+    if await upload_writer.run_io(path.exists):
+        await upload_writer.discard(received) # Deduplicated
+    else:
+        await upload_writer.run_io(lambda: path.parent.mkdir(parents=True, exist_ok=True))
+        await upload_writer.commit(received, path)
+    return {
+        "sha256": received.sha256,
+        "url": blob_url(received.sha256, received.extension),
+        "size": received.size,
+        "content_type": received.content_type,
+    }
+
+async def release(sha256: Optional[str]):
+    """Drops one reference; deletes the blob once nothing points at it."""
+    if not sha256:
+        return
+    blob = await blobs_collection.find_one_and_update(
+        {"_id": sha256, "ref_count": {"$gt": 0}},
+        {"$inc": {"ref_count": -1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if blob is None or blob["ref_count"] > 0:
+        return
+    path = blob_path(sha256, blob["extension"])
+    tombstone = path.with_name(f".{sha256}.{uuid.uuid4().hex}.deleted")
+    # Move the file aside before deleting the document: a put() racing with us
+    # either re-references the document (and we move the file back) or sees no
+    # file and writes its own copy, which the tombstone can't clobber.
+    try:
+        await upload_writer.run_io(os.replace, path, tombstone)
+    except FileNotFoundError:
+        tombstone = None
+    result = await blobs_collection.delete_one({"_id": sha256, "ref_count": 0})
+    if tombstone is None:
+        return
+    if result.deleted_count:
+        await upload_writer.discard_path(tombstone)
+        await _release_derived(path, sha256)
+    else:
+        await upload_writer.run_io(os.replace, tombstone, path)
+
+async def _release_derived(path: Path, sha256: str):
+    """
+    Removes the derived files (photo size variants, <sha>.<variant><ext>) of a
+    deleted blob. They go through the same tombstone step: a put() that
+    re-created the document while we moved them aside gets them back, and one
+    that comes later renders its own under the real names, which we never delete.
+    """
+    moved = []
+    for derived in await upload_writer.run_io(lambda: list(path.parent.glob(f"{sha256}.*.*"))):
+        tombstone = derived.with_name(f".{derived.name}.{uuid.uuid4().hex}.deleted")
+        try:
+            await upload_writer.run_io(os.replace, derived, tombstone)
+        except FileNotFoundError:
+            continue
+        moved.append((derived, tombstone))
+    if moved and await blobs_collection.find_one({"_id": sha256}) is not None:
+        for derived, tombstone in moved:
+            await upload_writer.run_io(os.replace, tombstone, derived)
+        return
+    for _, tombstone in moved:
+        await upload_writer.discard_path(tombstone)
+
+async def release_url(url: Optional[str]):
+    await release(ref_from_url(url))
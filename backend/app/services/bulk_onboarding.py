@@ -0,0 +1,268 @@
+# backend/app/services/bulk_onboarding.py
+"""
+Creates employees in bulk from an uploaded CSV or NDJSON file.
+
+Rows are read BULK_ONBOARDING_CHUNK_SIZE at a time. Each chunk is validated
+against EmployeeCreate, checked for duplicate emails with one $in query, given
+IDs from one counter reservation and hashed in parallel on the bulk password
+pool. Employees, first payroll records and skills are then written with one
+insert_many per collection. Every row gets a result line, so a bad row never
+stops the rest of the file, and the report always ends with a summary line: a
+chunk that fails as a whole (e.g. the database is unreachable) reports each of
+its rows as an error, and an undecodable file stops at the bad row.
+
+CSV uses the EmployeeCreate field names as headers; `skills` is a list of
+`name` or `name:level` separated by `;` or `,` (level defaults to Beginner).
+"""
+import asyncio
+import csv
+import io
+import json
+import re
+import shutil
+import tempfile
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from app.database import db
+from app.config import settings
+from app.models.employee import EmployeeCreate
+from app.services import notification_service, employee_directory, attendance_status_service
+from app.services.employee_service import initial_payroll_doc
+from app.services.id_sequence import employee_id_sequence
+from app.services.password_hasher import bulk_password_hasher
+from datetime import datetime
+import uuid
+
+collection = db.employees
+payroll_collection = db.payroll
+skills_collection = db.employee_skills
+
+# (row number, raw row or None, parse error or None)
+RawRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+def detect_format(filename: Optional[str], requested: Optional[str]) -> Optional[str]:
+    if requested:
+        return requested
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    if suffix == "csv":
+        return "csv"
+    if suffix in ("ndjson", "jsonl"):
+        return "ndjson"
+    return None
+
+def _read_csv(stream: io.TextIOBase) -> Iterator[RawRow]:
+    for number, row in enumerate(csv.DictReader(stream), start=1):
+        # Blank cells mean "not provided", so optional fields fall back to their defaults
+        yield number, {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}, None
+
+def _read_ndjson(stream: io.TextIOBase) -> Iterator[RawRow]:
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+def _take(rows: Iterator[RawRow], count: int) -> Tuple[List[RawRow], Optional[str]]:
+    """Up to `count` rows, plus the read error (bad encoding, malformed CSV) that cut them short."""
+    chunk: List[RawRow] = []
+    try:
+        chunk.extend(islice(rows, count))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        return chunk, f"file: could not be read past this row ({exc})"
+    return chunk, None
+
+def read_rows(file, format: str) -> Iterator[RawRow]:
+    """Lazily parses the upload; nothing beyond the current row is held in memory."""
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    return _read_csv(stream) if format == "csv" else _read_ndjson(stream)
+
+def parse_skills(value: Any) -> List[Dict[str, str]]:
+    if not value:
+        return []
+    items = re.split(r"[;,]", value) if isinstance(value, str) else value
+    skills = []
+    for item in items:
+        if isinstance(item, dict):
+            skills.append(item)
+            continue
+        name, _, level = str(item).partition(":")
+        if name.strip():
+            skills.append({"skill_name": name.strip(), "proficiency_level": level.strip() or "Beginner"})
+    return skills
+
+def validate_row(row: Dict[str, Any]) -> Tuple[Optional[EmployeeCreate], List[str]]:
+    row = {**row, "skills": parse_skills(row.get("skills"))}
+    try:
+        employee = EmployeeCreate.model_validate(row)
+    except ValidationError as exc:
+        return None, [f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}" for error in exc.errors()]
+    return employee, []
+
+def _error(number: int, errors: List[str], email: Optional[str] = None) -> Dict[str, Any]:
+    return {"row": number, "status": "error", "email": email, "errors": errors}
+
+async def process_chunk(chunk: List[RawRow], seen_emails: set) -> List[Dict[str, Any]]:
+    """Validates and creates one chunk of rows; returns their results in row order."""
+    results: Dict[int, Dict[str, Any]] = {}
+    valid: List[Tuple[int, EmployeeCreate]] = []
+    for number, row, parse_error in chunk:
+        if parse_error:
+            results[number] = _error(number, [parse_error])
+            continue
+        employee, errors = validate_row(row)
+        if errors:
+            results[number] = _error(number, errors, row.get("email"))
+        elif employee.email in seen_emails:
+            results[number] = _error(number, ["email: duplicated earlier in the file"], employee.email)
+        else:
+            seen_emails.add(employee.email)
+            valid.append((number, employee))
+
+    try:
+        await _create(valid, results)
+    except Exception as exc:
+        # The rest of the file still runs and the report still ends with its summary.
+        # Rows created before the failure keep their result; the others can be retried.
+        print(f"Bulk onboarding chunk failed: {exc}")
+        for number, employee in valid:
+            if number not in results:
+                seen_emails.discard(employee.email)
+                results[number] = _error(number, [f"not created: {exc}"], employee.email)
+
+    return [results[number] for number, _, _ in chunk]
+
+async def _create(valid: List[Tuple[int, EmployeeCreate]], results: Dict[int, Dict[str, Any]]):
+    """Creates a chunk's valid rows whose email isn't taken yet and records their results."""
+    if not valid:
+        return
+    # One query for every email in the chunk instead of one per row
+    taken = set()
+    async for doc in collection.find(
+        {"email": {"$in": [employee.email for _, employee in valid]}, "is_deleted": {"$ne": True}},
+        {"_id": 0, "email": 1}
+    ):
+        taken.add(doc["email"])
+    for number, employee in valid:
+        if employee.email in taken:
+            results[number] = _error(number, ["email: an employee with this email already exists"], employee.email)
+    valid = [(number, employee) for number, employee in valid if employee.email not in taken]
+    if not valid:
+        return
+
+    employee_ids = await employee_id_sequence.reserve(len(valid))
+    hashes = await asyncio.gather(*(bulk_password_hasher.hash(employee.password) for _, employee in valid))
+
+    employee_docs = []
+    for (number, employee), employee_id, hashed_password in zip(valid, employee_ids, hashes):
+        data = employee.model_dump(exclude={"password"})
+        employee_docs.append({
+            **data,
+            "hire_date": datetime.combine(employee.hire_date, datetime.min.time()),
+            "employee_id": employee_id, "hashed_password": hashed_password,
+            "photo_url": None, "certificates": [],
+            "is_active": True, "is_deleted": False
+        })
+
+    # Unordered so one conflicting row (e.g. an email taken since the check) doesn't block the rest
+    failed: Dict[int, str] = {}
+    try:
+        await collection.insert_many(employee_docs, ordered=False)
+    except BulkWriteError as exc:
+        failed = {error["index"]: error.get("errmsg", "insert failed") for error in exc.details.get("writeErrors", [])}
+
+    created = []
+    for index, ((number, employee), doc) in enumerate(zip(valid, employee_docs)):
+        if index in failed:
+            results[number] = _error(number, [f"insert: {failed[index]}"], employee.email)
+        else:
+            created.append((number, employee, doc))
+            results[number] = {"row": number, "status": "created", "email": employee.email, "employee_id": doc["employee_id"]}
+
+    if created:
+        await payroll_collection.insert_many([
+            initial_payroll_doc(doc["employee_id"], employee.hire_date, employee.gross_salary or 0, employee.deductions or 0)
+            for _, employee, doc in created
+        ], ordered=False)
+        skill_docs = [
+            {
+                "employee_skill_id": f"SKL-{uuid.uuid4().hex[:8].upper()}",
+                "employee_id": doc["employee_id"],
+                "skill_name": skill.skill_name,
+                "proficiency_level": skill.proficiency_level,
+                "is_deleted": False
+            }
+            for _, employee, doc in created for skill in employee.skills or []
+        ]
+        if skill_docs:
+            await skills_collection.insert_many(skill_docs, ordered=False)
+
+        for _, _, doc in created:
+            employee_directory.prime(doc)
+        if any(doc["role_id"] in notification_service.ADMIN_HR_ROLES for _, _, doc in created):
+            await notification_service.invalidate_admin_hr_ids()
+        await attendance_status_service.sync_new_employees([doc for _, _, doc in created])
+
+async def onboard(rows: Iterator[RawRow]) -> AsyncIterator[Dict[str, Any]]:
+    """Yields one result per row, then a final {"summary": ...}."""
+    chunk_size = settings.BULK_ONBOARDING_CHUNK_SIZE
+    max_rows = settings.BULK_ONBOARDING_MAX_ROWS
+    seen_emails: set = set()
+    total = created = 0
+    truncated = False
+    while True:
+        # Parsing touches the spooled upload file, so keep it off the event loop
+        chunk, read_error = await run_in_threadpool(_take, rows, min(chunk_size, max_rows - total + 1))
+        if total + len(chunk) > max_rows:
+            chunk = chunk[:max_rows - total]
+            truncated = True
+        for result in await process_chunk(chunk, seen_emails):
+            created += result["status"] == "created"
+            yield result
+        total += len(chunk)
+        if read_error and not truncated:
+            # The rest of the file is unreadable: report it as one failed row and stop
+            total += 1
+            yield _error(total, [read_error])
+            break
+        if not chunk or truncated:
+            break
+    yield {"summary": {"total": total, "created": created, "failed": total - created, "truncated": truncated}}
+
+async def spool_upload(upload: UploadFile):
+    """
+    Copies the upload into a temp file owned by the report stream. The stream is
+    read after the endpoint returns, when the framework may already have closed
+    the request's form files.
+    """
+    def copy():
+        spooled = tempfile.TemporaryFile()
+        try:
+            upload.file.seek(0)
+            shutil.copyfileobj(upload.file, spooled)
+            spooled.seek(0)
+        except BaseException:
+            spooled.close()
+            raise
+        return spooled
+    return await run_in_threadpool(copy)
+
+async def stream_report(file, format: str) -> AsyncIterator[bytes]:
+    """NDJSON report for a spooled upload; closes (and so deletes) the file when done."""
+    try:
+        async for result in onboard(read_rows(file, format)):
+            yield (json.dumps(result, default=str) + "\n").encode()
+    finally:
+        file.close()
@@ -0,0 +1,78 @@
+# backend/app/services/employee_directory.py
+"""
+In-process directory of employee_id -> (name, role, department, manager, active)
+used to label records with people without touching Mongo on hot paths.
+
+Entries expire after EMPLOYEE_DIRECTORY_TTL_SECONDS. routers/employees.py writes
+through on every create/update/delete; with CACHE_SHARED_INVALIDATION other
+workers drop their copy within CACHE_VERSION_CHECK_SECONDS. Writes that must
+be authoritative (e.g. "does this employee exist?" before an insert) should
+still read the collection.
+"""
+from typing import Any, Dict, Iterable, Optional
+from app.database import db
+from app.config import settings
+from app.cache import TTLCache, SharedCacheVersion
+
+employees_collection = db.employees
+
+# Only the small, rarely-changing fields needed to label records with a person
+DIRECTORY_FIELDS = ["employee_id", "first_name", "last_name", "role_id", "department", "reports_to", "is_active", "is_deleted"]
+DIRECTORY_PROJECTION = {"_id": 0, **{field: 1 for field in DIRECTORY_FIELDS}}
+
+_directory = TTLCache(ttl_seconds=settings.EMPLOYEE_DIRECTORY_TTL_SECONDS, maxsize=settings.EMPLOYEE_DIRECTORY_MAX_SIZE)
+_directory_version = (
+    SharedCacheVersion("employee_directory", settings.CACHE_VERSION_CHECK_SECONDS)
+    if settings.CACHE_SHARED_INVALIDATION else None
+)
+
+async def _sync_version():
+    if _directory_version is not None and await _directory_version.changed():
+        _directory.clear()
+
+async def get_entry(employee_id: str) -> Optional[Dict[str, Any]]:
+    """Returns the cached directory entry for an employee, loading it on a miss."""
+    await _sync_version()
+    entry = _directory.get(employee_id)
+    if entry is not None:
+        return entry
+    entry = await employees_collection.find_one({"employee_id": employee_id}, DIRECTORY_PROJECTION)
+    if entry is not None:
+        _directory.set(employee_id, entry)
+    return entry
+
+async def get_entries(employee_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Entries for many employees: cache hits plus one $in query for the misses."""
+    await _sync_version()
+    entries = {}
+    missing = []
+    for employee_id in set(employee_ids):
+        entry = _directory.get(employee_id)
+        if entry is not None:
+            entries[employee_id] = entry
+        elif employee_id is not None:
+            missing.append(employee_id)
+    if missing:
+        async for entry in employees_collection.find({"employee_id": {"$in": missing}}, DIRECTORY_PROJECTION):
+            _directory.set(entry["employee_id"], entry)
+            entries[entry["employee_id"]] = entry
+    return entries
+
+def prime(employee_doc: Dict[str, Any]):
+    """Write-through: stores the directory fields of a freshly written employee document."""
+    _directory.set(employee_doc["employee_id"], {field: employee_doc.get(field) for field in DIRECTORY_FIELDS})
+
+async def invalidate(employee_id: str):
+    """Drops an employee's entry (here and, if enabled, in other workers) after a write."""
+    _directory.invalidate(employee_id)
+    if _directory_version is not None:
+        await _directory_version.bump()
+
+def is_deleted(entry: Optional[Dict[str, Any]]) -> bool:
+    return bool(entry and entry.get("is_deleted"))
+
+def full_name(entry: Optional[Dict[str, Any]], default: str = "") -> str:
+    if not entry:
+        return default
+    name = f"{entry.get('first_name', '')} {entry.get('last_name', '')}".strip()
+    return name or default
@@ -1,36 +1,45 @@
 # backend/app/services/employee_service.py
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
-from app.dependencies.auth import get_password_hash
+from app.database import db
+from app.services.password_hasher import password_hasher
+from app.services.id_sequence import employee_id_sequence
+from app.services import notification_service, attendance_status_service, employee_directory
 from fastapi import HTTPException
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import uuid
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB_NAME]
 collection = db.employees
 payroll_collection = db.payroll
 
-async def get_next_employee_id():
-    """Generates the next sequential employee ID."""
-    last_employee = await collection.find_one(sort=[("employee_id", -1)])
-    if not last_employee or not last_employee["employee_id"].startswith("EMP"):
-        return "EMP001"
-    
-    last_id_num = int(last_employee["employee_id"][3:])
-    new_id_num = last_id_num + 1
-    return f"EMP{new_id_num:03d}"
+def initial_payroll_doc(employee_id: str, hire_date: date, gross_salary: float, deductions: float) -> dict:
+    """The payroll record every new hire starts with: their hire month."""
+    start_of_month = hire_date.replace(day=1)
+    if start_of_month.month == 12:
+        next_month = start_of_month.replace(year=start_of_month.year + 1, month=1)
+    else:
+        next_month = start_of_month.replace(month=start_of_month.month + 1)
+    end_of_month = next_month - timedelta(days=1)
+    return {
+        "payroll_id": f"PAY-{uuid.uuid4().hex[:8].upper()}",
+        "employee_id": employee_id,
+        "pay_period_start": datetime.combine(start_of_month, datetime.min.time()),
+        "pay_period_end": datetime.combine(end_of_month, datetime.min.time()),
+        "gross_salary": gross_salary,
+        "deductions": deductions,
+        "net_salary": gross_salary - deductions,
+        "status": "Generated",
+        "is_deleted": False
+    }
 
 async def create_employee_service(employee_data: dict):
     if await collection.find_one({"email": employee_data["email"]}):
         raise HTTPException(status_code=400, detail="Employee with this email already exists")
 
     # Generate the new employee ID
-    new_employee_id = await get_next_employee_id()
+    new_employee_id = await employee_id_sequence.next_id()
     employee_data['employee_id'] = new_employee_id
 
     # Hash the password
-    employee_data['hashed_password'] = get_password_hash(employee_data['password'])
+    employee_data['hashed_password'] = await password_hasher.hash(employee_data['password'])
     del employee_data['password']
     
     # Add default values for required fields not collected by the AI
@@ -48,26 +57,17 @@ async def create_employee_service(employee_data: dict):
 
     # Insert the new employee
     await collection.insert_one(employee_data)
+    employee_directory.prime(employee_data)
+    if employee_data.get('role_id') in notification_service.ADMIN_HR_ROLES:
+        await notification_service.invalidate_admin_hr_ids()
+    await attendance_status_service.sync_employee(new_employee_id)
     
-    # Create the initial payroll record, similar to the main endpoint
-    hire_date = employee_data['hire_date'].date()
-    start_of_month = hire_date.replace(day=1)
-    # A more robust way to get the end of the month
-    next_month = start_of_month.replace(month=start_of_month.month % 12 + 1, day=1)
-    if start_of_month.month == 12:
-        next_month = start_of_month.replace(year=start_of_month.year + 1, month=1)
-    end_of_month = next_month - timedelta(days=1)
-
-    initial_payroll_doc = {
-        "payroll_id": f"PAY-{uuid.uuid4().hex[:8].upper()}",
-        "employee_id": new_employee_id,
-        "pay_period_start": datetime.combine(start_of_month, datetime.min.time()),
-        "pay_period_end": datetime.combine(end_of_month, datetime.min.time()),
-        "gross_salary": float(employee_data.get('gross_salary', 0)),
-        "deductions": float(employee_data.get('deductions', 0)),
-        "net_salary": float(employee_data.get('gross_salary', 0)) - float(employee_data.get('deductions', 0)),
-        "status": "Generated"
-    }
-    await payroll_collection.insert_one(initial_payroll_doc)
+    # Create the initial payroll record, same as the main endpoint
+    await payroll_collection.insert_one(initial_payroll_doc(
+        new_employee_id,
+        employee_data['hire_date'].date(),
+        float(employee_data.get('gross_salary', 0)),
+        float(employee_data.get('deductions', 0))
+    ))
     
     return await collection.find_one({"employee_id": new_employee_id})
\ No newline at end of file
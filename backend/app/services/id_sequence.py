@@ -0,0 +1,89 @@
+# backend/app/services/id_sequence.py
+"""
+Sequential, human-readable IDs (EMP001, EMP002, ...) backed by the `counters`
+collection.
+
+Each worker reserves a block of numbers with one atomic $inc and hands them out
+from memory, so concurrent creates never collide and bulk onboarding costs one
+round trip per block instead of one per hire. Numbers left in a block when a
+worker stops are skipped, so IDs are unique and increasing but may have gaps.
+"""
+import asyncio
+from typing import List
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.database import db
+from app.config import settings
+
+counters_collection = db.counters
+
+class IdSequence:
+    def __init__(self, name: str, prefix: str, source_collection: str, field: str, block_size: int, width: int = 3):
+        self.name = name
+        self.prefix = prefix
+        self.source_collection = source_collection
+        self.field = field
+        self.block_size = block_size
+        self.width = width
+        self._next = 0
+        self._end = -1 # Inclusive; the block is empty when _next > _end
+        self._seeded = False
+        self._lock = None
+
+    def format(self, number: int) -> str:
+        return f"{self.prefix}{number:0{self.width}d}"
+
+    async def _existing_max(self) -> int:
+        """Highest numeric suffix already in use (compared as numbers, not strings)."""
+        pipeline = [
+            {"$match": {self.field: {"$regex": f"^{self.prefix}[0-9]+$"}}},
+            {"$group": {"_id": None, "max": {"$max": {"$toLong": {"$substrCP": [f"${self.field}", len(self.prefix), 20]}}}}},
+        ]
+        result = await db[self.source_collection].aggregate(pipeline).to_list(1)
+        return int(result[0]["max"]) if result else 0
+
+    async def _seed(self):
+        # $max keeps the counter ahead of IDs created before it existed; safe to repeat
+        existing_max = await self._existing_max()
+        try:
+            await counters_collection.update_one({"_id": self.name}, {"$max": {"value": existing_max}}, upsert=True)
+        except DuplicateKeyError: # Another worker upserted first
+            await counters_collection.update_one({"_id": self.name}, {"$max": {"value": existing_max}})
+        self._seeded = True
+
+    async def _reserve_block(self, size: int):
+        if not self._seeded:
+            await self._seed()
+        counter = await counters_collection.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"value": size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._end = counter["value"]
+        self._next = self._end - size + 1
+
+    async def reserve(self, count: int) -> List[str]:
+        """`count` new IDs, topping up the in-memory block with at most one round trip."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            numbers = []
+            while len(numbers) < count:
+                if self._next > self._end:
+                    await self._reserve_block(max(self.block_size, count - len(numbers)))
+                take = min(count - len(numbers), self._end - self._next + 1)
+                numbers.extend(range(self._next, self._next + take))
+                self._next += take
+            return [self.format(number) for number in numbers]
+
+    async def next_id(self) -> str:
+        return (await self.reserve(1))[0]
+
+employee_id_sequence = IdSequence(
+    name="employee_id",
+    prefix="EMP",
+    source_collection="employees",
+    field="employee_id",
+    block_size=settings.EMPLOYEE_ID_BLOCK_SIZE,
+)
@@ -7,14 +7,11 @@ from datetime import datetime, timezone
 # Make sure all necessary services and models are imported
 from app.services import ai_service, leave_service, asset_service, employee_service
 from app.models.leave import LeaveStatusEnum, LeaveTypeEnum
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.routers import attendance
 from pymongo import ReturnDocument
 
 # Database connection
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB_NAME]
 conversations_collection = db.ai_conversations
 employees_collection = db.employees
 leaves_collection = db.leaves
@@ -1,17 +1,97 @@
 # backend/app/services/leave_service.py
 import uuid
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from app.database import db
 from app.models.leave import LeaveStatusEnum, LeaveTypeEnum, LeaveDurationEnum # Added Enums
 from fastapi import HTTPException
 from datetime import datetime, timedelta, date, timezone # Added date, timezone
-from app.services import notification_service # Ensure notification_service is imported
+from typing import Any, Dict, Iterable, List
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services import attendance_status_service, employee_directory
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB_NAME]
 collection = db.leaves
 employees_collection = db.employees # Needed for notifications
 
+# --- Overlap detection ---
+
+# Leaves that still block their days; rejected ones (and rejected days) never do
+ACTIVE_LEAVE_STATUSES = [LeaveStatusEnum.pending.value, LeaveStatusEnum.approved.value, LeaveStatusEnum.partially_approved.value]
+ACTIVE_DAY_STATUSES = {LeaveStatusEnum.pending.value, LeaveStatusEnum.approved.value}
+OVERLAP_PROJECTION = {"_id": 0, "leave_id": 1, "employee_id": 1, "start_date": 1, "end_date": 1, "status": 1, "daily_breakdown": 1}
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+
+def _day(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+def overlap_query(employee_ids: List[str], start_date: date, end_date: date) -> Dict[str, Any]:
+    """Active leaves intersecting [start_date, end_date]; served by leave_employee_interval."""
+    return {
+        "employee_id": employee_ids[0] if len(employee_ids) == 1 else {"$in": employee_ids},
+        "end_date": {"$gte": _utc_midnight(start_date)},
+        "start_date": {"$lte": _utc_midnight(end_date)},
+        "status": {"$in": ACTIVE_LEAVE_STATUSES},
+    }
+
+def active_days(leave: Dict[str, Any], start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """The leave's daily_breakdown entries inside the window that still block the day."""
+    days = []
+    for entry in leave.get("daily_breakdown") or []:
+        day = _day(entry["date"])
+        if start_date <= day <= end_date and entry.get("status", leave["status"]) in ACTIVE_DAY_STATUSES:
+            days.append({
+                "date": day.isoformat(),
+                "leave_id": leave["leave_id"],
+                "status": entry.get("status"),
+                "type": entry.get("type"),
+                "duration": entry.get("duration", LeaveDurationEnum.full_day.value),
+            })
+    return days
+
+async def find_overlaps(
+    employee_id: str,
+    start_date: date,
+    end_date: date,
+    duration: str = LeaveDurationEnum.full_day.value
+) -> List[Dict[str, Any]]:
+    """
+    Days of [start_date, end_date] already covered by the employee's active leaves,
+    one entry per conflicting daily_breakdown day. Two half days may share a date.
+    """
+    conflicts = []
+    async for leave in collection.find(overlap_query([employee_id], start_date, end_date), OVERLAP_PROJECTION):
+        conflicts.extend(active_days(leave, start_date, end_date))
+    if duration == LeaveDurationEnum.half_day.value:
+        half_days: Dict[str, int] = {}
+        for conflict in conflicts:
+            if conflict["duration"] == LeaveDurationEnum.half_day.value:
+                half_days[conflict["date"]] = half_days.get(conflict["date"], 0) + 1
+        conflicts = [
+            c for c in conflicts
+            if c["duration"] != LeaveDurationEnum.half_day.value or half_days[c["date"]] > 1
+        ]
+    return sorted(conflicts, key=lambda c: (c["date"], c["leave_id"]))
+
+async def team_calendar(employee_ids: Iterable[str], start_date: date, end_date: date) -> Dict[str, List[Dict[str, Any]]]:
+    """Bulk mode: every team member's blocked days in the window, from one indexed query."""
+    employee_ids = sorted(set(employee_ids))
+    calendar: Dict[str, List[Dict[str, Any]]] = {employee_id: [] for employee_id in employee_ids}
+    if not employee_ids:
+        return calendar
+    async for leave in collection.find(overlap_query(employee_ids, start_date, end_date), OVERLAP_PROJECTION):
+        calendar[leave["employee_id"]].extend(active_days(leave, start_date, end_date))
+    for days in calendar.values():
+        days.sort(key=lambda d: (d["date"], d["leave_id"]))
+    return calendar
+
+def describe_conflicts(conflicts: List[Dict[str, Any]]) -> str:
+    by_leave: Dict[str, List[str]] = {}
+    for conflict in conflicts:
+        by_leave.setdefault(f"{conflict['leave_id']} ({conflict['status']})", []).append(conflict["date"])
+    return "Leave overlaps existing requests: " + "; ".join(
+        f"{leave} on {', '.join(days)}" for leave, days in by_leave.items()
+    )
+
 async def create_leave_request_service(
     employee_id: str,
     reason: str,
@@ -41,6 +121,10 @@ async def create_leave_request_service(
     if not target_employee:
         raise HTTPException(status_code=404, detail=f"Employee with ID {employee_id} not found.")
 
+    conflicts = await find_overlaps(employee_id, start_date, end_date, duration.value)
+    if conflicts:
+        raise HTTPException(status_code=409, detail=describe_conflicts(conflicts))
+
     daily_breakdown = []
     current = start_date
     while current <= end_date:
@@ -75,12 +159,10 @@ async def create_leave_request_service(
 
     # --- Notification Logic (Moved Here) ---
     employee_name = f"{target_employee.get('first_name', '')} {target_employee.get('last_name', '')}".strip()
-    admin_hr_ids = await notification_service.get_admin_hr_ids()
-    # Combine employee and admin/hr IDs, ensuring uniqueness
-    recipient_ids = list(set([employee_id] + admin_hr_ids))
-
-    await notification_service.create_notification(
-        recipient_ids=recipient_ids,
+    # Employee plus all admin/hr; resolved and persisted by the background dispatcher
+    await notification_dispatcher.publish(
+        recipient_ids=[employee_id],
+        notify_admin_hr=True,
         message_self="Your leave request has been submitted.", # Message for employee
         message_other=f"New leave request ({leave_doc['leave_id']}) submitted by {employee_name}.", # Message for admin/hr
         link_self="/employee/my-leaves",
@@ -149,16 +231,16 @@ async def update_leave_status_service(
         # This might happen if the status was already set somehow between find and update
          print(f"Warning: Leave request {leave_id} status was likely already {status.value}, no modification made.")
 
+    if status == LeaveStatusEnum.approved:
+        await attendance_status_service.record_leave_approved(leave_request)
 
     # --- Notification Logic (Moved Here) ---
     recipient_ids = [leave_request["employee_id"]] # Only notify the employee whose leave it is
 
     # Get details for message construction
-    employee_subject = await employees_collection.find_one({"employee_id": leave_request["employee_id"]})
-    employee_name = f"{employee_subject.get('first_name', '')} {employee_subject.get('last_name', '')}".strip() if employee_subject else "Employee"
-
-    updater = await employees_collection.find_one({"employee_id": updater_id})
-    updater_name = f"{updater.get('first_name', '')} {updater.get('last_name', '')}".strip() if updater else updater_id
+    names = await employee_directory.get_entries([leave_request["employee_id"], updater_id])
+    employee_name = employee_directory.full_name(names.get(leave_request["employee_id"]), default="Employee")
+    updater_name = employee_directory.full_name(names.get(updater_id), default=updater_id)
 
     # Define messages
     message_self = f"Your leave request ({leave_id}) has been {status.value} by {updater_name}."
@@ -171,13 +253,10 @@ async def update_leave_status_service(
 
     # Decide recipients - often just the employee for status updates
     final_recipient_ids = recipient_ids
-    # Uncomment below if Admins/HR should also be notified of status changes
-    # admin_hr_ids = await notification_service.get_admin_hr_ids()
-    # admin_hr_ids = [uid for uid in admin_hr_ids if uid != leave_request["employee_id"]] # Exclude employee if they are admin/hr
-    # final_recipient_ids = list(set(recipient_ids + admin_hr_ids))
+    # Pass notify_admin_hr=True below if Admins/HR should also be notified of status changes
 
 
-    await notification_service.create_notification(
+    await notification_dispatcher.publish(
         recipient_ids=final_recipient_ids, # Send only to employee, or combined list
         message_self=message_self,
         message_other=message_other, # This will likely not be used if only employee is recipient
@@ -0,0 +1,179 @@
+# backend/app/services/notification_dispatcher.py
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.database import db
+from app.config import settings
+from app.services import notification_service
+
+dead_letters_collection = db.notification_dead_letters
+
+class NotificationDispatcher:
+    """
+    Takes notification persistence off the request path. Routers publish a small
+    event dict; a background task coalesces identical events, resolves admin/HR
+    recipients, and writes them through notification_service.create_notification.
+    Failed deliveries are retried with backoff and then parked in a dead-letter
+    collection. In sync mode (tests, scripts) publish() delivers inline.
+
+    Each event gets its notification_id when published, and delivery is
+    idempotent for a given id. A retry after a partial write, or stop()
+    re-delivering the batch a cancelled worker was in the middle of, therefore
+    never duplicates a notification.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int,
+        batch_size: int,
+        max_retries: int,
+        retry_backoff_seconds: float,
+        sync_mode: bool = False,
+    ):
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.sync_mode = sync_mode
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._batch: List[Dict[str, Any]] = [] # Events taken off the queue but not yet delivered
+        self._task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def publish(
+        self,
+        recipient_ids: List[str],
+        message_self: str,
+        message_other: str,
+        link_self: Optional[str] = None,
+        link_other: Optional[str] = None,
+        type: str = "general",
+        subject_employee_id: Optional[str] = None,
+        notify_admin_hr: bool = False, # Also deliver to every admin/HR user
+    ):
+        event = {
+            "notification_id": f"NOTIF-{uuid.uuid4().hex[:8].upper()}",
+            "recipient_ids": list(recipient_ids),
+            "message_self": message_self,
+            "message_other": message_other,
+            "link_self": link_self,
+            "link_other": link_other,
+            "type": type,
+            "subject_employee_id": subject_employee_id,
+            "notify_admin_hr": notify_admin_hr,
+        }
+        if self.sync_mode or not self.running:
+            await self._deliver(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure: deliver on the caller's time rather than lose the event
+            print("Notification queue full; delivering inline.")
+            await self._deliver(event)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    async def start(self):
+        if not self.sync_mode and not self.running:
+            self._task = asyncio.create_task(self._run(), name="notification-dispatcher")
+
+    async def stop(self):
+        """Stops the worker and delivers whatever is still in flight or queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending, self._batch = self._batch, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for event in coalesce_events(pending):
+            await self._deliver(event)
+
+    async def _run(self):
+        while True:
+            events = [await self._queue.get()]
+            # Take whatever else is already waiting, without blocking, and merge duplicates
+            while len(events) < self.batch_size and not self._queue.empty():
+                events.append(self._queue.get_nowait())
+            # Keep the batch in self._batch until it is delivered so that a shutdown
+            # mid-delivery still delivers it from stop()
+            self._batch = coalesce_events(events)
+            while self._batch:
+                await self._deliver(self._batch[0])
+                self._batch.pop(0)
+
+    async def _deliver(self, event: Dict[str, Any]):
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retried += 1
+                await asyncio.sleep(self.retry_backoff_seconds * (2 ** (attempt - 1)))
+            try:
+                recipient_ids = list(event["recipient_ids"])
+                if event["notify_admin_hr"]:
+                    recipient_ids += await notification_service.get_admin_hr_ids()
+                await notification_service.create_notification(
+                    notification_id=event.get("notification_id"),
+                    recipient_ids=recipient_ids,
+                    message_self=event["message_self"],
+                    message_other=event["message_other"],
+                    link_self=event["link_self"],
+                    link_other=event["link_other"],
+                    type=event["type"],
+                    subject_employee_id=event["subject_employee_id"],
+                )
+                self.delivered += 1
+                return
+            except Exception as e:
+                last_error = e
+                print(f"Notification delivery failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
+        await self._dead_letter(event, last_error)
+
+    async def _dead_letter(self, event: Dict[str, Any], error: Optional[Exception]):
+        self.dead_lettered += 1
+        try:
+            await dead_letters_collection.insert_one({
+                "event": event,
+                "error": str(error),
+                "attempts": self.max_retries + 1,
+                "failed_at": datetime.now(timezone.utc)
+            })
+        except Exception as e:
+            print(f"Failed to dead-letter notification event {event.get('type')}: {e}")
+
+
+def coalesce_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merges events that differ only in their recipients (and id), preserving order."""
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for event in events:
+        key = tuple((k, v) for k, v in event.items() if k not in ("recipient_ids", "notification_id"))
+        if key in merged:
+            merged[key]["recipient_ids"] = list(dict.fromkeys(merged[key]["recipient_ids"] + event["recipient_ids"]))
+        else:
+            merged[key] = {**event, "recipient_ids": list(event["recipient_ids"])}
+    return list(merged.values())
+
+
+notification_dispatcher = NotificationDispatcher(
+    max_queue_size=settings.NOTIFICATION_QUEUE_MAX_SIZE,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    max_retries=settings.NOTIFICATION_MAX_RETRIES,
+    retry_backoff_seconds=settings.NOTIFICATION_RETRY_BACKOFF_SECONDS,
+    sync_mode=settings.NOTIFICATION_DISPATCH_SYNC,
+)
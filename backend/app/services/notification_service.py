@@ -1,23 +1,66 @@
 # backend/app/services/notification_service.py
 import uuid
-from motor.motor_asyncio import AsyncIOMotorClient
+import time
+from pymongo.errors import BulkWriteError
+from app.database import db
+from app.cache import TTLCache, SharedCacheVersion
 from app.config import settings
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB_NAME]
 notifications_collection = db.notifications
 user_notifications_collection = db.user_notifications # New linking collection
 employees_collection = db.employees
 
+# Running fan-out totals per notification type, e.g. {"check_in": {"events": 3, ...}}
+fanout_stats: Dict[str, Dict[str, float]] = {}
+
+def _record_fanout_metrics(metrics: Dict[str, Any]):
+    stats = fanout_stats.setdefault(metrics["type"], {"events": 0, "recipients_linked": 0, "total_ms": 0.0})
+    stats["events"] += 1
+    stats["recipients_linked"] += metrics["recipients_linked"]
+    stats["total_ms"] += metrics["total_ms"]
+
+def get_fanout_stats() -> Dict[str, Dict[str, float]]:
+    """Per-type fan-out totals with the average cost per event."""
+    return {
+        type_: {**stats, "avg_ms": round(stats["total_ms"] / stats["events"], 2) if stats["events"] else 0.0}
+        for type_, stats in fanout_stats.items()
+    }
+
+ADMIN_HR_ROLES = ["admin", "hr"]
+_admin_hr_cache = TTLCache(ttl_seconds=settings.ADMIN_HR_CACHE_TTL_SECONDS)
+# Optional cross-worker invalidation; without it other workers catch up within the TTL
+_admin_hr_version = (
+    SharedCacheVersion("admin_hr_ids", settings.CACHE_VERSION_CHECK_SECONDS)
+    if settings.CACHE_SHARED_INVALIDATION else None
+)
+
 async def get_admin_hr_ids() -> List[str]:
-    """Fetches employee IDs for users with 'admin' or 'hr' roles."""
+    """Fetches employee IDs for active users with 'admin' or 'hr' roles (cached)."""
+    if _admin_hr_version is not None and await _admin_hr_version.changed():
+        _admin_hr_cache.clear()
+
+    cached_ids = _admin_hr_cache.get("ids")
+    if cached_ids is not None:
+        return list(cached_ids)
+
     admin_hr_cursor = employees_collection.find(
-        {"role_id": {"$in": ["admin", "hr"]}},
+        {"role_id": {"$in": ADMIN_HR_ROLES}, "is_deleted": {"$ne": True}, "is_active": {"$ne": False}},
         {"employee_id": 1, "_id": 0}
     )
-    return [emp["employee_id"] async for emp in admin_hr_cursor]
+    admin_hr_ids = [emp["employee_id"] async for emp in admin_hr_cursor]
+    _admin_hr_cache.set("ids", tuple(admin_hr_ids))
+    return admin_hr_ids
+
+async def invalidate_admin_hr_ids():
+    """Drops the cached admin/HR recipient set. Call after role/active/deleted changes."""
+    _admin_hr_cache.clear()
+    if _admin_hr_version is not None:
+        await _admin_hr_version.bump()
+
+def _link_id(notification_id: str, user_id: str) -> str:
+    return f"UNS-{uuid.uuid5(uuid.NAMESPACE_URL, f'{notification_id}/{user_id}').hex[:16].upper()}"
 
 async def create_notification(
     recipient_ids: List[str],
@@ -26,18 +69,26 @@ async def create_notification(
     link_self: Optional[str] = None,  # Link for the subject employee
     link_other: Optional[str] = None, # Link for others (admin/hr)
     type: str = "general",
-    subject_employee_id: Optional[str] = None # The employee the notification is about
+    subject_employee_id: Optional[str] = None, # The employee the notification is about
+    notification_id: Optional[str] = None # Given by the dispatcher; makes a repeated call a no-op
 ):
     """
     Creates a single notification document with different message/link versions
     and links it to multiple recipients.
+    With a notification_id the call is idempotent: the document is upserted and
+    link ids derive from (notification_id, recipient), so retrying after a
+    partial failure only fills in what is missing.
+    Returns {"notification": <doc>, "metrics": <fan-out timings and counts>}.
     """
     if not recipient_ids:
         print("Warning: create_notification called with no recipient_ids.")
         return None # Return None or raise an error as appropriate
 
+    started = time.perf_counter()
+
     # 1. Create the core notification document with both message/link versions
-    notification_id = f"NOTIF-{uuid.uuid4().hex[:8].upper()}"
+    idempotent = notification_id is not None
+    notification_id = notification_id or f"NOTIF-{uuid.uuid4().hex[:8].upper()}"
     notification_doc = {
         "notification_id": notification_id,
         "message_self": message_self,
@@ -48,35 +99,67 @@ async def create_notification(
         "type": type,
         "subject_employee_id": subject_employee_id
     }
-    insert_result = await notifications_collection.insert_one(notification_doc)
-    if not insert_result.inserted_id:
-         print(f"Error: Failed to insert notification document for {notification_id}")
-         return None # Or raise
-
-    # 2. Create linking documents for each unique recipient
-    user_notification_docs = []
-    unique_recipient_ids = list(set(recipient_ids)) # Ensure no duplicates
-
-    for user_id in unique_recipient_ids:
-        # Check if employee exists before creating link
-        employee_exists = await employees_collection.count_documents({"employee_id": user_id}) > 0
-        if not employee_exists:
-            print(f"Warning: Skipping notification link for non-existent employee_id: {user_id}")
-            continue
-
-        user_notification_docs.append({
-            "user_notification_id": f"UNS-{uuid.uuid4().hex[:8].upper()}",
+    if idempotent:
+        await notifications_collection.update_one(
+            {"notification_id": notification_id}, {"$setOnInsert": notification_doc}, upsert=True
+        )
+    else:
+        insert_result = await notifications_collection.insert_one(notification_doc)
+        if not insert_result.inserted_id:
+             print(f"Error: Failed to insert notification document for {notification_id}")
+             return None # Or raise
+
+    # 2. Validate all recipients with a single $in query instead of one lookup per user
+    unique_recipient_ids = list(dict.fromkeys(recipient_ids)) # Ensure no duplicates, keep order
+    validate_started = time.perf_counter()
+    existing_ids = {
+        emp["employee_id"] async for emp in employees_collection.find(
+            {"employee_id": {"$in": unique_recipient_ids}},
+            {"employee_id": 1, "_id": 0}
+        )
+    }
+    validate_ms = (time.perf_counter() - validate_started) * 1000
+
+    skipped_ids = [user_id for user_id in unique_recipient_ids if user_id not in existing_ids]
+    if skipped_ids:
+        print(f"Warning: Skipping notification links for non-existent employee_ids: {skipped_ids}")
+
+    user_notification_docs = [
+        {
+            "user_notification_id": _link_id(notification_id, user_id) if idempotent else f"UNS-{uuid.uuid4().hex[:8].upper()}",
             "user_id": user_id,
             "notification_id": notification_id,
             "read_status": False,
             "deleted": False,
             "created_at": notification_doc["timestamp"] # Use same timestamp for sorting
-        })
+        }
+        for user_id in unique_recipient_ids if user_id in existing_ids
+    ]
 
+    # 3. Fan out to every recipient with one unordered bulk write
+    linked_count = 0
+    fanout_started = time.perf_counter()
     if user_notification_docs:
-        insert_many_result = await user_notifications_collection.insert_many(user_notification_docs)
-        print(f"Created notification {notification_id} and linked to {len(insert_many_result.inserted_ids)} recipients.")
-    else:
-        print(f"Notification {notification_id} created, but no valid recipients to link.")
+        try:
+            insert_many_result = await user_notifications_collection.insert_many(user_notification_docs, ordered=False)
+            linked_count = len(insert_many_result.inserted_ids)
+        except BulkWriteError as exc:
+            # On a retry, links written by the earlier attempt are duplicate keys
+            if not idempotent or any(error.get("code") != 11000 for error in exc.details.get("writeErrors", [])):
+                raise
+            linked_count = exc.details.get("nInserted", 0)
+    fanout_ms = (time.perf_counter() - fanout_started) * 1000
+
+    metrics = {
+        "type": type,
+        "recipients_requested": len(unique_recipient_ids),
+        "recipients_linked": linked_count,
+        "recipients_skipped": len(skipped_ids),
+        "validate_ms": round(validate_ms, 2),
+        "fanout_ms": round(fanout_ms, 2),
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    _record_fanout_metrics(metrics)
+    print(f"Created notification {notification_id} ({type}) linked to {linked_count} recipients in {metrics['total_ms']} ms.")
 
-    return notification_doc # Return the created notification document
\ No newline at end of file
+    return {"notification": notification_doc, "metrics": metrics}
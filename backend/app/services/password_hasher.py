@@ -0,0 +1,92 @@
+# backend/app/services/password_hasher.py
+"""
+Runs bcrypt hashing/verification off the event loop.
+
+A bcrypt call takes 100-300 ms of CPU; run inline it stalls every other request
+on the worker. Calls go to a dedicated ThreadPoolExecutor (bcrypt releases the
+GIL) of PASSWORD_HASH_WORKERS threads. At most PASSWORD_HASH_MAX_PENDING calls
+may be queued or running; beyond that callers get a 503 rather than piling up
+behind a login storm. A hasher built with wait=True (bulk onboarding) instead
+makes callers wait for a slot, since its callers can't retry.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException, status
+from app.config import settings
+from app.dependencies.auth import verify_password, get_password_hash, verify_and_update_password
+
+class PasswordHasher:
+    def __init__(self, max_workers: int, max_pending: int, wait: bool = False):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_pending) if wait else None
+        self.pending = 0 # Queued + running
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        if self._slots is not None:
+            async with self._slots:
+                return await self._submit(fn, *args)
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-in requests, please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+        return await self._submit(fn, *args)
+
+    async def _submit(self, fn: Callable[..., Any], *args) -> Any:
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """(valid, new_hash); new_hash is set when the stored hash should be upgraded."""
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+# Bulk onboarding hashes a whole chunk at once; its own pool keeps logins responsive meanwhile.
+# Overlapping imports queue for slots instead of failing mid-stream.
+bulk_password_hasher = PasswordHasher(
+    max_workers=settings.BULK_PASSWORD_HASH_WORKERS,
+    max_pending=settings.BULK_ONBOARDING_CHUNK_SIZE,
+    wait=True,
+)
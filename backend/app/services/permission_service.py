@@ -0,0 +1,62 @@
+# backend/app/services/permission_service.py
+"""
+Resolves a role to its permission set at request time.
+
+Access tokens carry only `role` and the role's `rv` (version) at issue time, so
+role edits apply to every live token immediately. Each role document holds a
+`version` that role_management bumps on every change. Cached sets are dropped
+when:
+- the role is written in this worker;
+- a token shows a newer version than the cached one, meaning the role was
+  edited in another worker since we loaded it;
+- CACHE_SHARED_INVALIDATION is on and another worker bumped the shared counter;
+- ROLE_PERMISSIONS_TTL_SECONDS has passed.
+"""
+from typing import Any, Dict, FrozenSet, Optional
+from app.database import db
+from app.config import settings
+from app.cache import TTLCache, SharedCacheVersion
+
+roles_collection = db.roles
+
+ROLE_PROJECTION = {"_id": 0, "role_id": 1, "permission_keys": 1, "version": 1, "is_deleted": 1}
+NO_PERMISSIONS: FrozenSet[str] = frozenset()
+
+_roles = TTLCache(ttl_seconds=settings.ROLE_PERMISSIONS_TTL_SECONDS)
+_roles_version = (
+    SharedCacheVersion("roles", settings.CACHE_VERSION_CHECK_SECONDS)
+    if settings.CACHE_SHARED_INVALIDATION else None
+)
+
+async def _load(role_id: str) -> Dict[str, Any]:
+    role = await roles_collection.find_one({"role_id": role_id}, ROLE_PROJECTION)
+    entry = {
+        "version": (role or {}).get("version", 0),
+        "permissions": (
+            frozenset(role.get("permission_keys", []))
+            if role and not role.get("is_deleted") else NO_PERMISSIONS
+        ),
+    }
+    _roles.set(role_id, entry)
+    return entry
+
+async def get_role_entry(role_id: str, min_version: Optional[int] = None) -> Dict[str, Any]:
+    """{"version", "permissions"} for a role; reloads if the caller has seen a newer version."""
+    if _roles_version is not None and await _roles_version.changed():
+        _roles.clear()
+    entry = _roles.get(role_id)
+    if entry is None or (min_version is not None and min_version > entry["version"]):
+        entry = await _load(role_id)
+    return entry
+
+async def get_permissions(role_id: str, min_version: Optional[int] = None) -> FrozenSet[str]:
+    return (await get_role_entry(role_id, min_version))["permissions"]
+
+async def get_role_version(role_id: str) -> int:
+    return (await get_role_entry(role_id))["version"]
+
+async def invalidate_role(role_id: str):
+    """Call after any write to a role document."""
+    _roles.invalidate(role_id)
+    if _roles_version is not None:
+        await _roles_version.bump()
@@ -0,0 +1,73 @@
+# backend/app/services/photo_variants.py
+"""
+Pre-rendered size variants of employee photos.
+
+When a photo is stored, each size in PHOTO_VARIANT_SIZES is rendered once, as
+PHOTO_VARIANT_FORMAT (WebP by default), next to the original blob:
+<sha><ext> -> <sha>.thumb.webp, <sha>.small.webp, ... Clients ask for a size
+by adding ?size=<name> to the photo URL (see app/static_files.py). That falls
+back to the original when a variant is missing, e.g. for legacy photos or when
+Pillow isn't installed. Variants are keyed by the source hash, so they are
+generated once per distinct photo and are as immutable as the blob itself.
+"""
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from fastapi import UploadFile
+from app.config import settings
+from app.services import blob_store
+from app.services.upload_writer import upload_writer, PHOTO_POLICY
+
+try:
+    from PIL import Image, ImageOps
+except ImportError: # Optional dependency; photos are then served at full size only
+    Image = None
+
+VARIANT_SIZES: Dict[str, int] = settings.PHOTO_VARIANT_SIZES
+VARIANT_EXTENSION = f".{settings.PHOTO_VARIANT_FORMAT.lower()}"
+
+def variant_path(sha256: str, name: str) -> Path:
+    return blob_store.blob_path(sha256, f".{name}{VARIANT_EXTENSION}")
+
+def variant_for(blob_file: Path, name: Optional[str]) -> Optional[Path]:
+    """The rendered variant of a blob file, if `name` is a known size and it exists."""
+    if name not in VARIANT_SIZES:
+        return None
+    sha256 = blob_file.name.split(".", 1)[0]
+    candidate = blob_file.with_name(f"{sha256}.{name}{VARIANT_EXTENSION}")
+    return candidate if candidate.is_file() else None
+
+def _render(source: Path, sha256: str) -> List[str]:
+    rendered = []
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original) # Phone photos are often stored rotated
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        for name, size in VARIANT_SIZES.items():
+            target = variant_path(sha256, name)
+            if not target.exists(): # Same photo already processed for someone else
+                variant = image.copy()
+                variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+                temp = target.with_name(f".{uuid.uuid4().hex}.part")
+                variant.save(temp, format=settings.PHOTO_VARIANT_FORMAT.upper(), quality=settings.PHOTO_VARIANT_QUALITY)
+                os.replace(temp, target)
+            rendered.append(name)
+    return rendered
+
+async def generate(blob: Dict[str, Any]) -> List[str]:
+    """Renders any missing variants of a stored photo blob; returns the available sizes."""
+    if Image is None:
+        return []
+    source = blob_store.blob_path(blob["sha256"], blob["url"][blob["url"].rfind("."):])
+    try:
+        return await upload_writer.run_io(_render, source, blob["sha256"])
+    except Exception as e: # A photo we can't decode is still stored and served as-is
+        print(f"Could not render variants for photo {blob['sha256']}: {e}")
+        return []
+
+async def store_photo(upload: UploadFile) -> Dict[str, Any]:
+    """blob_store.put for photos, plus the size variants."""
+    blob = await blob_store.put(upload, PHOTO_POLICY)
+    blob["variants"] = await generate(blob)
+    return blob
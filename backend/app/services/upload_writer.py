@@ -0,0 +1,172 @@
+# backend/app/services/upload_writer.py
+"""
+Streams uploaded files to disk without blocking the event loop.
+
+Chunks of UPLOAD_CHUNK_SIZE bytes are read from the request and written to a
+temp file in the destination directory on a dedicated thread pool. While
+streaming, the writer enforces the policy's size limit, checks the declared
+content type and the file's leading bytes, and computes a SHA-256 of the
+content. The temp file is renamed into place only once it is complete, so
+readers never see a half-written file. Each upload's size, duration and
+throughput are logged and kept in stats().
+"""
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+from fastapi import HTTPException, UploadFile, status
+from app.config import settings
+
+# Leading bytes of each accepted content type; a declared type must match the file
+SIGNATURES: Dict[str, Tuple[bytes, ...]] = {
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+    "image/webp": (b"RIFF",),
+    "application/pdf": (b"%PDF-",),
+}
+EXTENSIONS = {
+    "image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif",
+    "image/webp": ".webp", "application/pdf": ".pdf",
+}
+
+@dataclass(frozen=True)
+class UploadPolicy:
+    name: str
+    directory: Path
+    max_bytes: int
+    content_types: FrozenSet[str]
+
+PHOTO_POLICY = UploadPolicy(
+    name="photo",
+    directory=Path("app/static/images"),
+    max_bytes=settings.UPLOAD_MAX_PHOTO_BYTES,
+    content_types=frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"}),
+)
+CERTIFICATE_POLICY = UploadPolicy(
+    name="certificate",
+    directory=Path("app/static/certificates"),
+    max_bytes=settings.UPLOAD_MAX_CERTIFICATE_BYTES,
+    content_types=frozenset({"application/pdf", "image/jpeg", "image/png"}),
+)
+
+@dataclass
+class ReceivedUpload:
+    """A fully streamed upload sitting in its temp file, not yet in place."""
+    policy: UploadPolicy
+    temp_path: Path
+    content_type: str
+    extension: str
+    size: int
+    sha256: str
+    seconds: float
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.size / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+def _matches_signature(content_type: str, head: bytes) -> bool:
+    if content_type == "image/webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    return head.startswith(SIGNATURES[content_type])
+
+class UploadWriter:
+    def __init__(self, max_workers: int, chunk_size: int):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.uploads = 0
+        self.rejected = 0
+        self.bytes_written = 0
+        self.seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="upload-writer")
+        return self._executor
+
+    async def run_io(self, fn: Callable[..., Any], *args) -> Any:
+        """Runs a blocking filesystem call on the upload pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+
+    def _reject(self, status_code: int, detail: str):
+        self.rejected += 1
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    async def receive(self, upload: UploadFile, policy: UploadPolicy, temp_dir: Optional[Path] = None) -> ReceivedUpload:
+        """
+        Streams `upload` into a temp file, validating as it goes. `temp_dir` must be
+        on the same filesystem as the final destination (defaults to policy.directory).
+        """
+        content_type = (upload.content_type or "").split(";")[0].strip().lower()
+        if content_type not in policy.content_types:
+            self._reject(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, f"Unsupported {policy.name} type '{content_type or 'unknown'}'")
+
+        temp_dir = temp_dir or policy.directory
+        await self.run_io(lambda: temp_dir.mkdir(parents=True, exist_ok=True))
+        temp_path = temp_dir / f".{uuid.uuid4().hex}.part"
+        handle = await self.run_io(open, temp_path, "wb")
+        digest = hashlib.sha256()
+        size = 0
+        started = time.perf_counter()
+        try:
+            while chunk := await upload.read(self.chunk_size):
+                if size == 0 and not _matches_signature(content_type, chunk):
+                    self._reject(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, f"File content does not match '{content_type}'")
+                size += len(chunk)
+                if size > policy.max_bytes:
+                    self._reject(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"{policy.name.capitalize()} exceeds {policy.max_bytes} bytes")
+                digest.update(chunk)
+                await self.run_io(handle.write, chunk)
+            if size == 0:
+                self._reject(status.HTTP_400_BAD_REQUEST, f"Empty {policy.name} upload")
+            await self.run_io(handle.close)
+        except BaseException:
+            await self.run_io(handle.close)
+            await self.discard_path(temp_path)
+            raise
+        return ReceivedUpload(
+            policy=policy, temp_path=temp_path, content_type=content_type,
+            extension=EXTENSIONS[content_type], size=size, sha256=digest.hexdigest(),
+            seconds=time.perf_counter() - started,
+        )
+
+    async def commit(self, received: ReceivedUpload, destination: Path):
+        """Atomically moves a received upload into place (replacing any file already there)."""
+        await self.run_io(os.replace, received.temp_path, destination)
+        self.uploads += 1
+        self.bytes_written += received.size
+        self.seconds += received.seconds
+        print(
+            f"Upload stored: {destination.name} ({received.policy.name}, {received.size} bytes, "
+            f"{received.seconds * 1000:.1f} ms, {received.throughput_mb_s:.1f} MB/s)"
+        )
+
+    async def discard(self, received: ReceivedUpload):
+        await self.discard_path(received.temp_path)
+
+    async def discard_path(self, path: Path):
+        await self.run_io(lambda: path.unlink(missing_ok=True))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "uploads": self.uploads,
+            "rejected": self.rejected,
+            "bytes_written": self.bytes_written,
+            "avg_throughput_mb_s": self.bytes_written / (1024 * 1024) / self.seconds if self.seconds else 0.0,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+upload_writer = UploadWriter(
+    max_workers=settings.UPLOAD_WORKERS,
+    chunk_size=settings.UPLOAD_CHUNK_SIZE,
+)
@@ -0,0 +1,47 @@
+# backend/app/signed_urls.py
+"""
+Optional signed URLs for /static files.
+
+With STATIC_SIGNED_URLS on, /static only serves requests carrying a valid
+`expires` + `sig` query pair, an HMAC of the path and expiry. API responses
+sign the URLs they return: fields typed StaticUrl are signed when serialized,
+on both the response_model and TrustedShape paths. Expiries are rounded up to
+the next STATIC_URL_TTL_SECONDS boundary (plus one window), so a file keeps the
+same signed URL for a while and browser caches still hit.
+"""
+import base64
+import hashlib
+import hmac
+import time
+from typing import Annotated, Optional
+from pydantic import PlainSerializer
+from app.config import settings
+
+STATIC_PREFIX = "/static/"
+
+def _secret() -> bytes:
+    return (settings.STATIC_URL_SECRET or settings.JWT_SECRET_KEY).encode()
+
+def _signature(path: str, expires: int) -> str:
+    digest = hmac.new(_secret(), f"{path}:{expires}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+def sign_url(url: Optional[str], now: Optional[float] = None) -> Optional[str]:
+    """Adds expires/sig to a /static URL when signing is enabled; anything else is returned as-is."""
+    if not settings.STATIC_SIGNED_URLS or not url or not url.startswith(STATIC_PREFIX):
+        return url
+    ttl = settings.STATIC_URL_TTL_SECONDS
+    expires = (int(now if now is not None else time.time()) // ttl + 2) * ttl
+    path, _, query = url.partition("?")
+    separator = f"?{query}&" if query else "?"
+    return f"{path}{separator}expires={expires}&sig={_signature(path, expires)}"
+
+def verify(path: str, expires: Optional[str], sig: Optional[str], now: Optional[float] = None) -> bool:
+    if not expires or not sig or not expires.isdigit():
+        return False
+    if int(expires) < (now if now is not None else time.time()):
+        return False
+    return hmac.compare_digest(sig, _signature(path, int(expires)))
+
+# A /static URL stored on a document; signed on the way out when STATIC_SIGNED_URLS is on
+StaticUrl = Annotated[str, PlainSerializer(sign_url, return_type=str, when_used="json")]
@@ -0,0 +1,82 @@
+# backend/app/static_files.py
+"""
+Delivery of /static: photos, certificates and content-addressed blobs.
+
+Files under /static/blobs are content-addressed: a URL's bytes never change.
+They get a strong ETag made from the file name (the content hash, plus the size
+variant) and `Cache-Control: public, max-age=31536000, immutable`, so browsers
+reuse them without even revalidating. A `?size=<name>` query on a blob photo
+serves that pre-rendered variant when it exists. Anything else (legacy uploads)
+is revalidated on every use with Starlette's default ETag.
+
+Every file supports conditional GET (If-None-Match / If-Modified-Since -> 304)
+and Range / If-Range requests (206), so an interrupted certificate download
+resumes instead of starting over. Bodies are sent with the ASGI pathsend
+extension (zero-copy) when the server offers it. With STATIC_SENDFILE_HEADER
+set, the worker only checks access and builds headers, and the front proxy
+streams the file itself with sendfile(2). With STATIC_SIGNED_URLS on, requests
+without a valid signature get 403 (see app/signed_urls.py).
+"""
+import os
+from pathlib import Path, PurePosixPath
+from urllib.parse import parse_qs, quote
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+from app.config import settings
+from app.services import photo_variants
+from app.signed_urls import STATIC_PREFIX, verify
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# The proxy answers Range requests itself once it has the file
+OFFLOAD_DROPPED_HEADERS = {"content-length", "accept-ranges"}
+
+def is_blob_path(path: str) -> bool:
+    return PurePosixPath(path).parts[:1] == ("blobs",)
+
+class CachedStaticFiles(StaticFiles):
+    def _relative(self, full_path) -> str:
+        return os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+
+    def _variant_path(self, path: str, size: str) -> str:
+        full_path, stat_result = self.lookup_path(path)
+        variant = photo_variants.variant_for(Path(full_path), size) if stat_result else None
+        return self._relative(variant) if variant is not None else path
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if settings.STATIC_SIGNED_URLS:
+            url_path = STATIC_PREFIX + path.replace(os.sep, "/")
+            if not verify(url_path, query.get("expires", [None])[0], query.get("sig", [None])[0]):
+                raise HTTPException(status_code=403, detail="Invalid or expired file link")
+        size = query.get("size", [None])[0]
+        if size and is_blob_path(path):
+            path = await anyio.to_thread.run_sync(self._variant_path, path, size)
+        return await super().get_response(path, scope)
+
+    def _offload(self, response: FileResponse, full_path, relative: str) -> Response:
+        headers = {key: value for key, value in response.headers.items() if key not in OFFLOAD_DROPPED_HEADERS}
+        if settings.STATIC_SENDFILE_HEADER.lower() == "x-accel-redirect":
+            headers[settings.STATIC_SENDFILE_HEADER] = settings.STATIC_SENDFILE_PREFIX + quote(relative)
+        else:
+            headers[settings.STATIC_SENDFILE_HEADER] = os.path.realpath(full_path)
+        return Response(status_code=response.status_code, headers=headers, media_type=response.media_type)
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        relative = self._relative(full_path)
+        if is_blob_path(relative):
+            response.headers["etag"] = f'"{os.path.basename(full_path)}"'
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["cache-control"] = REVALIDATE_CACHE_CONTROL
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        if settings.STATIC_SENDFILE_HEADER:
+            return self._offload(response, full_path, relative)
+        return response
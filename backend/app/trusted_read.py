@@ -0,0 +1,110 @@
+# backend/app/trusted_read.py
+"""
+Trusted-read fast path for list endpoints.
+
+Documents read back from our own collections were validated when they were
+written, so re-running every model validator (name/phone regexes and so on) on
+each read only burns CPU. A TrustedShape is compiled once per response model:
+its Mongo projection fetches just the model's fields, and shape() rebuilds
+each document with the model's keys, aliases and defaults. It applies only the
+cheap coercions that change the JSON output: datetime to date, int to float,
+Enum to its value, nested models and PlainSerializer annotations.
+
+    employee_shape = TrustedShape(EmployeeBase)
+    docs = await collection.find(query, employee_shape.projection).to_list(None)
+    return employee_shape.response(docs)
+
+The response is already a Response, so FastAPI skips response_model validation;
+keep response_model on the route for the OpenAPI schema.
+"""
+import types
+from datetime import date, datetime
+from enum import Enum
+from typing import Annotated, Any, Callable, Dict, Iterable, List, Optional, Union, get_args, get_origin
+from pydantic import BaseModel, PlainSerializer, TypeAdapter
+from pydantic_core import PydanticUndefined
+from app.config import settings
+from app.json_response import CustomJSONResponse
+
+Converter = Optional[Callable[[Any], Any]]
+
+def _to_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+def _to_float(value):
+    return float(value) if type(value) is int else value
+
+def _to_enum_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+def _converter_for(annotation) -> Converter:
+    """Returns a per-value converter for a field annotation, or None for pass-through."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        # Honour JSON serializers (e.g. StaticUrl signing); other metadata only validates
+        base, *metadata = get_args(annotation)
+        serializers = [m for m in metadata if isinstance(m, PlainSerializer) and m.when_used in ("always", "json")]
+        return serializers[-1].func if serializers else _converter_for(base)
+    if origin in (Union, types.UnionType):
+        converters = [_converter_for(arg) for arg in get_args(annotation) if arg is not type(None)]
+        converter = converters[0] if len(converters) == 1 else None
+        if converter is None:
+            return None
+        return lambda value: None if value is None else converter(value)
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (Any,)
+        item_converter = _converter_for(item)
+        if item_converter is None:
+            return None
+        return lambda value: [item_converter(v) for v in value] if isinstance(value, list) else value
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            nested = TrustedShape(annotation)
+            return lambda value: nested.shape(value) if isinstance(value, dict) else value
+        if issubclass(annotation, Enum):
+            return _to_enum_value
+        if issubclass(annotation, datetime):
+            return None
+        if issubclass(annotation, date):
+            return _to_date
+        if annotation is float:
+            return _to_float
+    return None
+
+class TrustedShape:
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self._fields = []
+        for name, field in model.model_fields.items():
+            key = field.alias or name
+            if field.default_factory is not None:
+                default, factory = None, field.default_factory
+            else:
+                default, factory = (None if field.default is PydanticUndefined else field.default), None
+            self._fields.append((key, _converter_for(field.annotation), default, factory))
+        self._adapter = TypeAdapter(List[model])
+        self.projection = {key: 1 for key, *_ in self._fields}
+        if "_id" not in self.projection:
+            self.projection["_id"] = 0
+
+    def shape(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        shaped = {}
+        for key, converter, default, factory in self._fields:
+            if key in doc:
+                value = doc[key]
+                shaped[key] = value if converter is None or value is None else converter(value)
+            else:
+                shaped[key] = factory() if factory is not None else default
+        return shaped
+
+    def shape_many(self, docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.shape(doc) for doc in docs]
+
+    def validate_many(self, docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The full validate-then-serialize path that FastAPI's response_model would run."""
+        return self._adapter.dump_python(self._adapter.validate_python(list(docs)), mode="json", by_alias=True)
+
+    def response(self, docs: Iterable[Dict[str, Any]], headers: Optional[Dict[str, str]] = None):
+        """A ready response for a list of documents; validates fully when TRUSTED_READ_FAST_PATH is off."""
+        content = self.shape_many(docs) if settings.TRUSTED_READ_FAST_PATH else self.validate_many(docs)
+        return CustomJSONResponse(content=content, headers=headers)
@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_json_response.py
+"""
+Compares CustomJSONResponse render time per JSON backend on payloads shaped like
+the large list endpoints. Run from backend/:
+
+    python -m benchmarks.bench_json_response [--rows 2000] [--repeat 20]
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone, timedelta
+from bson import ObjectId
+from app import json_response
+
+def employees_payload(rows):
+    return [{
+        "_id": ObjectId(), "employee_id": f"EMP{n:05d}", "first_name": "John", "last_name": "Doe",
+        "email": f"john{n}@example.com", "phone_number": "+15551234567",
+        "hire_date": datetime(2020, 1, 1, tzinfo=timezone.utc), "job_title": "Engineer",
+        "department": "Engineering", "role_id": "employee", "reports_to": "EMP00001",
+        "photo_url": None, "salary": 85000.0, "skills": [{"skill_name": "Python", "proficiency_level": "Expert"}],
+        "certificates": [], "is_active": True, "is_deleted": False,
+    } for n in range(rows)]
+
+def assets_payload(rows):
+    return [{
+        "_id": ObjectId(), "asset_id": f"AST{n:05d}", "name": "Laptop", "category": "Hardware",
+        "serial_number": f"SN{n}", "purchase_date": datetime(2023, 5, 1), "status": "allotted",
+        "allotted_to": f"EMP{n:05d}",
+    } for n in range(rows)]
+
+def payroll_payload(rows):
+    return [{
+        "_id": ObjectId(), "payroll_id": f"PAY{n:05d}", "employee_id": f"EMP{n:05d}",
+        "pay_period_start": datetime(2025, 1, 1), "pay_period_end": datetime(2025, 1, 31),
+        "basic_salary": 7000.0, "allowances": 500.0, "deductions": 250.5, "net_salary": 7249.5,
+        "created_at": datetime.now(timezone.utc),
+    } for n in range(rows)]
+
+def attendance_report_payload(rows):
+    start = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+    return [{
+        "attendance_id": f"ATT{n:06d}", "employee_id": f"EMP{n % 500:05d}", "first_name": "John", "last_name": "Doe",
+        "check_in_time": start + timedelta(minutes=n), "check_out_time": start + timedelta(minutes=n, hours=8),
+        "status": "Present",
+    } for n in range(rows)]
+
+def notifications_payload(rows):
+    return [{
+        "_id": ObjectId(), "notification_id": ObjectId(), "user_id": "EMP00001", "message": "Jane Doe checked in.",
+        "link": "/admin/attendance-report", "type": "check_in", "is_read": False,
+        "created_at": datetime.now(timezone.utc),
+    } for n in range(rows)]
+
+PAYLOADS = {
+    "/employees": employees_payload,
+    "/assets": assets_payload,
+    "/payroll": payroll_payload,
+    "/attendance/report": attendance_report_payload,
+    "/notifications/me": notifications_payload,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = {"stdlib": json_response.dumps_stdlib}
+    if json_response.orjson is not None:
+        backends["orjson"] = json_response.dumps_orjson
+
+    print(f"{'endpoint':<22}" + "".join(f"{name + ' ms':>14}" for name in backends) + f"{'speedup':>10}")
+    for endpoint, build in PAYLOADS.items():
+        payload = build(args.rows)
+        timings = {
+            name: min(timeit.repeat(lambda: dumps(payload), number=1, repeat=args.repeat)) * 1000
+            for name, dumps in backends.items()
+        }
+        speedup = timings["stdlib"] / timings["orjson"] if "orjson" in timings else 1.0
+        print(f"{endpoint:<22}" + "".join(f"{t:>14.2f}" for t in timings.values()) + f"{speedup:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# backend/benchmarks/bench_trusted_read.py
+"""
+Per-request CPU of list endpoints: FastAPI's response_model path (validate, dump
+to JSON-able Python, render) against the trusted-read path (shape, render).
+Run from backend/:
+
+    python -m benchmarks.bench_trusted_read [--rows 1000 10000 100000]
+"""
+import argparse
+import time
+from app.json_response import dumps
+from app.models.attendance import AttendanceInDB
+from app.models.employee import EmployeeBase
+from app.models.leave import LeaveInDB
+from app.models.payroll import PayrollInDB
+from app.trusted_read import TrustedShape
+from benchmarks.sample_docs import DOCS
+
+ENDPOINTS = {
+    "/employees": EmployeeBase,
+    "/attendance/me": AttendanceInDB,
+    "/payroll/me": PayrollInDB,
+    "/leaves/me": LeaveInDB,
+}
+
+def timed(fn) -> float:
+    start = time.process_time()
+    fn()
+    return (time.process_time() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<16}{'rows':>8}{'validated ms':>15}{'trusted ms':>13}{'speedup':>10}")
+    for endpoint, model in ENDPOINTS.items():
+        shape = TrustedShape(model)
+        for rows in args.rows:
+            docs = [dict(DOCS[model]) for _ in range(rows)]
+            # What FastAPI does for a route with response_model, then CustomJSONResponse.render
+            validated = timed(lambda: dumps(shape.validate_many(docs)))
+            trusted = timed(lambda: dumps(shape.shape_many(docs)))
+            print(f"{endpoint:<16}{rows:>8}{validated:>15.1f}{trusted:>13.1f}{validated / trusted:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
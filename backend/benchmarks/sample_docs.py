@@ -0,0 +1,34 @@
+# backend/benchmarks/sample_docs.py
+"""One representative document per read model, shared by the benchmarks and tests."""
+from datetime import datetime
+from bson import ObjectId
+from app.models.attendance import AttendanceInDB
+from app.models.employee import EmployeeBase
+from app.models.leave import LeaveInDB
+from app.models.payroll import PayrollInDB
+
+# Documents as Motor returns them: ObjectIds, naive datetimes for date fields, ints for floats
+DOCS = {
+    EmployeeBase: {
+        "_id": ObjectId(), "employee_id": "EMP001", "first_name": "John", "last_name": "Doe",
+        "email": "john@example.com", "hire_date": datetime(2024, 1, 1, 9, 30), "role_id": "employee",
+        "salary": 85000, "skills": [{"skill_name": "Python", "proficiency_level": "Expert"}],
+        "hashed_password": "never-returned",
+    },
+    AttendanceInDB: {
+        "_id": ObjectId(), "attendance_id": "A1", "employee_id": "EMP001",
+        "check_in_time": datetime(2025, 1, 2, 9, 0, 0, 123000), "check_out_time": None, "status": "Present",
+    },
+    PayrollInDB: {
+        "_id": ObjectId(), "payroll_id": "P1", "employee_id": "EMP001",
+        "pay_period_start": datetime(2025, 1, 1), "pay_period_end": datetime(2025, 1, 31),
+        "gross_salary": 7000, "deductions": 250.5, "net_salary": 6749.5, "status": "paid",
+    },
+    LeaveInDB: {
+        "_id": ObjectId(), "leave_id": "L1", "employee_id": "EMP001",
+        "start_date": datetime(2025, 2, 3), "end_date": datetime(2025, 2, 4), "reason": "Trip",
+        "status": "approved", "applied_at": datetime(2025, 1, 20, 8), "created_at": datetime(2025, 1, 20, 8),
+        "updated_at": datetime(2025, 1, 21, 8),
+        "daily_breakdown": [{"date": datetime(2025, 2, 3), "type": "vacation", "status": "approved", "duration": "half_day"}],
+    },
+}
@@ -1,7 +1,9 @@
 # TODO: implement later
 # backend/tests/conftest.py
 import pytest
+from types import SimpleNamespace
 from httpx import AsyncClient
+from pymongo.errors import BulkWriteError
 from app.main import app
 
 @pytest.fixture(scope="module")
@@ -11,4 +13,97 @@ def anyio_backend():
 @pytest.fixture(scope="module")
 async def client():
     async with AsyncClient(app=app, base_url="http://test") as c:
-        yield c
\ No newline at end of file
+        yield c
+
+# --- Shared fakes (imported by test modules as `from conftest import ...`) ---
+
+class FakeRolesCollection:
+    def __init__(self, roles):
+        self.roles = {role["role_id"]: role for role in roles}
+        self.find_one_calls = 0
+
+    async def find_one(self, query, projection=None):
+        self.find_one_calls += 1
+        return self.roles.get(query["role_id"])
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = list(docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._docs:
+            yield doc
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+        self.find_calls = []
+        self.inserted = []
+        self.insert_many_calls = 0
+        self.batches = []
+
+    def find(self, query=None, projection=None):
+        self.find_calls.append(query)
+        ids = (query or {}).get("employee_id", {}).get("$in")
+        docs = [d for d in self.docs if ids is None or d["employee_id"] in ids]
+        return FakeCursor(docs)
+
+    async def insert_one(self, doc):
+        self.inserted.append(doc)
+        return SimpleNamespace(inserted_id=len(self.inserted))
+
+    async def update_one(self, query, update, upsert=False):
+        (key, value), = query.items()
+        if upsert and not any(d.get(key) == value for d in self.inserted):
+            self.inserted.append(dict(update["$setOnInsert"]))
+
+    def _is_duplicate(self, doc):
+        # _id and user_notification_id are unique
+        return any(
+            doc.get(key) is not None and doc.get(key) == existing.get(key)
+            for existing in self.inserted for key in ("_id", "user_notification_id")
+        )
+
+    async def insert_many(self, docs, ordered=True):
+        self.insert_many_calls += 1
+        self.batches.append(list(docs))
+        new = [d for d in docs if not self._is_duplicate(d)]
+        self.inserted.extend(new)
+        if len(new) < len(docs):
+            raise BulkWriteError({"writeErrors": [{"code": 11000}] * (len(docs) - len(new)), "nInserted": len(new)})
+        return SimpleNamespace(inserted_ids=list(range(len(docs))))
+
+class FakeBatchCursor:
+    """Hands out docs in batches, like Motor's to_list(length) on a live cursor."""
+
+    def __init__(self, docs):
+        self._docs = docs
+        self.read = 0
+
+    def sort(self, keys):
+        (key, direction), = keys
+        self._docs = sorted(self._docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        batch = self._docs[self.read:self.read + length]
+        self.read += len(batch)
+        return batch
+
+class FakeBatchCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.cursor = None
+
+    def find(self, query, projection=None):
+        self.cursor = FakeBatchCursor([dict(d) for d in self.docs])
+        return self.cursor
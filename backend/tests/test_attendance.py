@@ -0,0 +1,216 @@
+# backend/tests/test_attendance.py
+import pytest
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from pymongo.errors import DuplicateKeyError
+from fastapi import status
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.routers import attendance
+from app.services import employee_directory, attendance_status_service
+from app.services.notification_dispatcher import notification_dispatcher
+
+class FakeAttendanceCollection:
+    """Just enough of find_one_and_update to model the upsert-guarded check-in."""
+
+    def __init__(self):
+        self.docs = []
+        self.calls = 0
+
+    def _open_record(self, query):
+        matches = [
+            d for d in self.docs
+            if d["employee_id"] == query["employee_id"]
+            and d["check_out_time"] is None
+            and d["check_in_time"] >= query["check_in_time"]["$gte"]
+        ]
+        return matches[-1] if matches else None
+
+    async def find_one_and_update(self, query, update, upsert=False, sort=None, return_document=None):
+        self.calls += 1
+        record = self._open_record(query)
+        if record is None and upsert:
+            record = dict(update["$setOnInsert"])
+            self.docs.append(record)
+        elif record is not None and "$set" in update:
+            record.update(update["$set"])
+        return dict(record) if record else None
+
+@pytest.fixture
+def fake_attendance(monkeypatch):
+    fake = FakeAttendanceCollection()
+    monkeypatch.setattr(attendance, "collection", fake)
+
+    async def fake_entry(employee_id):
+        return {"employee_id": employee_id, "first_name": "John", "last_name": "Doe"}
+    monkeypatch.setattr(employee_directory, "get_entry", fake_entry)
+
+    published = []
+    async def fake_publish(**event):
+        published.append(event)
+    monkeypatch.setattr(notification_dispatcher, "publish", fake_publish)
+
+    status_updates = []
+    async def fake_record(attendance_doc, day=None):
+        status_updates.append(attendance_doc["attendance_id"])
+    monkeypatch.setattr(attendance_status_service, "record_check_in", fake_record)
+    monkeypatch.setattr(attendance_status_service, "record_check_out", fake_record)
+    fake.status_updates = status_updates
+
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP003", "role_id": "employee", "permissions": []}
+    yield fake
+    app.dependency_overrides.pop(get_current_employee, None)
+
+@pytest.mark.anyio
+async def test_check_in_then_out_uses_one_write_each(client, fake_attendance):
+    response = await client.post("/attendance/check-in")
+    assert response.status_code == status.HTTP_201_CREATED
+    body = response.json()
+    assert body["first_name"] == "John"
+    assert body["check_out_time"] is None
+
+    duplicate = await client.post("/attendance/check-in")
+    assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await client.put("/attendance/check-out")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["check_out_time"] is not None
+    assert fake_attendance.calls == 3
+    assert len(fake_attendance.status_updates) == 2
+
+    response = await client.put("/attendance/check-out")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_status_row_precedence():
+    row_status = attendance_status_service.row_status
+    assert row_status({"attendance_status": "Present", "on_leave": True}) == "Present"
+    assert row_status({"attendance_status": None, "on_leave": True}) == "On Leave"
+    assert row_status({}) == "Absent"
+
+class FakeMarkersCollection:
+    """cache_versions markers: the upsert-claim and the guarded take-over."""
+
+    def __init__(self, docs=None):
+        self.docs = {d["_id"]: dict(d) for d in docs or []}
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        before = self.docs.get(query["_id"])
+        if before is None and upsert:
+            self.docs[query["_id"]] = {"_id": query["_id"], **update["$setOnInsert"]}
+        return dict(before) if before else None
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        matched = doc is not None and all(
+            ("built_at" not in doc) if key == "built_at" else doc.get(key) == value
+            for key, value in query.items() if key != "_id"
+        )
+        if matched:
+            doc.update(update["$set"])
+        return SimpleNamespace(modified_count=int(matched))
+
+@pytest.fixture
+def fake_markers(monkeypatch):
+    markers = FakeMarkersCollection()
+    rebuilt = []
+    async def fake_rebuild(day, chunk_size=1000):
+        rebuilt.append(day)
+        return 0
+    monkeypatch.setattr(attendance_status_service, "markers_collection", markers)
+    monkeypatch.setattr(attendance_status_service, "rebuild_day", fake_rebuild)
+    monkeypatch.setattr(attendance_status_service, "_materialized_days", set())
+    markers.rebuilt = rebuilt
+    return markers
+
+@pytest.mark.anyio
+async def test_only_the_worker_that_claims_a_day_rebuilds_it(fake_markers):
+    day = date(2025, 1, 6)
+    marker_id = f"daily_attendance_status:{day.isoformat()}"
+    fake_markers.docs[marker_id] = {"_id": marker_id, "claimed_at": datetime.now(timezone.utc)}
+
+    await attendance_status_service.ensure_materialized(day) # Another worker holds the claim
+    assert fake_markers.rebuilt == []
+    assert day not in attendance_status_service._materialized_days
+
+    del fake_markers.docs[marker_id]
+    await attendance_status_service.ensure_materialized(day)
+    assert fake_markers.rebuilt == [day]
+    assert fake_markers.docs[marker_id]["built_at"]
+
+    attendance_status_service._materialized_days.clear() # A second worker now sees it built
+    await attendance_status_service.ensure_materialized(day)
+    assert fake_markers.rebuilt == [day]
+
+@pytest.mark.anyio
+async def test_stale_claim_is_taken_over(fake_markers):
+    day = date(2025, 1, 7)
+    marker_id = f"daily_attendance_status:{day.isoformat()}"
+    stale = datetime.now(timezone.utc) - attendance_status_service.MATERIALIZE_CLAIM_TIMEOUT * 2
+    fake_markers.docs[marker_id] = {"_id": marker_id, "claimed_at": stale}
+
+    await attendance_status_service.ensure_materialized(day)
+    assert fake_markers.rebuilt == [day]
+    assert fake_markers.docs[marker_id]["claimed_at"] > stale
+
+class FakeAggregateCollection:
+    """Serves export pages by applying the keyset match and limit from the pipeline."""
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda r: (r["check_in_time"], r["attendance_id"]), reverse=True)
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        match, limit = pipeline[0]["$match"], pipeline[2]["$limit"]
+        rows = self.rows
+        if "$and" in match:
+            after, after_id = match["$and"][1]["$or"][1]["check_in_time"], match["$and"][1]["$or"][1]["attendance_id"]["$lt"]
+            rows = [r for r in rows if (r["check_in_time"], r["attendance_id"]) < (after, after_id)]
+        page = [dict(r) for r in rows[:limit]]
+
+        class Cursor:
+            async def to_list(self, length=None):
+                return page
+        return Cursor()
+
+@pytest.mark.anyio
+async def test_export_streams_pages_and_resumes(client, monkeypatch):
+    import json
+    from datetime import datetime
+    from app.config import settings
+    from app.dependencies.auth import get_current_employee
+    from app.services import attendance_export
+    rows = [
+        {"attendance_id": f"A{n}", "employee_id": "EMP001", "first_name": "John", "last_name": "Doe",
+         "check_in_time": datetime(2025, 1, 1 + n // 2, 9), "check_out_time": None, "status": "Present"}
+        for n in range(5)
+    ]
+    fake = FakeAggregateCollection(rows)
+    monkeypatch.setattr(attendance_export, "collection", fake)
+    monkeypatch.setattr(settings, "ATTENDANCE_EXPORT_PAGE_SIZE", 2)
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "admin", "permissions": []}
+    try:
+        response = await client.get("/attendance/report/export")
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["attendance_id"] for row in lines] == ["A4", "A3", "A2", "A1", "A0"]
+        assert len(fake.pipelines) == 3
+
+        resumed = await client.get("/attendance/report/export", params={"format": "csv", "cursor": lines[1]["cursor"]})
+        csv_lines = resumed.text.splitlines()
+        assert csv_lines[0].startswith("attendance_id,employee_id")
+        assert [line.split(",")[0] for line in csv_lines[1:]] == ["A2", "A1", "A0"]
+
+        assert (await client.get("/attendance/report/export", params={"cursor": "bad"})).status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_current_employee, None)
+
+@pytest.mark.anyio
+async def test_concurrent_check_in_losing_the_race_gets_400(client, fake_attendance, monkeypatch):
+    async def racing_upsert(*args, **kwargs):
+        # Both upserts missed the filter; the unique open check-in index rejected ours
+        raise DuplicateKeyError("E11000 duplicate key error index: attendance_open_check_in")
+    monkeypatch.setattr(fake_attendance, "find_one_and_update", racing_upsert)
+    response = await client.post("/attendance/check-in")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "active check-in" in response.json()["detail"]
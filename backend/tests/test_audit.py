@@ -0,0 +1,98 @@
+# backend/tests/test_audit.py
+import asyncio
+import pytest
+from app.services import audit_service
+from app.services.audit_service import AuditLogWriter
+from conftest import FakeCollection
+
+@pytest.fixture
+def fake_audit_collection(monkeypatch):
+    fake = FakeCollection()
+    monkeypatch.setattr(audit_service, "audit_collection", fake)
+    return fake
+
+@pytest.mark.anyio
+async def test_writer_batches_and_flushes_on_stop(fake_audit_collection):
+    writer = AuditLogWriter(max_queue_size=100, batch_size=3, flush_interval=0.05)
+    await writer.start()
+    for i in range(7):
+        assert writer.enqueue({"n": i})
+    await asyncio.sleep(0.2)
+    await writer.stop()
+
+    assert [doc["n"] for doc in fake_audit_collection.inserted] == list(range(7))
+    assert all(len(batch) <= 3 for batch in fake_audit_collection.batches)
+    assert writer.stats()["written"] == 7
+
+@pytest.mark.anyio
+async def test_writer_drops_when_queue_full(fake_audit_collection):
+    writer = AuditLogWriter(max_queue_size=2, batch_size=10, flush_interval=0.05)
+    results = [writer.enqueue({"n": i}) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert writer.stats()["dropped"] == 3
+
+    await writer.stop()
+    assert len(fake_audit_collection.inserted) == 2
+
+class HangingCollection(FakeCollection):
+    """The first insert reaches the "server" and then never returns, like a cancelled round trip."""
+
+    async def insert_many(self, docs, ordered=True):
+        result = await super().insert_many(docs, ordered)
+        if self.insert_many_calls == 1:
+            await asyncio.Event().wait()
+        return result
+
+@pytest.mark.anyio
+async def test_stop_during_insert_writes_each_entry_once(monkeypatch):
+    fake = HangingCollection()
+    monkeypatch.setattr(audit_service, "audit_collection", fake)
+    writer = AuditLogWriter(max_queue_size=100, batch_size=3, flush_interval=0.01)
+    await writer.start()
+    for i in range(5):
+        writer.enqueue({"n": i})
+    await asyncio.sleep(0.1)
+    await writer.stop()
+
+    assert sorted(doc["n"] for doc in fake.inserted) == list(range(5))
+    assert fake.insert_many_calls > 1 # The cancelled batch was re-sent
+    assert writer.stats()["written"] == 5 and writer.stats()["failed"] == 0
+
+class RecordingWriter:
+    def __init__(self):
+        self.entries = []
+
+    def enqueue(self, entry):
+        self.entries.append(entry)
+        return True
+
+@pytest.mark.anyio
+async def test_middleware_logs_redacted_request_body(client, monkeypatch):
+    from app.dependencies import audit
+    writer = RecordingWriter()
+    monkeypatch.setattr(audit, "audit_writer", writer)
+
+    response = await client.put(
+        "/employees/EMP001/password",
+        json={"new_password": "secret-value", "profile": {"password": "x", "name": "A"}},
+    )
+    assert response.status_code == 401
+
+    entry = writer.entries[-1]
+    assert entry["action"] == "PUT"
+    assert entry["path"] == "/employees/EMP001/password"
+    assert entry["outcome"] == 401
+    assert entry["payload"] == {
+        "new_password": audit.REDACTED,
+        "profile": {"password": audit.REDACTED, "name": "A"},
+    }
+
+@pytest.mark.anyio
+async def test_middleware_skips_multipart_bodies(client, monkeypatch):
+    from app.dependencies import audit
+    writer = RecordingWriter()
+    monkeypatch.setattr(audit, "audit_writer", writer)
+
+    await client.post("/employees/EMP001/photo", files={"file": ("a.png", b"\x89PNG", "image/png")})
+    payload = writer.entries[-1]["payload"]
+    assert "multipart/form-data" in payload["detail"]
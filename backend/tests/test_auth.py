@@ -0,0 +1,51 @@
+# backend/tests/test_auth.py
+import pytest
+from passlib.context import CryptContext
+from app.schemas import employee_schema
+from app.services import permission_service
+from conftest import FakeRolesCollection
+
+OLD_COST_HASH = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("password123")
+
+@pytest.fixture
+async def fake_login(monkeypatch):
+    employees = {
+        "EMP001": {"employee_id": "EMP001", "hashed_password": OLD_COST_HASH, "role_id": "employee", "is_active": True},
+        "EMP002": {"employee_id": "EMP002", "hashed_password": OLD_COST_HASH, "role_id": "employee", "is_active": False},
+    }
+    lookups, rehashes = [], []
+
+    async def get_login_credentials(db, employee_id):
+        lookups.append(employee_id)
+        return employees.get(employee_id)
+
+    async def update_password_hash(db, employee_id, old_hash, new_hash):
+        rehashes.append((employee_id, old_hash, new_hash))
+
+    monkeypatch.setattr(employee_schema, "get_login_credentials", get_login_credentials)
+    monkeypatch.setattr(employee_schema, "update_password_hash", update_password_hash)
+    monkeypatch.setattr(permission_service, "roles_collection", FakeRolesCollection(
+        [{"role_id": "employee", "permission_keys": ["employee:read_self"], "version": 4}]
+    ))
+    await permission_service.invalidate_role("employee")
+    return rehashes
+
+@pytest.mark.anyio
+async def test_login_rehashes_outdated_cost(client, fake_login):
+    response = await client.post("/auth/login", data={"username": "EMP001", "password": "password123"})
+    assert response.status_code == 200
+    assert response.json()["permissions"] == ["employee:read_self"]
+
+    (employee_id, old_hash, new_hash), = fake_login
+    assert employee_id == "EMP001" and old_hash == OLD_COST_HASH
+    assert new_hash.startswith("$2b$12$")
+
+@pytest.mark.anyio
+async def test_login_rejects_bad_password_and_disabled_accounts(client, fake_login):
+    bad = await client.post("/auth/login", data={"username": "EMP001", "password": "nope"})
+    assert bad.status_code == 401
+    unknown = await client.post("/auth/login", data={"username": "EMP404", "password": "password123"})
+    assert unknown.status_code == 401
+    disabled = await client.post("/auth/login", data={"username": "EMP002", "password": "password123"})
+    assert disabled.status_code == 403
+    assert fake_login == []
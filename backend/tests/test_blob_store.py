@@ -0,0 +1,111 @@
+# backend/tests/test_blob_store.py
+import io
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from app.services import blob_store
+from app.services.upload_writer import UploadPolicy
+
+PDF = b"%PDF-1.7\nsame certificate"
+
+class FakeBlobs:
+    def __init__(self):
+        self.docs = {}
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            doc = self.docs[query["_id"]] = {"_id": query["_id"], "ref_count": 0, **update["$setOnInsert"]}
+        doc["ref_count"] += update["$inc"]["ref_count"]
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["ref_count"] <= 0:
+            return None
+        doc["ref_count"] += update["$inc"]["ref_count"]
+        return dict(doc)
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def delete_one(self, query):
+        class Result:
+            deleted_count = 0
+        doc = self.docs.get(query["_id"])
+        if doc is not None and doc["ref_count"] == query["ref_count"]:
+            del self.docs[query["_id"]]
+            Result.deleted_count = 1
+        return Result()
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    blobs = FakeBlobs()
+    monkeypatch.setattr(blob_store, "blobs_collection", blobs)
+    monkeypatch.setattr(blob_store, "BLOB_DIR", tmp_path / "blobs")
+    return blobs
+
+def upload(content: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename="c.pdf", headers=Headers({"content-type": "application/pdf"}))
+
+@pytest.mark.anyio
+async def test_identical_uploads_share_one_file_until_last_release(store, tmp_path):
+    policy = UploadPolicy("certificate", tmp_path / "certificates", 10_000, frozenset({"application/pdf"}))
+    first = await blob_store.put(upload(PDF), policy)
+    second = await blob_store.put(upload(PDF), policy)
+
+    assert first["url"] == second["url"]
+    assert blob_store.ref_from_url(first["url"]) == first["sha256"]
+    path = blob_store.blob_path(first["sha256"], ".pdf")
+    assert path.read_bytes() == PDF
+    assert store.docs[first["sha256"]]["ref_count"] == 2
+    assert [p.name for p in path.parent.iterdir()] == [path.name] # Duplicate temp file discarded
+
+    await blob_store.release_url(first["url"])
+    assert path.exists() # Still referenced by the second upload
+
+    await blob_store.release_url(second["url"])
+    assert not path.exists() and first["sha256"] not in store.docs
+    assert list(path.parent.iterdir()) == []
+
+@pytest.mark.anyio
+async def test_legacy_urls_are_not_blob_references(store):
+    assert blob_store.ref_from_url("/static/certificates/EMP001_ab12cd34.pdf") is None
+    await blob_store.release_url("/static/certificates/EMP001_ab12cd34.pdf") # No-op
+
+@pytest.mark.anyio
+async def test_photo_variants_rendered_once_and_removed_with_blob(store, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from app.services import photo_variants
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), "red").save(buffer, format="JPEG")
+    photo = UploadFile(io.BytesIO(buffer.getvalue()), filename="p.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+    blob = await photo_variants.store_photo(photo)
+
+    assert blob["variants"] == list(photo_variants.VARIANT_SIZES)
+    with Image.open(photo_variants.variant_path(blob["sha256"], "thumb")) as thumb:
+        assert max(thumb.size) == photo_variants.VARIANT_SIZES["thumb"]
+    await blob_store.release(blob["sha256"])
+    assert list(blob_store.blob_path(blob["sha256"], ".jpg").parent.iterdir()) == []
+
+@pytest.mark.anyio
+async def test_variants_survive_a_put_racing_the_last_release(store, monkeypatch):
+    sha256 = "ab" * 32
+    store.docs[sha256] = {"_id": sha256, "ref_count": 1, "extension": ".jpg"}
+    path = blob_store.blob_path(sha256, ".jpg")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"photo")
+    thumb = path.with_name(f"{sha256}.thumb.webp")
+    thumb.write_bytes(b"thumb")
+
+    delete_one = store.delete_one
+    async def delete_then_reupload(query):
+        result = await delete_one(query)
+        # Another worker's store_photo re-creates the document right after ours is gone
+        await store.update_one({"_id": sha256}, {"$inc": {"ref_count": 1}, "$setOnInsert": {"extension": ".jpg"}}, upsert=True)
+        return result
+    monkeypatch.setattr(store, "delete_one", delete_then_reupload)
+
+    await blob_store.release(sha256)
+    assert thumb.read_bytes() == b"thumb"
+    assert [p.name for p in path.parent.iterdir()] == [thumb.name]
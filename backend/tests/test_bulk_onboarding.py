@@ -0,0 +1,157 @@
+# backend/tests/test_bulk_onboarding.py
+import json
+import pytest
+from pymongo.errors import BulkWriteError
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.services import bulk_onboarding
+
+class FakeCollection:
+    def __init__(self, docs=None, reject_emails=()):
+        self.docs = list(docs or [])
+        self.insert_calls = 0
+        self.reject_emails = set(reject_emails)
+
+    async def _find(self, query):
+        emails = set(query["email"]["$in"])
+        for doc in self.docs:
+            if doc.get("email") in emails:
+                yield {"email": doc["email"]}
+
+    def find(self, query, projection=None):
+        return self._find(query)
+
+    async def insert_many(self, docs, ordered=True):
+        self.insert_calls += 1
+        errors = [{"index": i, "errmsg": "E11000 duplicate key"} for i, d in enumerate(docs) if d.get("email") in self.reject_emails]
+        self.docs.extend(d for d in docs if d.get("email") not in self.reject_emails)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+@pytest.fixture
+def fakes(monkeypatch):
+    employees = FakeCollection([{"email": "taken@example.com"}], reject_emails={"race@example.com"})
+    payroll, skills = FakeCollection(), FakeCollection()
+    monkeypatch.setattr(bulk_onboarding, "collection", employees)
+    monkeypatch.setattr(bulk_onboarding, "payroll_collection", payroll)
+    monkeypatch.setattr(bulk_onboarding, "skills_collection", skills)
+    monkeypatch.setattr(bulk_onboarding.settings, "BULK_ONBOARDING_CHUNK_SIZE", 2)
+
+    counter = iter(range(100, 200))
+    async def reserve(count):
+        return [f"EMP{next(counter)}" for _ in range(count)]
+    async def fake_hash(password):
+        return f"hashed:{password}"
+    async def noop(*args, **kwargs):
+        return None
+    monkeypatch.setattr(bulk_onboarding.employee_id_sequence, "reserve", reserve)
+    monkeypatch.setattr(bulk_onboarding.bulk_password_hasher, "hash", fake_hash)
+    monkeypatch.setattr(bulk_onboarding.attendance_status_service, "sync_new_employees", noop)
+    monkeypatch.setattr(bulk_onboarding.notification_service, "invalidate_admin_hr_ids", noop)
+    monkeypatch.setattr(bulk_onboarding.employee_directory, "prime", lambda doc: None)
+
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "admin", "permissions": ["employee:create"]}
+    yield employees, payroll, skills
+    app.dependency_overrides.pop(get_current_employee, None)
+
+CSV = """first_name,last_name,email,password,hire_date,role_id,gross_salary,deductions,skills
+Ada,Lovelace,ada@example.com,password123,2025-03-15,employee,5000,500,Python:Expert;Math
+Bad,Row,not-an-email,short,2025-03-15,employee,,,
+Dup,Email,ada@example.com,password123,2025-03-15,employee,,,
+Old,Hire,taken@example.com,password123,2025-03-15,employee,,,
+Race,Lost,race@example.com,password123,2025-03-15,employee,,,
+Grace,Hopper,grace@example.com,password123,2025-12-01,hr,4000,0,
+"""
+
+@pytest.mark.anyio
+async def test_bulk_csv_reports_every_row_and_inserts_in_chunks(client, fakes):
+    employees, payroll, skills = fakes
+    response = await client.post("/employees/bulk", files={"file": ("people.csv", CSV, "text/csv")})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results, summary = lines[:-1], lines[-1]["summary"]
+
+    assert [r["status"] for r in results] == ["created", "error", "error", "error", "error", "created"]
+    assert [r["row"] for r in results] == [1, 2, 3, 4, 5, 6]
+    assert "duplicated earlier" in results[2]["errors"][0]
+    assert "already exists" in results[3]["errors"][0]
+    assert "insert" in results[4]["errors"][0]
+    assert summary == {"total": 6, "created": 2, "failed": 4, "truncated": False}
+
+    ada = next(d for d in employees.docs if d.get("email") == "ada@example.com")
+    assert ada["hashed_password"] == "hashed:password123" and "password" not in ada
+    # One payroll per created employee, month-bounded from the hire date
+    assert sorted(p["employee_id"] for p in payroll.docs) == sorted([results[0]["employee_id"], results[5]["employee_id"]])
+    grace_payroll = next(p for p in payroll.docs if p["employee_id"] == results[5]["employee_id"])
+    assert grace_payroll["pay_period_end"].day == 31 and grace_payroll["pay_period_end"].month == 12
+    assert {(s["skill_name"], s["proficiency_level"]) for s in skills.docs} == {("Python", "Expert"), ("Math", "Beginner")}
+    # Chunk size 2: one insert_many per chunk with valid rows (rows 3-4 have none), never per row
+    assert employees.insert_calls == 2
+
+@pytest.mark.anyio
+async def test_bulk_ndjson_stops_at_row_limit(client, fakes, monkeypatch):
+    monkeypatch.setattr(bulk_onboarding.settings, "BULK_ONBOARDING_MAX_ROWS", 2)
+    rows = [
+        {"first_name": "Ann", "last_name": "Lee", "email": f"ann{n}@example.com", "password": "password123",
+         "hire_date": "2025-01-02", "role_id": "employee", "skills": [{"skill_name": "Go", "proficiency_level": "Intermediate"}]}
+        for n in range(3)
+    ]
+    body = "\n".join(json.dumps(r) for r in rows) + "\nnot json\n"
+    response = await client.post("/employees/bulk", params={"format": "ndjson"}, files={"file": ("people.txt", body)})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1]["summary"] == {"total": 2, "created": 2, "failed": 0, "truncated": True}
+
+@pytest.mark.anyio
+async def test_bulk_rejects_unknown_format(client, fakes):
+    response = await client.post("/employees/bulk", files={"file": ("people.xlsx", b"x")})
+    assert response.status_code == 400
+
+@pytest.mark.anyio
+async def test_bulk_failed_chunk_is_reported_and_stream_still_ends_in_summary(client, fakes, monkeypatch):
+    employees, _, _ = fakes
+    calls = 0
+    original = employees.insert_many
+    async def flaky_insert_many(docs, ordered=True):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError("database unreachable")
+        return await original(docs, ordered)
+    monkeypatch.setattr(employees, "insert_many", flaky_insert_many)
+    csv_body = (
+        "first_name,last_name,email,password,hire_date,role_id\n"
+        "Ada,Lovelace,ada@example.com,password123,2025-03-15,employee\n"
+        "Alan,Turing,alan@example.com,password123,2025-03-15,employee\n"
+        "Ada,Again,ada@example.com,password123,2025-03-15,employee\n"
+    )
+    response = await client.post("/employees/bulk", files={"file": ("people.csv", csv_body, "text/csv")})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["status"] for line in lines[:2]] == ["error", "error"]
+    assert "database unreachable" in lines[0]["errors"][0]
+    # The failed chunk released its emails, so the retry later in the file goes through
+    assert lines[2]["status"] == "created"
+    assert lines[-1]["summary"] == {"total": 3, "created": 1, "failed": 2, "truncated": False}
+
+@pytest.mark.anyio
+async def test_bulk_undecodable_file_ends_in_error_row_and_summary(client, fakes):
+    csv_body = (
+        "first_name,last_name,email,password,hire_date,role_id\n"
+        "Ada,Lovelace,ada@example.com,password123,2025-03-15,employee\n"
+        "Ren\xe9,Descartes,rene@example.com,password123,2025-03-15,employee\n"
+    ).encode("cp1252")
+    response = await client.post("/employees/bulk", files={"file": ("people.csv", csv_body, "text/csv")})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-2]["status"] == "error" and lines[-2]["errors"][0].startswith("file: could not be read")
+    assert lines[-1]["summary"]["failed"] == lines[-1]["summary"]["total"] - lines[-1]["summary"]["created"]
+
+@pytest.mark.anyio
+async def test_report_outlives_the_request_upload(fakes):
+    import io
+    from fastapi import UploadFile
+    upload = UploadFile(io.BytesIO(CSV.encode()), filename="people.csv")
+    spooled = await bulk_onboarding.spool_upload(upload)
+    await upload.close() # Older FastAPI closes form files before the response streams
+    lines = [json.loads(chunk) async for chunk in bulk_onboarding.stream_report(spooled, "csv")]
+    assert lines[-1]["summary"]["total"] == 6
+    assert spooled.closed
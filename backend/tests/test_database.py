@@ -0,0 +1,49 @@
+# backend/tests/test_database.py
+import pytest
+from types import SimpleNamespace
+from app.database import mongo, db
+from app.dependencies.auth import get_current_employee
+from app.dependencies.database import get_db
+from app.main import app
+from conftest import FakeCollection
+
+def test_collection_proxies_share_one_client():
+    mongo.close()
+    employees = db.employees
+    attendance = db["attendance"]
+
+    assert employees.name == "employees"
+    # Both proxies resolve against the same pooled client
+    assert employees.database.client is attendance.database.client
+    assert mongo.get_collection("employees") is mongo.get_collection("employees")
+
+    first_client = mongo.client
+    mongo.close()
+    # After close the proxies transparently pick up the next client
+    assert employees.database.client is not first_client
+    mongo.close()
+
+def test_find_collscans_walks_nested_plans():
+    from app.init_db import find_collscans
+    indexed = {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "attendance_employee_check_in"}}}
+    scanned = {"winningPlan": {"queryPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN", "namespace": "t.attendance"}}}}
+
+    assert find_collscans(indexed) == []
+    assert find_collscans(scanned) == ["t.attendance"]
+    # A COLLSCAN the planner considered and rejected doesn't count
+    rejected = {**indexed, "rejectedPlans": [{"stage": "COLLSCAN", "namespace": "t.attendance"}]}
+    assert find_collscans(rejected) == []
+
+@pytest.mark.anyio
+async def test_get_db_dependency_can_be_overridden(client):
+    roles = FakeCollection([{"role_id": "admin", "role_name": "Administrator", "permission_keys": ["employee:create"]}])
+    app.dependency_overrides[get_db] = lambda: SimpleNamespace(roles=roles)
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "admin", "permissions": []}
+    try:
+        response = await client.get("/roles")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_employee, None)
+    assert response.status_code == 200
+    assert [role["role_id"] for role in response.json()] == ["admin"]
+    assert roles.find_calls == [{"is_deleted": {"$ne": True}}]
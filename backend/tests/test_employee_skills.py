@@ -0,0 +1,34 @@
+# backend/tests/test_employee_skills.py
+import pytest
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.routers import employee_skills
+from app.services import employee_directory
+from conftest import FakeBatchCollection
+
+@pytest.mark.anyio
+async def test_list_skills_fills_the_page_past_deleted_employees(client, monkeypatch):
+    # The first 300 skills belong to deleted employees, more than any fixed over-fetch would cover
+    docs = [
+        {"employee_skill_id": f"SKL-{n:05d}", "employee_id": f"DEL{n:04d}" if n < 300 else f"EMP{n:04d}",
+         "skill_name": "Python", "proficiency_level": "Expert"}
+        for n in range(1500)
+    ]
+    fake = FakeBatchCollection(docs)
+    monkeypatch.setattr(employee_skills, "collection", fake)
+
+    async def fake_entries(employee_ids):
+        return {employee_id: {"employee_id": employee_id, "first_name": "A", "last_name": "B",
+                              "is_deleted": employee_id.startswith("DEL")} for employee_id in employee_ids}
+    monkeypatch.setattr(employee_directory, "get_entries", fake_entries)
+
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "hr", "permissions": ["skill:read_all"]}
+    try:
+        response = await client.get("/employee-skills")
+    finally:
+        app.dependency_overrides.pop(get_current_employee, None)
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == employee_skills.LIST_LIMIT
+    assert not any(row["employee_id"].startswith("DEL") for row in rows)
+    assert fake.cursor.read < len(docs) # Stopped once the page was full
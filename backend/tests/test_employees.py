@@ -0,0 +1,107 @@
+# backend/tests/test_employees.py
+import pytest
+from datetime import datetime
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.pagination import NEXT_CURSOR_HEADER
+from app.routers import employees
+from conftest import FakeCollection
+
+def make_employee(n, department="Engineering"):
+    return {
+        "employee_id": f"EMP{n:03d}", "first_name": "John", "last_name": "Doe",
+        "email": f"john{n}@example.com", "hire_date": datetime(2024, 1, 1),
+        "role_id": "employee", "department": department,
+    }
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+        self._limit = None
+
+    def sort(self, key, direction):
+        self._docs = sorted(self._docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    async def to_list(self, length=None):
+        return self._docs[:self._limit]
+
+class FakeEmployeesCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append((query, projection))
+        docs = [d for d in self.docs if "employee_id" not in query or d["employee_id"] > query["employee_id"]["$gt"]]
+        if "department" in query:
+            docs = [d for d in docs if d.get("department") == query["department"]]
+        if projection and projection.get("_id") == 0:
+            docs = [{k: v for k, v in d.items() if k in projection} for d in docs]
+        return FakeCursor(docs)
+
+@pytest.fixture
+def fake_employees(monkeypatch):
+    fake = FakeEmployeesCollection([make_employee(n) for n in range(1, 6)])
+    monkeypatch.setattr(employees, "collection", fake)
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "admin", "permissions": []}
+    yield fake
+    app.dependency_overrides.pop(get_current_employee, None)
+
+@pytest.mark.anyio
+async def test_list_employees_walks_pages_with_cursor(client, fake_employees):
+    response = await client.get("/employees", params={"limit": 2})
+    assert [e["employee_id"] for e in response.json()] == ["EMP001", "EMP002"]
+
+    seen = []
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    while cursor:
+        response = await client.get("/employees", params={"limit": 2, "cursor": cursor})
+        seen += [e["employee_id"] for e in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    assert seen == ["EMP003", "EMP004", "EMP005"]
+
+    assert (await client.get("/employees", params={"cursor": "not-a-cursor"})).status_code == 400
+
+@pytest.mark.anyio
+async def test_list_employees_filters_and_projects(client, fake_employees):
+    response = await client.get("/employees", params={"department": "Engineering", "name_prefix": "J.", "fields": "first_name"})
+    assert response.status_code == 200
+    assert response.json()[0] == {"employee_id": "EMP001", "first_name": "John"}
+
+    query, projection = fake_employees.queries[-1]
+    assert query["department"] == "Engineering"
+    assert query["$or"][0] == {"first_name": {"$regex": r"^J\."}}
+    assert projection == {"_id": 0, "employee_id": 1, "first_name": 1}
+
+    response = await client.get("/employees", params={"fields": "hire_date", "limit": 2})
+    assert response.json()[0] == {"employee_id": "EMP001", "hire_date": "2024-01-01T00:00:00"}
+    assert response.headers[NEXT_CURSOR_HEADER]
+
+    assert (await client.get("/employees", params={"fields": "hashed_password"})).status_code == 400
+
+@pytest.mark.anyio
+async def test_directory_batches_misses_and_writes_through(monkeypatch):
+    from app.services import employee_directory
+    employees_collection = FakeCollection([
+        {"employee_id": "EMP001", "first_name": "John", "last_name": "Doe"},
+        {"employee_id": "EMP002", "first_name": "Jane", "last_name": "Roe", "is_deleted": True},
+    ])
+    monkeypatch.setattr(employee_directory, "employees_collection", employees_collection)
+    await employee_directory.invalidate("EMP001")
+    await employee_directory.invalidate("EMP002")
+
+    entries = await employee_directory.get_entries(["EMP001", "EMP002", "EMP001", "EMP404"])
+    assert employee_directory.full_name(entries["EMP001"]) == "John Doe"
+    assert employee_directory.is_deleted(entries["EMP002"])
+    assert "EMP404" not in entries
+    assert len(employees_collection.find_calls) == 1
+
+    employee_directory.prime({"employee_id": "EMP001", "first_name": "Johnny", "last_name": "Doe", "role_id": "hr"})
+    entries = await employee_directory.get_entries(["EMP001", "EMP002"])
+    assert entries["EMP001"]["first_name"] == "Johnny"
+    assert len(employees_collection.find_calls) == 1
@@ -0,0 +1,62 @@
+# backend/tests/test_id_sequence.py
+import asyncio
+import pytest
+from app.services import id_sequence
+from app.services.id_sequence import IdSequence
+
+class FakeCounters:
+    """Single-document stand-in for the counters collection; each call is atomic."""
+    def __init__(self):
+        self.docs = {}
+        self.round_trips = 0
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.setdefault(query["_id"], {"value": 0})
+        doc["value"] = max(doc["value"], update["$max"]["value"])
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        self.round_trips += 1
+        await asyncio.sleep(0) # Let other creates interleave
+        doc = self.docs.setdefault(query["_id"], {"value": 0})
+        doc["value"] += update["$inc"]["value"]
+        return dict(doc)
+
+def make_sequence(monkeypatch, counters, existing_max=0, block_size=10):
+    monkeypatch.setattr(id_sequence, "counters_collection", counters)
+    sequence = IdSequence("employee_id", "EMP", "employees", "employee_id", block_size=block_size)
+
+    async def fake_existing_max():
+        return existing_max
+    monkeypatch.setattr(sequence, "_existing_max", fake_existing_max)
+    return sequence
+
+@pytest.mark.anyio
+async def test_continues_after_numeric_max_past_999(monkeypatch):
+    # "EMP999" sorts after "EMP1000" as a string; the seed must use the number
+    sequence = make_sequence(monkeypatch, FakeCounters(), existing_max=1000)
+    assert await sequence.next_id() == "EMP1001"
+    assert await sequence.next_id() == "EMP1002"
+
+@pytest.mark.anyio
+async def test_concurrent_creates_get_unique_ids_from_shared_counter(monkeypatch):
+    counters = FakeCounters()
+    worker_a = make_sequence(monkeypatch, counters, existing_max=3, block_size=5)
+    worker_b = make_sequence(monkeypatch, counters, existing_max=3, block_size=5)
+
+    ids = await asyncio.gather(*(worker.next_id() for worker in [worker_a, worker_b] * 20))
+
+    assert len(set(ids)) == 40
+    assert min(ids) >= "EMP004"
+    # Blocks, not one round trip per ID
+    assert counters.round_trips == 8
+
+@pytest.mark.anyio
+async def test_reserve_many_uses_one_round_trip(monkeypatch):
+    counters = FakeCounters()
+    sequence = make_sequence(monkeypatch, counters, existing_max=3, block_size=10)
+
+    ids = await sequence.reserve(250)
+
+    assert ids[0] == "EMP004" and ids[-1] == "EMP253"
+    assert len(set(ids)) == 250
+    assert counters.round_trips == 1
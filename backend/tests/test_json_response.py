@@ -0,0 +1,26 @@
+# backend/tests/test_json_response.py
+import json
+import pytest
+from datetime import datetime, date, timezone
+from bson import ObjectId
+from app import json_response
+
+PAYLOAD = {
+    "_id": ObjectId("65a1b2c3d4e5f60718293a4b"),
+    "naive": datetime(2025, 1, 2, 3, 4, 5, 123000),
+    "aware": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "day": date(2025, 1, 2),
+    "nested": [{"ids": [ObjectId("65a1b2c3d4e5f60718293a4c")], "name": "Zoë", "n": 1.5}],
+    1: "int key",
+}
+
+def test_stdlib_backend_is_unchanged():
+    assert json_response.dumps_stdlib(PAYLOAD) == json.dumps(PAYLOAD, default=json_response.custom_json_serializer).encode()
+
+@pytest.mark.skipif(json_response.orjson is None, reason="orjson not installed")
+def test_orjson_backend_produces_the_same_values():
+    assert json.loads(json_response.dumps_orjson(PAYLOAD)) == json.loads(json_response.dumps_stdlib(PAYLOAD))
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        json_response.select_backend("yaml")
@@ -1,8 +1,12 @@
 # TODO: implement later
 # backend/tests/test_leaves.py
 import pytest
-from fastapi import status
-from datetime import date, timedelta
+from fastapi import status, HTTPException
+from datetime import date, datetime, timedelta, timezone
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.routers import leaves as leaves_router
+from app.services import leave_service
 
 # A very basic test to check the endpoint and payload structure
 @pytest.mark.anyio
@@ -10,8 +14,96 @@ async def test_create_leave_unauthenticated(client):
     response = await client.post("/leaves", json={})
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-# To write a proper test, you would need to:
-# 1. Mock the database
-# 2. Mock the get_current_employee dependency to return a fake user
-# 3. Call the endpoint with a valid payload
-# 4. Assert that the database mock was called with the correct data
\ No newline at end of file
+# --- Overlap detection ---
+
+def utc(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+def make_leave(leave_id, employee_id, start, days, status="pending", day_statuses=None, duration="full_day"):
+    breakdown = [
+        {"date": utc(start + timedelta(days=i)), "type": "vacation",
+         "status": (day_statuses or [status] * days)[i], "duration": duration}
+        for i in range(days)
+    ]
+    return {"leave_id": leave_id, "employee_id": employee_id, "status": status,
+            "start_date": utc(start), "end_date": utc(start + timedelta(days=days - 1)), "daily_breakdown": breakdown}
+
+class FakeLeaves:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    async def _iterate(self, docs):
+        for doc in docs:
+            yield doc
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        employee_ids = query["employee_id"]["$in"] if isinstance(query["employee_id"], dict) else [query["employee_id"]]
+        return self._iterate([
+            d for d in self.docs
+            if d["employee_id"] in employee_ids and d["status"] in query["status"]["$in"]
+            and d["end_date"] >= query["end_date"]["$gte"] and d["start_date"] <= query["start_date"]["$lte"]
+        ])
+
+@pytest.fixture
+def fake_leaves(monkeypatch):
+    monday = date(2025, 3, 3)
+    fake = FakeLeaves([
+        make_leave("LVE-A", "EMP003", monday, 3), # Mon-Wed pending
+        make_leave("LVE-B", "EMP003", monday + timedelta(days=7), 2, status="partially_approved",
+                   day_statuses=["rejected", "approved"]), # Next Mon rejected, Tue approved
+        make_leave("LVE-C", "EMP003", monday + timedelta(days=3), 1, status="rejected"),
+        make_leave("LVE-D", "EMP004", monday + timedelta(days=4), 1, duration="half_day"), # Fri half day
+    ])
+    monkeypatch.setattr(leave_service, "collection", fake)
+    return fake
+
+@pytest.mark.anyio
+async def test_overlaps_reported_per_active_day(fake_leaves):
+    conflicts = await leave_service.find_overlaps("EMP003", date(2025, 3, 4), date(2025, 3, 11))
+    assert [(c["date"], c["leave_id"]) for c in conflicts] == [
+        ("2025-03-04", "LVE-A"), ("2025-03-05", "LVE-A"), ("2025-03-11", "LVE-B"),
+    ]
+    # One indexed range query, not a scan of the employee's history
+    assert len(fake_leaves.queries) == 1
+
+@pytest.mark.anyio
+async def test_two_half_days_may_share_a_date(fake_leaves):
+    friday = date(2025, 3, 7)
+    assert await leave_service.find_overlaps("EMP004", friday, friday, "half_day") == []
+    assert len(await leave_service.find_overlaps("EMP004", friday, friday, "full_day")) == 1
+
+@pytest.mark.anyio
+async def test_create_rejects_overlapping_leave(fake_leaves, monkeypatch):
+    class FakeEmployees:
+        async def find_one(self, query):
+            return {"employee_id": query["employee_id"]}
+    monkeypatch.setattr(leave_service, "employees_collection", FakeEmployees())
+    with pytest.raises(HTTPException) as exc:
+        await leave_service.create_leave_request_service("EMP003", "Trip", "2025-03-05", "2025-03-06", "vacation")
+    assert exc.value.status_code == 409
+    assert "LVE-A (pending) on 2025-03-05" in exc.value.detail
+
+@pytest.mark.anyio
+async def test_team_calendar_uses_one_query_for_the_team(client, fake_leaves, monkeypatch):
+    class FakeTeam:
+        def find(self, query, projection=None):
+            assert query["reports_to"] == "EMP002"
+            class Cursor:
+                async def to_list(self, length=None):
+                    return [{"employee_id": "EMP004", "first_name": "Ann", "last_name": "Lee"},
+                            {"employee_id": "EMP003", "first_name": "John", "last_name": "Doe"}]
+            return Cursor()
+    monkeypatch.setattr(leaves_router, "employees_collection", FakeTeam())
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP002", "role_id": "employee", "permissions": frozenset({"leave:read_self"})}
+    try:
+        response = await client.get("/leaves/team-calendar", params={"start_date": "2025-03-03", "end_date": "2025-03-09"})
+    finally:
+        app.dependency_overrides.pop(get_current_employee, None)
+
+    body = response.json()
+    assert [e["employee_id"] for e in body["employees"]] == ["EMP003", "EMP004"]
+    assert [d["date"] for d in body["employees"][0]["days"]] == ["2025-03-03", "2025-03-04", "2025-03-05"]
+    assert body["by_date"]["2025-03-07"] == ["EMP004"]
+    assert len(fake_leaves.queries) == 1
@@ -0,0 +1,126 @@
+# backend/tests/test_notifications.py
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.services import notification_service
+from conftest import FakeCollection
+
+@pytest.fixture
+def fake_collections(monkeypatch):
+    employees = FakeCollection([{"employee_id": "EMP001"}, {"employee_id": "EMP002"}])
+    notifications = FakeCollection()
+    links = FakeCollection()
+    monkeypatch.setattr(notification_service, "employees_collection", employees)
+    monkeypatch.setattr(notification_service, "notifications_collection", notifications)
+    monkeypatch.setattr(notification_service, "user_notifications_collection", links)
+    return SimpleNamespace(employees=employees, notifications=notifications, links=links)
+
+@pytest.mark.anyio
+async def test_create_notification_validates_recipients_in_one_query(fake_collections):
+    result = await notification_service.create_notification(
+        recipient_ids=["EMP001", "EMP002", "EMP001", "EMP999"],
+        message_self="self", message_other="other", type="check_in",
+        subject_employee_id="EMP001",
+    )
+
+    assert len(fake_collections.employees.find_calls) == 1
+    assert fake_collections.links.insert_many_calls == 1
+    assert [d["user_id"] for d in fake_collections.links.inserted] == ["EMP001", "EMP002"]
+
+    metrics = result["metrics"]
+    assert metrics["recipients_requested"] == 3
+    assert metrics["recipients_linked"] == 2
+    assert metrics["recipients_skipped"] == 1
+    assert notification_service.get_fanout_stats()["check_in"]["events"] >= 1
+
+@pytest.mark.anyio
+async def test_admin_hr_ids_are_cached_until_invalidated(monkeypatch):
+    employees = FakeCollection([{"employee_id": "EMP001"}])
+    monkeypatch.setattr(notification_service, "employees_collection", employees)
+    await notification_service.invalidate_admin_hr_ids()
+
+    assert await notification_service.get_admin_hr_ids() == ["EMP001"]
+    assert await notification_service.get_admin_hr_ids() == ["EMP001"]
+    assert len(employees.find_calls) == 1
+
+    employees.docs.append({"employee_id": "EMP002"})
+    await notification_service.invalidate_admin_hr_ids()
+    assert await notification_service.get_admin_hr_ids() == ["EMP001", "EMP002"]
+    assert len(employees.find_calls) == 2
+
+@pytest.mark.anyio
+async def test_dispatcher_coalesces_and_delivers_in_background(fake_collections):
+    from app.services.notification_dispatcher import NotificationDispatcher
+    dispatcher = NotificationDispatcher(max_queue_size=10, batch_size=10, max_retries=0, retry_backoff_seconds=0)
+    await dispatcher.start()
+    dispatcher._task.cancel() # Stop the worker so both events are drained together on stop()
+    for user_id in ["EMP001", "EMP002"]:
+        await dispatcher._queue.put({
+            "recipient_ids": [user_id], "message_self": "s", "message_other": "o",
+            "link_self": None, "link_other": None, "type": "check_in",
+            "subject_employee_id": None, "notify_admin_hr": False,
+        })
+    await dispatcher.stop()
+
+    assert len(fake_collections.notifications.inserted) == 1
+    assert [d["user_id"] for d in fake_collections.links.inserted] == ["EMP001", "EMP002"]
+    assert dispatcher.stats()["delivered"] == 1
+
+@pytest.mark.anyio
+async def test_dispatcher_dead_letters_after_retries(monkeypatch):
+    from app.services import notification_dispatcher as module
+    dead_letters = FakeCollection()
+    monkeypatch.setattr(module, "dead_letters_collection", dead_letters)
+
+    async def failing_create_notification(**kwargs):
+        raise RuntimeError("db down")
+    monkeypatch.setattr(notification_service, "create_notification", failing_create_notification)
+
+    dispatcher = module.NotificationDispatcher(
+        max_queue_size=10, batch_size=10, max_retries=2, retry_backoff_seconds=0, sync_mode=True
+    )
+    await dispatcher.publish(recipient_ids=["EMP001"], message_self="s", message_other="o", type="check_out")
+
+    assert dispatcher.stats()["retried"] == 2
+    assert dead_letters.inserted[0]["event"]["type"] == "check_out"
+    assert dead_letters.inserted[0]["attempts"] == 3
+
+@pytest.mark.anyio
+async def test_retry_after_partial_failure_does_not_duplicate(fake_collections, monkeypatch):
+    from app.services.notification_dispatcher import NotificationDispatcher
+    links = fake_collections.links
+    real_insert_many = links.insert_many
+    async def insert_once_then_fail(docs, ordered=True):
+        if links.insert_many_calls == 0:
+            await real_insert_many(docs[:1], ordered) # First link written, then the connection drops
+            raise RuntimeError("connection reset")
+        return await real_insert_many(docs, ordered)
+    monkeypatch.setattr(links, "insert_many", insert_once_then_fail)
+
+    dispatcher = NotificationDispatcher(max_queue_size=10, batch_size=10, max_retries=1, retry_backoff_seconds=0, sync_mode=True)
+    await dispatcher.publish(recipient_ids=["EMP001", "EMP002"], message_self="s", message_other="o", type="check_in")
+
+    assert dispatcher.stats()["retried"] == 1 and dispatcher.stats()["delivered"] == 1
+    assert len(fake_collections.notifications.inserted) == 1
+    assert sorted(d["user_id"] for d in links.inserted) == ["EMP001", "EMP002"]
+
+@pytest.mark.anyio
+async def test_stop_delivers_the_batch_the_worker_was_delivering(fake_collections, monkeypatch):
+    from app.services.notification_dispatcher import NotificationDispatcher
+    real_create = notification_service.create_notification
+    in_flight = asyncio.Event()
+    async def stuck_then_real(**kwargs):
+        if not in_flight.is_set():
+            in_flight.set()
+            await asyncio.sleep(60) # Cancelled by stop()
+        return await real_create(**kwargs)
+    monkeypatch.setattr(notification_service, "create_notification", stuck_then_real)
+
+    dispatcher = NotificationDispatcher(max_queue_size=10, batch_size=10, max_retries=0, retry_backoff_seconds=0)
+    await dispatcher.start()
+    await dispatcher.publish(recipient_ids=["EMP001"], message_self="s", message_other="o", type="check_in")
+    await in_flight.wait()
+    await dispatcher.stop()
+
+    assert dispatcher.stats()["delivered"] == 1
+    assert [d["user_id"] for d in fake_collections.links.inserted] == ["EMP001"]
@@ -0,0 +1,63 @@
+# backend/tests/test_password_hasher.py
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.services.password_hasher import PasswordHasher
+
+def slow_hash(_password):
+    time.sleep(0.05) # Stands in for bcrypt, which also releases the GIL
+    return "hashed"
+
+async def max_loop_lag(during) -> float:
+    """Largest delay seen by a 5 ms ticker while `during` runs."""
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - start - 0.005)
+
+    task = asyncio.create_task(ticker())
+    try:
+        await during
+    finally:
+        stop.set()
+        await task
+    return max(lags)
+
+@pytest.mark.anyio
+async def test_login_storm_keeps_event_loop_responsive():
+    hasher = PasswordHasher(max_workers=2, max_pending=64)
+    try:
+        storm = asyncio.gather(*(hasher._run(slow_hash, "pw") for _ in range(10)))
+        lag = await max_loop_lag(storm)
+    finally:
+        hasher.shutdown()
+    # Inline, 10 x 50 ms would stall the loop for ~500 ms
+    assert lag < 0.15
+    assert hasher.stats()["completed"] == 10
+    assert hasher.stats()["peak_pending"] == 10
+
+@pytest.mark.anyio
+async def test_pending_cap_sheds_load():
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+    try:
+        results = await asyncio.gather(*(hasher._run(slow_hash, "pw") for _ in range(4)), return_exceptions=True)
+    finally:
+        hasher.shutdown()
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 2 and rejected[0].status_code == 503
+    assert hasher.stats()["rejected"] == 2
+
+@pytest.mark.anyio
+async def test_waiting_hasher_queues_instead_of_rejecting():
+    hasher = PasswordHasher(max_workers=1, max_pending=2, wait=True)
+    try:
+        results = await asyncio.gather(*(hasher._run(slow_hash, "pw") for _ in range(4)))
+    finally:
+        hasher.shutdown()
+    assert results == ["hashed"] * 4
+    assert hasher.stats()["rejected"] == 0 and hasher.stats()["peak_pending"] == 2
@@ -0,0 +1,48 @@
+# backend/tests/test_payroll.py
+import pytest
+from datetime import datetime
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.routers import payroll
+from app.services import employee_directory
+from conftest import FakeBatchCollection
+
+@pytest.fixture
+def payroll_rows(monkeypatch):
+    # 12 monthly periods of 150 employees, newest month last in insertion order
+    docs = [
+        {"payroll_id": f"P{month:02d}-{n:03d}", "employee_id": f"EMP{n:03d}",
+         "pay_period_start": datetime(2024, month, 1), "pay_period_end": datetime(2024, month, 28),
+         "gross_salary": 1000, "deductions": 0, "net_salary": 1000, "status": "Generated"}
+        for month in range(1, 13) for n in range(150)
+    ]
+    fake = FakeBatchCollection(docs)
+    monkeypatch.setattr(payroll, "collection", fake)
+
+    async def fake_entries(employee_ids):
+        # EMP000 is deleted; names run backwards so last-name order differs from id order
+        return {
+            employee_id: {"employee_id": employee_id, "first_name": "A", "last_name": f"L{999 - int(employee_id[3:]):03d}",
+                          "is_deleted": employee_id == "EMP000"}
+            for employee_id in employee_ids
+        }
+    monkeypatch.setattr(employee_directory, "get_entries", fake_entries)
+
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "hr", "permissions": ["payroll:read_all"]}
+    yield fake
+    app.dependency_overrides.pop(get_current_employee, None)
+
+@pytest.mark.anyio
+async def test_list_payroll_reads_only_as_far_as_the_page_needs(client, payroll_rows):
+    response = await client.get("/payroll")
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == payroll.LIST_LIMIT
+    # Stopped after the period the page ends in instead of reading all 1800 rows
+    assert payroll_rows.cursor.read < 1400
+    assert all(row["employee_id"] != "EMP000" for row in rows)
+    # Newest period first, then by last name - including the period cut by the limit
+    keys = [(-datetime.fromisoformat(row["pay_period_end"]).timestamp(), row["last_name"]) for row in rows]
+    assert keys == sorted(keys)
+    last_period = [row for row in rows if row["pay_period_end"] == rows[-1]["pay_period_end"]]
+    assert last_period[0]["last_name"] == "L850" # Highest employee id, i.e. first by last name
@@ -0,0 +1,36 @@
+# backend/tests/test_performance_reviews.py
+import pytest
+from datetime import datetime, timedelta
+from app.main import app
+from app.dependencies.auth import get_current_employee
+from app.routers import performance_reviews
+from app.services import employee_directory
+from conftest import FakeBatchCollection
+
+@pytest.mark.anyio
+async def test_list_reviews_is_bounded_and_newest_first(client, monkeypatch):
+    start = datetime(2020, 1, 1)
+    docs = [
+        {"review_id": f"REV-{n:05d}", "employee_id": f"EMP{n % 50:03d}", "reviewer_id": "EMP900",
+         "review_date": start + timedelta(hours=n), "rating": 4, "comments": "ok"}
+        for n in range(3000)
+    ]
+    fake = FakeBatchCollection(docs)
+    monkeypatch.setattr(performance_reviews, "collection", fake)
+
+    async def fake_entries(employee_ids):
+        return {employee_id: {"employee_id": employee_id, "first_name": "A", "last_name": "B",
+                              "is_deleted": employee_id == "EMP000"} for employee_id in employee_ids if employee_id}
+    monkeypatch.setattr(employee_directory, "get_entries", fake_entries)
+
+    app.dependency_overrides[get_current_employee] = lambda: {"employee_id": "EMP001", "role_id": "hr", "permissions": ["performance:read_all"]}
+    try:
+        response = await client.get("/performance-reviews")
+    finally:
+        app.dependency_overrides.pop(get_current_employee, None)
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == performance_reviews.LIST_LIMIT
+    assert rows[0]["review_id"] == "REV-02999" and rows[0]["reviewer_name"] == "A B"
+    assert not any(row["employee_id"] == "EMP000" for row in rows)
+    assert fake.cursor.read < len(docs)
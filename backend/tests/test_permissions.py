@@ -0,0 +1,69 @@
+# backend/tests/test_permissions.py
+import pytest
+from types import SimpleNamespace
+from fastapi import HTTPException
+from jose import jwt
+from app.config import settings
+from app.dependencies.auth import create_access_token, get_current_employee, require_permission
+from app.services import permission_service
+from conftest import FakeRolesCollection
+
+async def resolve(token):
+    # A fresh request each time, so the per-request memo doesn't hide the lookup
+    return await get_current_employee(SimpleNamespace(state=SimpleNamespace()), token)
+
+@pytest.fixture
+async def fake_roles(monkeypatch):
+    roles = FakeRolesCollection([{"role_id": "manager", "permission_keys": ["leave:read_all"], "version": 1}])
+    monkeypatch.setattr(permission_service, "roles_collection", roles)
+    await permission_service.invalidate_role("manager")
+    return roles
+
+@pytest.mark.anyio
+async def test_token_carries_role_version_not_permissions(fake_roles):
+    token = create_access_token({"Employee_id": "EMP010", "role": "manager", "rv": 1})
+    assert "permissions" not in jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    user = await resolve(token)
+    assert user["permissions"] == {"leave:read_all"}
+    await resolve(token)
+    assert fake_roles.find_one_calls == 1 # Second request served from the cache
+
+    checker = require_permission("leave:update")
+    with pytest.raises(HTTPException):
+        await checker(user)
+
+@pytest.mark.anyio
+async def test_role_edits_apply_to_existing_tokens(fake_roles):
+    old_token = create_access_token({"Employee_id": "EMP010", "role": "manager", "rv": 1})
+    await resolve(old_token)
+
+    # Edited in this worker: explicit invalidation
+    fake_roles.roles["manager"] = {"role_id": "manager", "permission_keys": ["leave:update"], "version": 2}
+    await permission_service.invalidate_role("manager")
+    assert (await resolve(old_token))["permissions"] == {"leave:update"}
+
+    # Edited elsewhere: a token minted at a newer version forces a reload
+    fake_roles.roles["manager"] = {"role_id": "manager", "permission_keys": [], "version": 3, "is_deleted": True}
+    new_token = create_access_token({"Employee_id": "EMP011", "role": "manager", "rv": 3})
+    assert (await resolve(new_token))["permissions"] == frozenset()
+
+@pytest.mark.anyio
+async def test_verified_claims_are_cached_and_memoized_per_request(fake_roles, monkeypatch):
+    from app.dependencies import auth
+    auth._token_claims.clear()
+    token = create_access_token({"Employee_id": "EMP010", "role": "manager", "rv": 1})
+    decode_calls = []
+    real_decode = auth.jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *a, **kw: decode_calls.append(1) or real_decode(*a, **kw))
+
+    await resolve(token)
+    await resolve(token)
+    assert len(decode_calls) == 1
+
+    request = SimpleNamespace(state=SimpleNamespace())
+    first = await get_current_employee(request, token)
+    assert await get_current_employee(request, "ignored-once-resolved") is first
+
+    with pytest.raises(HTTPException):
+        await resolve(token + "tampered")
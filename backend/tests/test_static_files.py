@@ -0,0 +1,92 @@
+# backend/tests/test_static_files.py
+import pytest
+from datetime import datetime
+from fastapi import FastAPI
+from httpx import AsyncClient
+from app import signed_urls
+from app.config import settings
+from app.models.employee import EmployeeBase
+from app.static_files import CachedStaticFiles, IMMUTABLE_CACHE_CONTROL
+from app.trusted_read import TrustedShape
+
+SHA = "ab" + "cd" + "0" * 60
+
+@pytest.fixture
+async def static_client(tmp_path):
+    shard = tmp_path / "blobs" / "ab" / "cd"
+    shard.mkdir(parents=True)
+    (shard / f"{SHA}.jpg").write_bytes(b"\xff\xd8\xff original")
+    (shard / f"{SHA}.thumb.webp").write_bytes(b"RIFF thumb")
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "EMP001.jpg").write_bytes(b"\xff\xd8\xff legacy")
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=tmp_path), name="static")
+    async with AsyncClient(app=app, base_url="http://test") as c:
+        yield c
+
+@pytest.mark.anyio
+async def test_blob_is_immutable_with_strong_etag(static_client):
+    url = f"/static/blobs/ab/cd/{SHA}.jpg"
+    response = await static_client.get(url)
+    assert response.content == b"\xff\xd8\xff original"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{SHA}.jpg"'
+
+    revalidated = await static_client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+@pytest.mark.anyio
+async def test_size_query_serves_variant_or_falls_back(static_client):
+    url = f"/static/blobs/ab/cd/{SHA}.jpg"
+    thumb = await static_client.get(url, params={"size": "thumb"})
+    assert thumb.content == b"RIFF thumb"
+    assert thumb.headers["etag"] == f'"{SHA}.thumb.webp"'
+    assert thumb.headers["content-type"] == "image/webp"
+
+    medium = await static_client.get(url, params={"size": "medium"}) # Not rendered
+    assert medium.content == b"\xff\xd8\xff original"
+
+@pytest.mark.anyio
+async def test_legacy_files_are_revalidated(static_client):
+    response = await static_client.get("/static/images/EMP001.jpg")
+    assert response.headers["cache-control"] == "no-cache"
+
+@pytest.mark.anyio
+async def test_range_request_resumes_download(static_client):
+    url = f"/static/blobs/ab/cd/{SHA}.jpg"
+    full = await static_client.get(url)
+    partial = await static_client.get(url, headers={"Range": "bytes=4-", "If-Range": full.headers["etag"]})
+    assert partial.status_code == 206
+    assert partial.content == full.content[4:]
+
+    stale = await static_client.get(url, headers={"Range": "bytes=4-", "If-Range": '"something-else"'})
+    assert stale.status_code == 200 and stale.content == full.content
+
+@pytest.mark.anyio
+async def test_sendfile_offload_hands_body_to_proxy(static_client, monkeypatch):
+    monkeypatch.setattr(settings, "STATIC_SENDFILE_HEADER", "X-Accel-Redirect")
+    response = await static_client.get("/static/images/EMP001.jpg")
+    assert response.content == b""
+    assert response.headers["x-accel-redirect"] == "/internal-static/images/EMP001.jpg"
+    assert response.headers["content-type"] == "image/jpeg"
+
+@pytest.mark.anyio
+async def test_signed_mode_requires_valid_signature(static_client, monkeypatch):
+    monkeypatch.setattr(settings, "STATIC_SIGNED_URLS", True)
+    assert (await static_client.get("/static/images/EMP001.jpg")).status_code == 403
+
+    signed = signed_urls.sign_url("/static/images/EMP001.jpg")
+    assert (await static_client.get(signed)).status_code == 200
+    assert (await static_client.get(signed.replace("EMP001", "EMP002"))).status_code == 403
+
+    expired = signed_urls.sign_url("/static/images/EMP001.jpg", now=0)
+    assert (await static_client.get(expired)).status_code == 403
+
+def test_employee_responses_sign_static_urls(monkeypatch):
+    monkeypatch.setattr(settings, "STATIC_SIGNED_URLS", True)
+    doc = {"employee_id": "EMP001", "first_name": "John", "last_name": "Doe", "email": "j@example.com",
+           "hire_date": datetime(2024, 1, 1), "role_id": "employee",
+           "photo_url": "/static/images/EMP001.jpg", "certificates": ["/static/certificates/a.pdf"]}
+    for shaped in (EmployeeBase(**doc).model_dump(mode="json", by_alias=True), TrustedShape(EmployeeBase).shape(doc)):
+        assert "&sig=" in shaped["photo_url"] and shaped["photo_url"].startswith("/static/images/EMP001.jpg?expires=")
+        assert "&sig=" in shaped["certificates"][0]
@@ -0,0 +1,20 @@
+# backend/tests/test_trusted_read.py
+import json
+import pytest
+from app.json_response import dumps_stdlib
+from app.models.employee import EmployeeBase
+from app.models.payroll import PayrollInDB
+from app.trusted_read import TrustedShape
+from benchmarks.sample_docs import DOCS
+
+@pytest.mark.parametrize("model", list(DOCS), ids=lambda m: m.__name__)
+def test_trusted_shape_matches_validated_output(model):
+    shape = TrustedShape(model)
+    docs = [DOCS[model]]
+    assert json.loads(dumps_stdlib(shape.shape_many(docs))) == json.loads(dumps_stdlib(shape.validate_many(docs)))
+
+def test_projection_only_requests_model_fields():
+    projection = TrustedShape(EmployeeBase).projection
+    assert projection["_id"] == 1 and projection["first_name"] == 1
+    assert "hashed_password" not in projection
+    assert TrustedShape(PayrollInDB).projection["_id"] == 0
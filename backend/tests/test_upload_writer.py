@@ -0,0 +1,46 @@
+# backend/tests/test_upload_writer.py
+import hashlib
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from app.services.upload_writer import UploadWriter, UploadPolicy
+
+PDF = b"%PDF-1.7\n" + b"x" * 5000
+
+def make_upload(content: bytes, content_type: str) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename="doc.pdf", headers=Headers({"content-type": content_type}))
+
+@pytest.fixture
+def writer():
+    writer = UploadWriter(max_workers=2, chunk_size=1024)
+    yield writer
+    writer.shutdown()
+
+@pytest.fixture
+def policy(tmp_path):
+    return UploadPolicy(name="certificate", directory=tmp_path, max_bytes=10_000, content_types=frozenset({"application/pdf"}))
+
+@pytest.mark.anyio
+async def test_receive_streams_and_hashes_then_commit_renames_into_place(writer, policy):
+    received = await writer.receive(make_upload(PDF, "application/pdf"), policy)
+    assert received.temp_path.exists() and received.extension == ".pdf"
+    await writer.commit(received, policy.directory / "EMP001_abc.pdf")
+
+    assert (policy.directory / "EMP001_abc.pdf").read_bytes() == PDF
+    assert received.sha256 == hashlib.sha256(PDF).hexdigest() and received.size == len(PDF)
+    assert not list(policy.directory.glob(".*.part"))
+    assert writer.stats()["uploads"] == 1
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("content, content_type, status", [
+    (b"%PDF-" + b"x" * 20_000, "application/pdf", 413), # Over the limit mid-stream
+    (b"MZ\x90\x00 not a pdf", "application/pdf", 415), # Declared type doesn't match the bytes
+    (PDF, "application/x-msdownload", 415),
+])
+async def test_rejected_upload_leaves_nothing_on_disk(writer, policy, content, content_type, status):
+    with pytest.raises(HTTPException) as exc:
+        await writer.receive(make_upload(content, content_type), policy)
+    assert exc.value.status_code == status
+    assert list(policy.directory.iterdir()) == []
+    assert writer.stats()["rejected"] == 1
@@ -2,7 +2,7 @@
 import { useState, useEffect, FormEvent, ChangeEvent } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useNavigate } from 'react-router-dom'; // Removed unused useParams
-import api, { API_BASE_URL } from '../../services/api';
+import api, { API_BASE_URL, fetchAllEmployees } from '../../services/api';
 import {
     Box, Typography, TextField, Button, Paper, Alert, CircularProgress, MenuItem, Avatar, List, ListItem, ListItemText, ListItemSecondaryAction, IconButton, Grid,
     Snackbar, Divider, TableContainer, Table, TableRow, TableCell, TableBody, Select, FormControl, InputLabel // Removed unused TableHead
@@ -27,7 +27,7 @@ interface EmployeeFormProps {
 }
 
 // --- API Calls ---
-const fetchEmployees = async () => (await api.get('/employees')).data;
+const fetchEmployees = () => fetchAllEmployees();
 const fetchRoles = async () => (await api.get('/roles')).data;
 
 // Create (FormData)
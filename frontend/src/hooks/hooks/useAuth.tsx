@@ -24,17 +24,20 @@ const AuthContext = createContext<AuthContextType | null>(null);
 interface DecodedToken {
   Employee_id: string;
   role: string;
+  rv?: number;
   exp: number;
-  permissions: string[];
 }
 
+// Permissions are no longer embedded in the token; the API resolves them live from the role
+const fetchPermissions = async (): Promise<string[]> => (await api.get('/auth/permissions')).data;
+
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<UserData | null>(null);
   const [isInitialized, setIsInitialized] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
-    const initializeAuth = () => {
+    const initializeAuth = async () => {
       const token = getAccessToken();
       if (token) {
         try {
@@ -43,7 +46,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
             setUser({ 
                 employee_id: decodedToken.Employee_id, 
                 role_id: decodedToken.role,
-                permissions: decodedToken.permissions || []
+                permissions: await fetchPermissions()
             });
           } else {
             setAccessToken(null);
@@ -66,7 +69,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   const login = async (employee_id: string, password: string) => {
     try {
         const response = await api.post('/auth/login', new URLSearchParams({ username: employee_id, password }));
-        const { access_token } = response.data;
+        const { access_token, permissions } = response.data;
 
         setAccessToken(access_token);
 
@@ -74,7 +77,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
         const userData: UserData = {
              employee_id: decodedToken.Employee_id,
              role_id: decodedToken.role,
-             permissions: decodedToken.permissions || []
+             permissions: permissions || []
         };
         setUser(userData);
 
@@ -1,7 +1,7 @@
 // frontend/src/pages/Admin/Dashboard.tsx
 import { useState, useMemo } from 'react';
 import { useQueries, useMutation, useQueryClient, useQuery } from '@tanstack/react-query'; 
-import api, { API_BASE_URL } from '../../services/api';
+import api, { fetchAllEmployees, photoSrc } from '../../services/api';
 import {
     Box, Typography, Grid, Paper, CircularProgress, Button, Avatar, ListItemText, List, ListItem, ListItemAvatar,
     Snackbar, Alert, IconButton, Pagination, Select, MenuItem, FormControl
@@ -30,7 +30,7 @@ import { MotionBox } from '../../components/Motion';
 import ConfirmationDialog from '../../components/ConfirmationDialog';
 
 // Fetch functions
-const fetchEmployees = () => api.get('/employees').then(res => res.data);
+const fetchEmployees = () => fetchAllEmployees();
 const fetchLeaves = () => api.get('/leaves').then(res => res.data);
 const fetchAssets = () => api.get('/assets').then(res => res.data);
 const fetchMyDetails = () => api.get('/employees/me/details').then(res => res.data);
@@ -216,7 +216,7 @@ const AdminDashboard = () => {
       width: 70, 
       renderCell: (params) => (
         <Avatar 
-          src={params.value ? `${API_BASE_URL}${params.value}`: undefined}
+          src={photoSrc(params.value, 'thumb')}
           sx={{ 
             width: 40, 
             height: 40,
@@ -704,7 +704,7 @@ const AdminDashboard = () => {
                   >
                     <ListItemAvatar>
                       <Avatar 
-                        src={report.photo_url ? `${API_BASE_URL}${report.photo_url}` : ''} 
+                        src={photoSrc(report.photo_url, 'thumb')} 
                         sx={{ 
                           width: 44, 
                           height: 44,
@@ -1182,7 +1182,7 @@ const AdminDashboard = () => {
 
                     {/* Avatar */}
                     <Avatar 
-                      src={employee.photo_url ? `${API_BASE_URL}${employee.photo_url}` : undefined}
+                      src={photoSrc(employee.photo_url, 'thumb')}
                       sx={{ 
                         width: 40, 
                         height: 40,
@@ -1,5 +1,5 @@
 import { useAuth } from '../../hooks/hooks/useAuth';
-import api, { API_BASE_URL } from '../../services/api';
+import api, { API_BASE_URL, photoSrc } from '../../services/api';
 import {
   Box,
   Typography,
@@ -381,7 +381,7 @@ const MyProfile = () => {
                 >
                   <ListItemAvatar>
                     <Avatar 
-                      src={report.photo_url ? `${API_BASE_URL}${report.photo_url}` : ''} 
+                      src={photoSrc(report.photo_url, 'thumb')} 
                       sx={{
                         width: 48,
                         height: 48,
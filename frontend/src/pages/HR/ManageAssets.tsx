@@ -1,7 +1,7 @@
 // frontend/src/pages/HR/ManageAssets.tsx
 import { useState, FormEvent, useMemo } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import api from '../../services/api';
+import api, { fetchAllEmployees } from '../../services/api';
 import {
     Box, Typography, CircularProgress, Alert, Button, Modal, Paper, TextField, MenuItem, Chip, Radio, RadioGroup, FormControlLabel, FormControl, FormLabel, IconButton,
     Snackbar, Pagination, Select
@@ -20,7 +20,7 @@ import ConfirmationDialog from '../../components/ConfirmationDialog';
 import { MotionBox } from '../../components/Motion';
 
 const fetchAssetsWithDetails = async () => (await api.get('/assets')).data;
-const fetchEmployees = async () => (await api.get('/employees')).data;
+const fetchEmployees = () => fetchAllEmployees();
 
 const allotAsset = async (allotmentData: { asset_id: string; employee_id: string }) => {
     return (await api.post('/assets/allot', allotmentData)).data;
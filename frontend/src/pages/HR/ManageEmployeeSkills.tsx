@@ -1,7 +1,7 @@
 // frontend/src/pages/HR/ManageEmployeeSkills.tsx
 import { useState, FormEvent, useMemo } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import api from '../../services/api';
+import api, { fetchAllEmployees } from '../../services/api';
 import {
   Box, Typography, CircularProgress, Alert, Button, TextField, MenuItem, IconButton,
   Snackbar, Pagination, Select, FormControl, Dialog, DialogTitle, DialogContent, DialogActions, Chip
@@ -17,7 +17,7 @@ import { MotionBox } from '../../components/Motion';
 
 // API Functions
 const fetchAllSkills = async () => (await api.get('/employee-skills')).data;
-const fetchEmployees = async () => (await api.get('/employees')).data;
+const fetchEmployees = () => fetchAllEmployees();
 const createSkill = async (skillData: any) => (await api.post('/employee-skills', skillData)).data;
 const updateSkill = async ({ skillId, skillData }: { skillId: string; skillData: any }) => (await api.put(`/employee-skills/${skillId}`, skillData)).data;
 const deleteSkill = async (skillId: string) => (await api.delete(`/employee-skills/${skillId}`)).data;
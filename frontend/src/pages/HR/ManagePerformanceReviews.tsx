@@ -1,7 +1,7 @@
 // frontend/src/pages/HR/ManagePerformanceReviews.tsx
 import { useState, FormEvent, useMemo } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import api from '../../services/api';
+import api, { fetchAllEmployees } from '../../services/api';
 import {
     Box, Typography, CircularProgress, Alert, Button, TextField, MenuItem, Rating, IconButton,
     Snackbar, Pagination, Select, FormControl, Dialog, DialogTitle, DialogContent, DialogActions, Chip
@@ -16,7 +16,7 @@ import ConfirmationDialog from '../../components/ConfirmationDialog';
 import { MotionBox } from '../../components/Motion';
 
 const fetchAllReviews = async () => (await api.get('/performance-reviews')).data;
-const fetchEmployees = async () => (await api.get('/employees')).data;
+const fetchEmployees = () => fetchAllEmployees();
 const createReview = async (reviewData: any) => (await api.post('/performance-reviews', reviewData)).data;
 const deleteReview = async (reviewId: string) => (await api.delete(`/performance-reviews/${reviewId}`)).data;
 
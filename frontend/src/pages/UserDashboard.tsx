@@ -2,7 +2,7 @@
 import { useState } from 'react';
 import { useQueries, useMutation, useQueryClient, useQuery } from '@tanstack/react-query';
 // --- FIX 1: Corrected import paths from ../../ to ../ ---
-import api, { API_BASE_URL } from '../services/api'; 
+import api, { fetchAllEmployees, photoSrc } from '../services/api'; 
 import {
     Box, Typography, Grid, Paper, CircularProgress, Avatar, Button, Chip, List, ListItem, ListItemText, Rating, IconButton, Menu, MenuItem, ListItemIcon, ListItemAvatar,
     Snackbar, Alert
@@ -73,7 +73,6 @@ const fetchMyPayslips = () => api.get('/payroll/me').then((res: any) => res.data
 const fetchMyReviews = () => api.get('/performance-reviews/me').then((res: any) => res.data);
 const fetchTeamAssets = () => api.get('/assets/team').then((res: any) => res.data);
 // Management
-const fetchAllEmployees = () => api.get('/employees').then((res: any) => res.data);
 const fetchAllLeaves = () => api.get('/leaves').then((res: any) => res.data);
 // Attendance
 const checkIn = () => api.post('/attendance/check-in');
@@ -126,7 +125,7 @@ const UserDashboard = () => {
             { queryKey: ['myPayslips', user?.employee_id], queryFn: fetchMyPayslips, enabled: !!user && can('payroll:read_self') },
             { queryKey: ['myReviews', user?.employee_id], queryFn: fetchMyReviews, enabled: !!user && can('performance:read_self') },
             // Management Data (HR/Manager/xyz)
-            { queryKey: ['allEmployees'], queryFn: fetchAllEmployees, enabled: !!user && can('employee:read_all') },
+            { queryKey: ['allEmployees'], queryFn: () => fetchAllEmployees(), enabled: !!user && can('employee:read_all') },
             { queryKey: ['allLeaves'], queryFn: fetchAllLeaves, enabled: !!user && can('leave:read_all') },
         ]
     });
@@ -187,7 +186,7 @@ const UserDashboard = () => {
         <Box>
             {/* Header */}
             <MotionBox sx={{ display: 'flex', alignItems: 'center', width: '100%', mb: 4 }} initial={{ opacity: 0, y: -20 }} animate={{ opacity: 1, y: 0 }} transition={{ duration: 0.5 }}>
-                <Avatar src={details?.employee.photo_url ? `${API_BASE_URL}${details.employee.photo_url}` : undefined} sx={{ width: 72, height: 72, mr: 2 }} />
+                <Avatar src={photoSrc(details?.employee.photo_url, 'small')} sx={{ width: 72, height: 72, mr: 2 }} />
                 <Box sx={{ flexGrow: 1 }}>
                     <Typography variant="h4" fontWeight={600}>Welcome, {details?.employee.first_name || 'Employee'}</Typography>
                     <Typography color="text.secondary">{details?.employee.job_title || user?.role_id}</Typography>
@@ -326,7 +325,7 @@ const UserDashboard = () => {
                             <List>
                                 {details.direct_reports.map((report: any) => (
                                     <ListItem key={report.employee_id} divider>
-                                        <ListItemAvatar><Avatar src={report.photo_url ? `${API_BASE_URL}${report.photo_url}` : ''} /></ListItemAvatar>
+                                        <ListItemAvatar><Avatar src={photoSrc(report.photo_url, 'thumb')} /></ListItemAvatar>
                                         <ListItemText primary={`${report.first_name} ${report.last_name}`} secondary={`${report.job_title || 'N/A'} - ${report.employee_id}`} />
                                     </ListItem>
                                 ))}
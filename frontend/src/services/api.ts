@@ -4,6 +4,14 @@ import axios from 'axios';
 // Base URL for static files
 export const API_BASE_URL = 'http://localhost:8000';
 
+// Absolute URL for an employee photo; `size` picks a pre-rendered variant (falls back to the original)
+export const photoSrc = (photoUrl?: string | null, size?: 'thumb' | 'small' | 'medium'): string | undefined => {
+  if (!photoUrl) return undefined;
+  if (!size) return `${API_BASE_URL}${photoUrl}`;
+  // Signed URLs already carry a query string
+  return `${API_BASE_URL}${photoUrl}${photoUrl.includes('?') ? '&' : '?'}size=${size}`;
+};
+
 // --- Add functions to handle token storage ---
 const TOKEN_KEY = 'accessToken'; // Key for local storage
 
@@ -42,5 +50,19 @@ api.interceptors.request.use(
 );
 // --- End interceptor ---
 
+// GET /employees is paginated: follow X-Next-Cursor until the last page
+const EMPLOYEE_PAGE_SIZE = 1000;
+
+export const fetchAllEmployees = async (params: Record<string, any> = {}): Promise<any[]> => {
+  const employees: any[] = [];
+  let cursor: string | undefined;
+  do {
+    const res = await api.get('/employees', { params: { ...params, limit: EMPLOYEE_PAGE_SIZE, cursor } });
+    employees.push(...res.data);
+    cursor = res.headers['x-next-cursor'] || undefined;
+  } while (cursor);
+  return employees;
+};
+
 
 export default api;
\ No newline at end of file